@@ -0,0 +1,45 @@
+"""add_trigram_search_indexes
+
+Revision ID: c4f2a91d7e53
+Revises: bc1b6999c0c3
+Create Date: 2025-10-20 09:12:31.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f2a91d7e53'
+down_revision: Union[str, None] = 'bc1b6999c0c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# GIN trigram indexes so substring (ILIKE '%...%') filters avoid sequential scans
+TRIGRAM_INDEXES = [
+    ('ix_projects_tag_trgm', 'projects', 'tag'),
+    ('ix_team_members_role_trgm', 'team_members', 'role'),
+    ('ix_team_members_role_en_trgm', 'team_members', 'role_en'),
+    ('ix_team_members_role_az_trgm', 'team_members', 'role_az'),
+    ('ix_team_members_role_ru_trgm', 'team_members', 'role_ru'),
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(name, table_name=table)
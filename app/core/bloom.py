@@ -0,0 +1,365 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import uuid
+import redis as redis_client
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from fastapi import HTTPException, Request
+from fastapi_cache import FastAPICache
+from sqlalchemy import select
+from ..core.cache_backend import FallbackBackend, guarded
+from ..core.config import settings
+from ..core.db import AsyncSessionLocal
+from ..models import Base
+
+logger = logging.getLogger(__name__)
+
+# Columns whose values get a filter, by table; routes look them up with
+# require_known()
+FILTERED_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "news": ("id", "slug"),
+    "services": ("id", "slug"),
+    "projects": ("id",),
+}
+
+# Filters are sized for at least this many values
+_MIN_CAPACITY = 1024
+
+class BloomFilter:
+    """Set membership with no false negatives and about `error_rate` false
+    positives while it holds no more than `capacity` values"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.bits = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.bits / capacity * math.log(2)), 1)
+        self.count = 0
+        self._array = bytearray((self.bits + 7) // 8)
+
+    def _positions(self, value: str) -> Iterable[int]:
+        # Kirsch-Mitzenmacher: k positions from two halves of one digest
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self._array[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._array[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+# Publishes a key filter update under the next value of the generation
+# counter (KEYS[1]), as "<generation> <message>", and returns the generation
+_PUBLISH = """
+local generation = redis.call('INCR', KEYS[1])
+redis.call('PUBLISH', ARGV[1], generation .. ' ' .. ARGV[2])
+return generation
+"""
+
+class KeyFilters:
+    """Per-worker Bloom filters of the ids and slugs that exist, so lookups
+    of ones that don't are answered 404 without touching Postgres.
+
+    Filters are built from the primary once the worker is subscribed to
+    `channel`, and rebuilt every BLOOM_FILTER_REBUILD_SECONDS. CRUDBase
+    adds the values of rows it writes and publishes them to the other
+    workers; deletes only count towards an early rebuild, since a Bloom
+    filter cannot drop a value (a deleted one is merely not rejected).
+
+    Every update bumps a generation counter in Redis (`<prefix>generation`)
+    and carries its new value. A worker knows which generation its filters
+    are complete up to, and checks the counter before trusting a
+    rejection: if it is ahead (an update was missed, or request_rebuild()
+    was called after writes made outside CRUDBase) the lookup goes through
+    and the filters are rebuilt. Without Redis, or while the subscription
+    or the counter cannot be read, nothing is rejected.
+
+    Nothing is published while BLOOM_FILTER_ENABLED is off.
+    """
+
+    def __init__(self, columns: Dict[str, Tuple[str, ...]], *, error_rate: float, prefix: str):
+        self.columns = columns
+        self.error_rate = error_rate
+        self.channel = f"{prefix}updates"
+        self.generation_key = f"{prefix}generation"
+        self.ready = False
+        self.rejected = 0
+        self.stale = 0
+        # Every update up to this generation is in the filters
+        self.generation: Optional[int] = None
+        self._filters: Dict[Tuple[str, str], BloomFilter] = {}
+        # Values added while a rebuild was reading the table
+        self._pending: Optional[Dict[Tuple[str, str], Set[str]]] = None
+        self._removed: Dict[str, int] = {}
+        self._rebuilding = asyncio.Lock()
+        self._origin = uuid.uuid4().hex
+        self._tasks: Set[asyncio.Task] = set()
+        # Updates that could not be published, left to _bump_later()
+        self._unpublished = 0
+
+    async def might_exist(self, table: str, column: str, value: str) -> bool:
+        bloom = self._filters.get((table, column))
+        if not self.ready or bloom is None or value in bloom:
+            return True
+        # Only a rejection costs a Redis read
+        if not await self._up_to_date():
+            return True
+        self.rejected += 1
+        return False
+
+    async def _up_to_date(self) -> bool:
+        if self._redis() is None:
+            return False
+        try:
+            current = int(await self._call(lambda redis: redis.get(self.generation_key)) or 0)
+        except Exception:
+            logger.warning("Could not read the key filter generation", exc_info=True)
+            return False
+        if self.generation is not None and current <= self.generation:
+            return True
+        self.stale += 1
+        self._rebuild_soon()
+        return False
+
+    def _add(self, table: str, column: str, values: Iterable[str]) -> None:
+        bloom = self._filters.get((table, column))
+        for value in values:
+            if bloom is not None:
+                bloom.add(value)
+            if self._pending is not None:
+                self._pending.setdefault((table, column), set()).add(value)
+
+    def _count_removed(self, table: str, count: int) -> None:
+        self._removed[table] = self._removed.get(table, 0) + count
+        sizes = [bloom.count for (name, _), bloom in self._filters.items() if name == table]
+        # Rebuild once a quarter of the values are gone
+        if sizes and self._removed[table] * 4 > max(sizes):
+            self._rebuild_soon()
+
+    def _rebuild_soon(self) -> None:
+        if not self._rebuilding.locked():
+            self._spawn(self.rebuild())
+
+    async def added(self, table: str, rows: Sequence[Any]) -> None:
+        """Record the filtered columns of written `rows` in every worker"""
+        if not settings.BLOOM_FILTER_ENABLED:
+            return
+        for column in self.columns.get(table, ()):
+            values = [str(getattr(row, column)) for row in rows if getattr(row, column, None) is not None]
+            if values:
+                self._add(table, column, values)
+                await self._publish({"table": table, "column": column, "values": values})
+
+    async def removed(self, table: str, count: int) -> None:
+        """Count deleted rows towards rebuilding the table's filters"""
+        if settings.BLOOM_FILTER_ENABLED and table in self.columns and count:
+            self._count_removed(table, count)
+            await self._publish({"table": table, "removed": count})
+
+    async def rebuild(self) -> None:
+        """Rebuild every filter from the primary (replicas may lag behind
+        values other workers already published)"""
+        async with self._rebuilding:
+            self._pending = {}
+            try:
+                # Read first: the tables then hold every write up to it,
+                # and updates published later land in _pending
+                generation = await self._read_generation()
+                filters = {}
+                async with AsyncSessionLocal() as db:
+                    for table, columns in self.columns.items():
+                        for column in columns:
+                            values = await self._values(db, table, column)
+                            bloom = BloomFilter(max(len(values) * 2, _MIN_CAPACITY), self.error_rate)
+                            for value in values:
+                                bloom.add(value)
+                            filters[(table, column)] = bloom
+                for (table, column), values in self._pending.items():
+                    for value in values:
+                        filters[(table, column)].add(value)
+                self._filters = filters
+                self._removed.clear()
+                if generation is not None:
+                    self.generation = max(generation, self.generation or 0)
+            finally:
+                self._pending = None
+
+    async def _read_generation(self) -> Optional[int]:
+        if self._redis() is None:
+            return None
+        return int(await self._call(lambda redis: redis.get(self.generation_key)) or 0)
+
+    @staticmethod
+    async def _values(db, table: str, column: str) -> List[str]:
+        column = Base.metadata.tables[table].c[column]
+        return [str(value) for value in (await db.execute(select(column).where(column.isnot(None)))).scalars()]
+
+    def _redis(self):
+        if not FastAPICache._init:
+            return None
+        return getattr(FastAPICache.get_backend(), "redis", None)
+
+    async def _call(self, command: Callable[[Any], Awaitable[Any]]) -> Any:
+        """Run `command(redis)` through the cache backend's circuit breaker
+        and timeout; raises when Redis is not answering"""
+        backend = FastAPICache.get_backend()
+        if isinstance(backend, FallbackBackend) and not backend.available():
+            raise ConnectionError("Redis circuit breaker is open")
+        return await asyncio.wait_for(guarded(backend, command(backend.redis)), settings.CACHE_REDIS_TIMEOUT)
+
+    async def _publish(self, message: dict) -> None:
+        if self._redis() is None:
+            return
+        if self._unpublished:
+            # The pending bump covers this update too
+            self._unpublished += 1
+            return
+        message = json.dumps({"origin": self._origin, **message})
+        try:
+            await self._call(lambda redis: redis.eval(_PUBLISH, 1, self.generation_key, self.channel, message))
+        except Exception:
+            logger.warning("Could not publish key filter update, bumping the generation once Redis is back", exc_info=True)
+            self._unpublished += 1
+            self._spawn(self._bump_later())
+
+    async def _bump_later(self) -> None:
+        # One task for every update that failed to publish. The other
+        # workers may reject their values until then (unless they lost
+        # Redis too and let everything through); a bumped generation makes
+        # them rebuild from the database, which has the rows by now
+        while self._unpublished:
+            await asyncio.sleep(1)
+            if self._redis() is None:
+                self._unpublished = 0
+                return
+            covered = self._unpublished
+            try:
+                await self._call(lambda redis: redis.incr(self.generation_key))
+            except Exception:
+                logger.warning("Could not bump the key filter generation, retrying", exc_info=True)
+                continue
+            # Updates made while the INCR was in flight may be newer than it
+            self._unpublished -= covered
+
+    def _on_message(self, data) -> None:
+        generation, message = data.split(b" ", 1) if isinstance(data, bytes) else data.split(" ", 1)
+        generation, message = int(generation), json.loads(message)
+        # This worker has applied its own updates already
+        if message["origin"] != self._origin:
+            if "removed" in message:
+                self._count_removed(message["table"], message["removed"])
+            else:
+                self._add(message["table"], message["column"], message["values"])
+        if self.generation is not None and generation == self.generation + 1:
+            self.generation = generation
+        elif self.generation is None or generation > self.generation:
+            # Some update never arrived
+            self._rebuild_soon()
+
+    async def _listen(self, redis) -> None:
+        while True:
+            pubsub = redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                # Anything published before the subscription was missed
+                await self.rebuild()
+                self.ready = True
+                async for message in pubsub.listen():
+                    self._on_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Key filter listener lost, retrying", exc_info=True)
+                self.ready = False
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.close()
+
+    async def _rebuild_periodically(self) -> None:
+        # The listener makes the first build
+        while True:
+            await asyncio.sleep(settings.BLOOM_FILTER_REBUILD_SECONDS)
+            try:
+                await self.rebuild()
+            except Exception:
+                logger.warning("Could not rebuild the key filters", exc_info=True)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def start(self) -> None:
+        """Build the filters and keep them current. They need Redis to
+        learn of other workers' and processes' writes, so without it they
+        stay off."""
+        redis = self._redis()
+        if redis is None:
+            logger.warning("Key filters need Redis, not starting them")
+            return
+        self._spawn(self._listen(redis))
+        self._spawn(self._rebuild_periodically())
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.ready = False
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "generation": self.generation,
+            "rejected": self.rejected,
+            "stale": self.stale,
+            "filters": {
+                f"{table}.{column}": {"values": bloom.count, "bits": bloom.bits, "hashes": bloom.hashes}
+                for (table, column), bloom in self._filters.items()
+            },
+        }
+
+key_filters = KeyFilters(FILTERED_COLUMNS, error_rate=settings.BLOOM_FILTER_ERROR_RATE, prefix="sda_key_filters:")
+
+def request_rebuild() -> None:
+    """Make every worker rebuild its key filters before rejecting anything
+    again. For writes made outside CRUDBase: the populate_* scripts call
+    it, deploy-production.sh runs it after the migrations, and after manual
+    SQL run `python -m app.core.bloom`. Synchronous, and a no-op while
+    BLOOM_FILTER_ENABLED is off; failures are logged."""
+    if not settings.BLOOM_FILTER_ENABLED:
+        return
+    client = redis_client.Redis.from_url(settings.get_redis_url, socket_timeout=1, socket_connect_timeout=1)
+    try:
+        client.incr(key_filters.generation_key)
+    except redis_client.RedisError:
+        logger.warning("Could not ask the API workers to rebuild their key filters", exc_info=True)
+    finally:
+        client.close()
+
+def require_known(table: str, column: str, param: str, detail: str):
+    """Dependency answering 404 with `detail` when path parameter `param`
+    is certainly not a `column` value of `table`"""
+
+    async def dependency(request: Request) -> None:
+        value = request.path_params.get(param)
+        if value is None or not settings.BLOOM_FILTER_ENABLED:
+            return
+        if column == "id":
+            try:
+                value = str(int(value))
+            except ValueError:
+                # Left to request validation
+                return
+        if not await key_filters.might_exist(table, column, value):
+            raise HTTPException(status_code=404, detail=detail)
+
+    return dependency
+
+if __name__ == "__main__":
+    logging.basicConfig()
+    request_rebuild()
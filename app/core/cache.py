@@ -1,8 +1,910 @@
+import asyncio
+import fnmatch
+import gzip
+import hashlib
+import inspect
+import json
+import logging
+import math
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import wraps
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from fastapi import params
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute, serialize_response
 from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
 from fastapi_cache.backends.redis import RedisBackend
+from pydantic import BaseModel
 from redis import asyncio as aioredis
-from ..core.config import settings
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount
+from starlette.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED, HTTP_404_NOT_FOUND
+from ..core.bloom import key_filters
+from ..core.cache_backend import FallbackBackend, LRUCache, TieredBackend, guarded
+from ..core.cache_stats import CacheStats
+from ..core.config import CachePolicy, settings
+from ..core.db import AsyncSessionLocal, read_session, replicas
+from ..models import Base
+from ..utils.multilingual import validate_language
 
-async def init_cache():
-    redis = aioredis.from_url(settings.get_redis_url)
-    FastAPICache.init(RedisBackend(redis), prefix="sda_cache:")
+logger = logging.getLogger(__name__)
+
+# Every key lives under "<CACHE_PREFIX><namespace>:", see cache_namespace()
+CACHE_PREFIX = "sda_cache:"
+
+# ASGI scope key the cache warmer sets to recompute entries that are cached
+REFRESH_SCOPE_KEY = "sda_cache.refresh"
+
+# Tag index for backends other than Redis (the in-memory one used in
+# development, and FallbackBackend's while Redis is down)
+_local_tags: Dict[str, Set[str]] = {}
+
+# Tags invalidated while Redis was unreachable, replayed once it is back
+_missed_invalidations: Set[str] = set()
+
+# When each tag was last invalidated by this worker (monotonic time), so
+# fills within READ_YOUR_WRITES_SECONDS read from the primary; other
+# workers' invalidations are marked in Redis
+_written_at: Dict[str, float] = {}
+
+# Fill locks (name -> token) that may have been taken but were not released
+# because Redis failed; released once it is back
+_orphaned_locks: Dict[str, str] = {}
+
+# Stands in for the endpoint result when a request was answered from a
+# value another request computed
+_FROM_CACHE = object()
+
+# Cache fills in progress in this worker, by key
+_inflight: Dict[str, asyncio.Future] = {}
+
+# Background refreshes in flight (held so they are not garbage collected)
+_background: Set[asyncio.Task] = set()
+
+# Seconds the last fill of each endpoint took, for early refresh
+_fill_seconds: Dict[str, float] = {}
+
+# Per-route counters and hot keys of this worker, see get_cache_stats()
+cache_stats = CacheStats(
+    sample_rate=settings.CACHE_STATS_SAMPLE_RATE,
+    hot_keys=settings.CACHE_STATS_HOT_KEYS,
+    max_keys=settings.CACHE_STATS_MAX_KEYS,
+)
+
+# Marks a stored value as "<envelope> <md5 of body> <last modified|->
+# <gzip|identity> <status>\n<body as sent>"
+_ENVELOPE = b"v3"
+
+# Delete the lock only if it is still ours
+_RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+def _is_injected(param: inspect.Parameter) -> bool:
+    """Depends() parameters and the request/response objects"""
+    if isinstance(param.default, params.Depends):
+        return True
+    return isinstance(param.annotation, type) and issubclass(param.annotation, (Request, Response))
+
+def _normalize(name: str, value: Any) -> Any:
+    if name == "language":
+        return validate_language(value)
+    if isinstance(value, (list, tuple, set)):
+        return sorted(value, key=str)
+    return value
+
+def request_key_builder(
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    args: Tuple[Any, ...] = (),
+    kwargs: Dict[str, Any],
+) -> str:
+    """Cache key built from the endpoint's own query/path parameters only.
+
+    Injected dependencies (the db session, Request, Response) are left out
+    since they differ on every call. Missing parameters take their
+    declared defaults, `language` goes through validate_language and list
+    parameters are sorted, so equivalent requests share one key.
+
+    Keys read "<namespace><module>.<function>:<language|->:<md5>", so they
+    can be listed and purged by route and language with SCAN.
+    """
+    values = {}
+    for name, param in inspect.signature(func).parameters.items():
+        if _is_injected(param):
+            continue
+        if name in kwargs:
+            value = kwargs[name]
+        else:
+            value = param.default
+            if isinstance(value, params.Param):
+                value = value.default
+            if value is inspect.Parameter.empty:
+                continue
+        values[name] = _normalize(name, value)
+    digest = hashlib.md5(json.dumps(values, sort_keys=True, default=str).encode()).hexdigest()
+    return f"{namespace}{func.__module__}.{func.__name__}:{values.get('language') or '-'}:{digest}"
+
+def cache_namespace(app) -> str:
+    """CACHE_NAMESPACE, or the app version plus a hash of what shapes the
+    cached responses: the OpenAPI schema, the table definitions and the
+    stored value format. A deploy that changes any of them starts on an
+    empty namespace, and the old one's entries run out their TTLs."""
+    if settings.CACHE_NAMESPACE:
+        return settings.CACHE_NAMESPACE
+    tables = [(table.name, [(c.name, str(c.type)) for c in table.columns]) for table in Base.metadata.sorted_tables]
+    shape = json.dumps([app.openapi(), tables, _ENVELOPE.decode()], sort_keys=True, default=str)
+    return f"{settings.VERSION}-{hashlib.md5(shape.encode()).hexdigest()[:10]}"
+
+async def init_cache(app):
+    # Commands are bounded by FallbackBackend; a socket_timeout would also
+    # break the idle pub/sub listener
+    redis = aioredis.from_url(settings.get_redis_url, socket_connect_timeout=settings.CACHE_REDIS_TIMEOUT)
+    if settings.CACHE_L1_MAX_BYTES > 0:
+        primary = TieredBackend(
+            redis,
+            max_bytes=settings.CACHE_L1_MAX_BYTES,
+            max_ttl=settings.CACHE_L1_MAX_TTL,
+            channel="sda_cache:l1-invalidate",
+        )
+        primary.start()
+    else:
+        primary = RedisBackend(redis)
+    backend = FallbackBackend(
+        primary,
+        timeout=settings.CACHE_REDIS_TIMEOUT,
+        failures=settings.CACHE_BREAKER_FAILURES,
+        reset_seconds=settings.CACHE_BREAKER_RESET_SECONDS,
+        max_bytes=settings.CACHE_FALLBACK_MAX_BYTES,
+        on_recover=_on_redis_recovered,
+    )
+    FastAPICache.init(backend, prefix=f"{CACHE_PREFIX}{cache_namespace(app)}:", key_builder=request_key_builder)
+
+async def close_cache():
+    if not FastAPICache._init:
+        return
+    backend = FastAPICache.get_backend()
+    if isinstance(backend, FallbackBackend):
+        backend = backend.primary
+    if isinstance(backend, TieredBackend):
+        await backend.stop()
+
+def _lru_stats(lru: LRUCache) -> dict:
+    return {"entries": len(lru), "bytes": lru.size, "max_bytes": lru.max_bytes}
+
+def get_cache_stats() -> dict:
+    """Response cache counters for the current worker process: per route
+    (hits, misses, stale and 304 answers, errors, distinct keys, bytes,
+    latency), the sampled hot keys, the state of the backend tiers and the
+    key filters' rejections"""
+    stats = cache_stats.snapshot()
+    stats["key_filters"] = key_filters.stats()
+    backend = FastAPICache.get_backend() if FastAPICache._init else None
+    if isinstance(backend, FallbackBackend):
+        stats["breaker"] = {
+            "state": backend.breaker.state,
+            "transitions": dict(backend.transitions),
+            "errors": backend.errors,
+        }
+        stats["fallback"] = _lru_stats(backend.local)
+        backend = backend.primary
+    if isinstance(backend, TieredBackend):
+        stats["l1"] = _lru_stats(backend.local)
+    return stats
+
+def _redis(backend) -> Optional[RedisBackend]:
+    """The Redis side of `backend`, or None when it has none or its circuit
+    breaker is open"""
+    if isinstance(backend, FallbackBackend):
+        return backend.primary if backend.available() else None
+    return backend if isinstance(backend, RedisBackend) else None
+
+def _tag_key(tag: str) -> str:
+    return f"{FastAPICache.get_prefix()}tag:{tag}"
+
+def _written_key(tag: str) -> str:
+    return f"{FastAPICache.get_prefix()}written:{tag}"
+
+def _read_your_writes() -> int:
+    """Seconds after a write during which fills avoid the replicas, 0 when
+    there are none"""
+    return settings.READ_YOUR_WRITES_SECONDS if replicas.engines else 0
+
+def _remember_writes(tags: Sequence[str]) -> None:
+    now = time.monotonic()
+    for tag, at in list(_written_at.items()):
+        if at <= now - settings.READ_YOUR_WRITES_SECONDS:
+            del _written_at[tag]
+    _written_at.update(dict.fromkeys(tags, now))
+
+async def _written_recently(backend, tags: Sequence[str]) -> bool:
+    """Whether any of `tags` was invalidated, by any worker, within
+    READ_YOUR_WRITES_SECONDS, i.e. the replicas may not have the write yet"""
+    window = _read_your_writes()
+    if not tags or window <= 0:
+        return False
+    since = time.monotonic() - window
+    if any(_written_at.get(tag, since) > since for tag in tags):
+        return True
+    redis_backend = _redis(backend)
+    if redis_backend is None:
+        return False
+    try:
+        return bool(await guarded(backend, redis_backend.redis.exists(*(_written_key(tag) for tag in tags))))
+    except Exception:
+        logger.warning("Could not check recent writes for tags %s, reading from the primary", tags, exc_info=True)
+        return True
+
+def _with_session(kwargs: Dict[str, Any], db: AsyncSession) -> Dict[str, Any]:
+    return {k: db if isinstance(v, AsyncSession) else v for k, v in kwargs.items()}
+
+async def _file_under_tags(key: str, tags: Iterable[str], expire: Optional[int]) -> None:
+    """Record `key` in the set index of each tag so invalidate() can find it"""
+    backend = FastAPICache.get_backend()
+    redis_backend = _redis(backend)
+    if redis_backend is not None:
+        async with redis_backend.redis.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.sadd(_tag_key(tag), key)
+                if expire:
+                    # The index has to outlive every key filed under it
+                    pipe.expire(_tag_key(tag), expire, nx=True)
+                    pipe.expire(_tag_key(tag), expire, gt=True)
+            await guarded(backend, pipe.execute())
+    else:
+        for tag in tags:
+            _local_tags.setdefault(tag, set()).add(key)
+
+async def invalidate(*tags: str) -> int:
+    """Delete every cached entry filed under any of `tags` and return how many
+    were dropped. Reads the tag sets rather than scanning with KEYS; errors
+    are logged, not raised, since callers have already committed.
+
+    While Redis is unreachable the tags are also kept and invalidated in
+    Redis once its circuit breaker closes again.
+
+    With read replicas, entries filed under `tags` are filled from the
+    primary for READ_YOUR_WRITES_SECONDS afterwards, so a lagging replica
+    cannot put the old data back for a whole TTL."""
+    if not tags or not FastAPICache._init:
+        return 0
+    if _read_your_writes() > 0:
+        _remember_writes(tags)
+    backend = FastAPICache.get_backend()
+    redis_backend = _redis(backend)
+    if redis_backend is not None:
+        try:
+            return await _invalidate_in_redis(backend, redis_backend, tags)
+        except Exception:
+            logger.warning("Cache invalidation failed for tags %s", tags, exc_info=True)
+            if not isinstance(backend, FallbackBackend):
+                return 0
+    if isinstance(backend, FallbackBackend):
+        _missed_invalidations.update(tags)
+    try:
+        keys = set().union(*(_local_tags.pop(tag, set()) for tag in tags))
+        for key in keys:
+            try:
+                await backend.clear(key=key)
+            except KeyError:
+                pass
+        return len(keys)
+    except Exception:
+        logger.warning("Cache invalidation failed for tags %s", tags, exc_info=True)
+        return 0
+
+async def _invalidate_in_redis(backend, redis_backend: RedisBackend, tags: Sequence[str]) -> int:
+    # Read and drop the indexes atomically so no key filed meanwhile is lost
+    async with redis_backend.redis.pipeline(transaction=True) as pipe:
+        for tag in tags:
+            pipe.smembers(_tag_key(tag))
+        pipe.delete(*(_tag_key(tag) for tag in tags))
+        window = _read_your_writes()
+        if window > 0:
+            for tag in tags:
+                pipe.set(_written_key(tag), 1, ex=window)
+        members = (await guarded(backend, pipe.execute()))[:len(tags)]
+    keys = set().union(*members)
+    if not keys:
+        return 0
+    count = await guarded(backend, redis_backend.redis.delete(*keys))
+    if isinstance(redis_backend, TieredBackend):
+        await guarded(backend, redis_backend.forget(key.decode() for key in keys))
+    return count
+
+async def _on_redis_recovered(backend: FallbackBackend) -> None:
+    """Catch Redis up before its breaker closes: invalidate what was
+    invalidated while it was unreachable and release fill locks that may
+    have been left behind. Raises, so the breaker stays open, on failure."""
+    # Straight to the primary: through the breaker a success would close it early
+    redis_backend = backend.primary
+    tags = list(_missed_invalidations)
+    if tags:
+        await _invalidate_in_redis(redis_backend, redis_backend, tags)
+    _missed_invalidations.difference_update(tags)
+    # The fallback entries filed under them are dropped with the fallback
+    _local_tags.clear()
+    for lock, token in list(_orphaned_locks.items()):
+        await redis_backend.redis.eval(_RELEASE_LOCK, 1, lock, token)
+        del _orphaned_locks[lock]
+
+def glob_escape(value: str) -> str:
+    """`value` matched literally by a Redis (and fnmatch) glob"""
+    return "".join(f"[{char}]" if char in "*?[" else char for char in value)
+
+async def table_tags(table: str) -> Set[str]:
+    """The tags of `table` ("<table>:list", "<table>:<id>") that currently
+    index cached entries"""
+    if _redis(FastAPICache.get_backend()) is None:
+        return {tag for tag in _local_tags if tag.startswith(f"{table}:")}
+    tag_prefix = _tag_key("")
+    tags = set()
+    async for batch in scan_keys(f"{glob_escape(tag_prefix + table)}:*"):
+        tags.update(key[len(tag_prefix):] for key in batch)
+    return tags
+
+def _unavailable() -> HTTPException:
+    return HTTPException(status_code=503, detail="Cache backend unavailable")
+
+async def scan_keys(pattern: str) -> AsyncIterator[List[str]]:
+    """Batches of keys matching the glob `pattern`, read with SCAN
+    (CACHE_ADMIN_SCAN_COUNT at a time) rather than KEYS so Redis is never
+    blocked for long. Fill locks are left out."""
+    backend = FastAPICache.get_backend()
+    redis_backend = _redis(backend)
+    if redis_backend is not None:
+        cursor = None
+        while cursor != 0:
+            cursor, keys = await guarded(
+                backend, redis_backend.redis.scan(cursor or 0, match=pattern, count=settings.CACHE_ADMIN_SCAN_COUNT)
+            )
+            keys = [key.decode() for key in keys if not key.endswith(b":lock")]
+            if keys:
+                yield keys
+    elif isinstance(backend, InMemoryBackend):
+        keys = [key for key in list(backend._store) if fnmatch.fnmatchcase(key, pattern) and not key.endswith(":lock")]
+        for start in range(0, len(keys), settings.CACHE_ADMIN_SCAN_COUNT):
+            yield keys[start:start + settings.CACHE_ADMIN_SCAN_COUNT]
+    else:
+        raise _unavailable()
+
+async def describe_keys(keys: Sequence[str]) -> List[Dict[str, Any]]:
+    """TTL in seconds (-1: no expiry) and stored size of each cached response
+    in `keys` that still exists"""
+    backend = FastAPICache.get_backend()
+    redis_backend = _redis(backend)
+    if redis_backend is not None:
+        async with redis_backend.redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.ttl(key)
+                pipe.strlen(key)
+            replies = await guarded(backend, pipe.execute())
+        described = [{"key": key, "ttl": ttl, "bytes": size} for key, ttl, size in zip(keys, replies[::2], replies[1::2])]
+        return [entry for entry in described if entry["ttl"] != -2]
+    if isinstance(backend, InMemoryBackend):
+        now = int(time.time())
+        values = [(key, backend._store.get(key)) for key in keys]
+        return [{"key": key, "ttl": value.ttl_ts - now, "bytes": len(value.data)} for key, value in values if value is not None]
+    raise _unavailable()
+
+async def delete_keys(keys: Sequence[str]) -> int:
+    """Delete `keys` with UNLINK (Redis frees them in the background) and
+    from every worker's in-memory tier; returns how many existed"""
+    if not keys:
+        return 0
+    backend = FastAPICache.get_backend()
+    redis_backend = _redis(backend)
+    if redis_backend is not None:
+        count = await guarded(backend, redis_backend.redis.unlink(*keys))
+        if isinstance(redis_backend, TieredBackend):
+            await guarded(backend, redis_backend.forget(keys))
+        return count
+    if isinstance(backend, InMemoryBackend):
+        return sum(backend._store.pop(key, None) is not None for key in keys)
+    raise _unavailable()
+
+def _last_modified(result: Any) -> Optional[int]:
+    """Latest `updated_at` anywhere in an endpoint result (dicts, lists,
+    pydantic models and loaded ORM attributes), as a Unix timestamp"""
+    latest = None
+    seen = set()
+    stack = [result]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, BaseModel) or hasattr(value, "_sa_instance_state"):
+            value = value.__dict__
+        if isinstance(value, dict):
+            if id(value) in seen:
+                continue
+            seen.add(id(value))
+            stamp = value.get("updated_at")
+            if isinstance(stamp, datetime):
+                if stamp.tzinfo is None:
+                    stamp = stamp.replace(tzinfo=timezone.utc)
+                latest = stamp if latest is None else max(latest, stamp)
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return int(latest.timestamp()) if latest is not None else None
+
+async def _render(route: Optional[APIRoute], result: Any) -> bytes:
+    """The body FastAPI sends for `result` returned from `route`: filtered
+    through its response_model and rendered by its response class"""
+    if isinstance(result, Response):
+        return result.body
+    if route is None:
+        return JSONResponse(jsonable_encoder(result)).body
+    content = await serialize_response(
+        field=route.response_field,
+        response_content=result,
+        include=route.response_model_include,
+        exclude=route.response_model_exclude,
+        by_alias=route.response_model_by_alias,
+        exclude_unset=route.response_model_exclude_unset,
+        exclude_defaults=route.response_model_exclude_defaults,
+        exclude_none=route.response_model_exclude_none,
+    )
+    response_class = route.response_class
+    if isinstance(response_class, DefaultPlaceholder):
+        response_class = response_class.value
+    return response_class(content).body
+
+def _pack(body: bytes, last_modified: Optional[int], status: int = HTTP_200_OK) -> bytes:
+    """Prefix a rendered response with its validators, encoding and status,
+    gzipping bodies of CACHE_COMPRESS_MIN_BYTES or more"""
+    digest = hashlib.md5(body).hexdigest().encode()
+    modified = b"-" if last_modified is None else str(last_modified).encode()
+    encoding = b"identity"
+    if settings.CACHE_COMPRESS_MIN_BYTES > 0 and len(body) >= settings.CACHE_COMPRESS_MIN_BYTES:
+        body, encoding = gzip.compress(body, compresslevel=settings.CACHE_COMPRESS_LEVEL, mtime=0), b"gzip"
+    return b"%s %s %s %s %d\n" % (_ENVELOPE, digest, modified, encoding, status) + body
+
+def _unpack(stored: bytes) -> Optional[Tuple[str, Optional[int], str, int, bytes]]:
+    """(ETag, Last-Modified timestamp or None, encoding, status, body) of a
+    stored response, or None for a value in an older format"""
+    if not stored.startswith(_ENVELOPE + b" "):
+        return None
+    header, body = stored.split(b"\n", 1)
+    _, digest, modified, encoding, status = header.decode().split(" ")
+    return f'"{digest}"', None if modified == "-" else int(modified), encoding, int(status), body
+
+def _not_found_tags(tags: Sequence[str]) -> List[str]:
+    """The "<table>:list" tags of a route's `tags`, which every write to
+    the table invalidates (a 404 has no result to format the rest with)"""
+    return sorted({tag.split(":", 1)[0] + ":list" for tag in tags})
+
+def _accepts_gzip(request: Optional[Request]) -> bool:
+    """Whether the client's Accept-Encoding allows gzip"""
+    if request is None:
+        return False
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        quality = params.strip().lower()
+        if not quality.startswith("q="):
+            return True
+        try:
+            return float(quality[2:]) > 0
+        except ValueError:
+            return False
+    return False
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[int]) -> bool:
+    """Whether a conditional GET can be answered with 304 (RFC 9110 13.2.2):
+    If-None-Match is compared weakly and, when sent, If-Modified-Since is
+    ignored"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified <= since.timestamp()
+
+def _http_date(timestamp: int) -> str:
+    return format_datetime(datetime.fromtimestamp(timestamp, timezone.utc), usegmt=True)
+
+def _format_tags(tags: Sequence[str], kwargs: Dict[str, Any], result: Any) -> List[str]:
+    if any("{result" in tag for tag in tags):
+        kwargs = {**kwargs, "result": jsonable_encoder(result)}
+    return [tag.format(**kwargs) for tag in tags]
+
+async def _single_flight(
+    key: str, fill: Callable[[], Awaitable[Tuple[Any, Optional[bytes]]]]
+) -> Tuple[Any, Optional[bytes]]:
+    """Run `fill` once per key among concurrent callers in this worker.
+
+    Only the caller that ran it gets the result object; the others get
+    _FROM_CACHE with the same encoded value (or the same exception).
+    """
+    future = _inflight.get(key)
+    if future is not None:
+        return _FROM_CACHE, await asyncio.shield(future)
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result, encoded = await fill()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # retrieved, even when nobody was waiting
+        raise
+    else:
+        future.set_result(encoded)
+        return result, encoded
+    finally:
+        del _inflight[key]
+
+async def _locked_fill(
+    backend, key: str, fill: Callable[[], Awaitable[Tuple[Any, bytes]]], *, wait: bool
+) -> Tuple[Any, Optional[bytes]]:
+    """Run `fill` under a short Redis lock so one worker recomputes a key.
+
+    A worker that finds the key locked polls for the value the holder
+    stores and returns (_FROM_CACHE, value), or returns (_FROM_CACHE, None)
+    straight away when `wait` is false (the caller still has a usable
+    value). It fills without the lock once the lock outlives
+    CACHE_LOCK_SECONDS or when Redis cannot be reached.
+    """
+    redis_backend = _redis(backend)
+    if redis_backend is None:
+        return await fill()
+    lock, token = f"{key}:lock", uuid.uuid4().hex
+    deadline = time.monotonic() + settings.CACHE_LOCK_SECONDS
+    while True:
+        try:
+            acquired = await guarded(backend, redis_backend.redis.set(lock, token, nx=True, ex=settings.CACHE_LOCK_SECONDS))
+        except Exception:
+            logger.warning("Cache lock unavailable for '%s', filling without it", key, exc_info=True)
+            # The SET may still have reached Redis
+            _orphaned_locks[lock] = token
+            return await fill()
+        if acquired:
+            break
+        if not wait:
+            return _FROM_CACHE, None
+        if time.monotonic() > deadline:
+            return await fill()
+        await asyncio.sleep(0.05)
+        cached = await backend.get(key)
+        if cached is not None:
+            return _FROM_CACHE, cached
+    try:
+        return await fill()
+    finally:
+        try:
+            await guarded(backend, redis_backend.redis.eval(_RELEASE_LOCK, 1, lock, token))
+        except Exception:
+            logger.warning("Could not release cache lock '%s'", lock, exc_info=True)
+            _orphaned_locks[lock] = token
+
+def _refresh_early(name: str, remaining: int, beta: float) -> bool:
+    """Probabilistic early expiration (XFetch): the closer the entry is to
+    expiring relative to how long it takes to recompute, the likelier one
+    request recomputes it ahead of time"""
+    delta = _fill_seconds.get(name)
+    if not beta or delta is None or remaining <= 0:
+        return False
+    return -delta * beta * math.log(1.0 - random.random()) >= remaining
+
+def _revalidate_in_background(key: str, backend, refill: Callable[[], Awaitable[Tuple[Any, bytes]]]) -> None:
+    """Refresh `key` off the request path unless a fill is already running"""
+    if key in _inflight:
+        return
+    task = asyncio.create_task(_single_flight(key, lambda: _locked_fill(backend, key, refill, wait=False)))
+    _background.add(task)
+    task.add_done_callback(_background_done)
+
+def _background_done(task: asyncio.Task) -> None:
+    _background.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background cache refresh failed", exc_info=task.exception())
+
+def route_policy(request: Optional[Request]) -> CachePolicy:
+    """settings.CACHE_POLICIES entry for the route that matched `request`,
+    or for the mount (static files) its path is under"""
+    route = request.scope.get("route") if request is not None else None
+    if route is None and request is not None and "app" in request.scope:
+        # Mounted apps leave no route in the scope
+        path = request.url.path
+        route = next((
+            mount for mount in request.app.routes
+            if isinstance(mount, Mount) and (path == mount.path or path.startswith(f"{mount.path}/"))
+        ), None)
+    return settings.cache_policy(getattr(route, "path", ""))
+
+def bypasses_cache(request: Request) -> bool:
+    """Whether the client asked for a response that is neither read from
+    nor written to any cache"""
+    return request.headers.get("Cache-Control") == "no-store"
+
+def forces_refresh(request: Optional[Request]) -> bool:
+    """Whether `request` recomputes its entry even when it is cached. Only
+    the cache warmer's requests do; a client's Cache-Control: no-cache is
+    served like any other, or it could be used to skip the fill locks"""
+    return request is not None and bool(request.scope.get(REFRESH_SCOPE_KEY))
+
+def cache_control_headers(policy: CachePolicy, fresh_left: Optional[int], stale_left: int = 0) -> Dict[str, str]:
+    """Cache-Control for browsers and Surrogate-Control for nginx/CDN, neither
+    allowed to keep a response longer than the `fresh_left` seconds it stays
+    fresh server-side (None: not cached server-side)"""
+    if policy.private:
+        return {"Cache-Control": "private, no-store"}
+    max_age, s_maxage = policy.max_age, policy.s_maxage
+    if fresh_left is not None:
+        fresh_left = max(fresh_left, 0)
+        max_age, s_maxage = min(max_age, fresh_left), min(s_maxage, fresh_left)
+    stale = f", stale-while-revalidate={stale_left}" if stale_left else ""
+    return {
+        "Cache-Control": f"public, max-age={max_age}{stale}",
+        "Surrogate-Control": f"max-age={s_maxage}{stale}",
+    }
+
+def cache(tags: Sequence[str] = ()):
+    """Response cache for GET endpoints, behaving like fastapi_cache's @cache
+    (key builder, X-FastAPI-Cache header) and additionally filing
+    each stored response under `tags`. TTLs and the emitted Cache-Control/
+    Surrogate-Control come from the route's settings.CACHE_POLICIES entry.
+
+    Tags are str.format templates over the endpoint's parameters and, as
+    `result`, its JSON-encoded return value: "projects:list",
+    "projects:{project_id}", "projects:{result[project_id]}". CRUDBase
+    writes invalidate "<table>:list" and "<table>:<id>".
+
+    Misses are single-flight: one request per worker, and one worker per
+    key (see _locked_fill), recomputes while the rest wait for its value.
+    With the policy's `early_refresh` (the XFetch beta) set, a request may
+    recompute an entry shortly before it expires while the
+    others keep being served the current value.
+
+    Stale-while-revalidate: an entry is fresh for the policy's `ttl`
+    seconds, then served as-is for up to `stale` more while one background
+    task recomputes it with its own database session.
+
+    Each response carries a strong ETag (MD5 of the body) and, when the body
+    has `updated_at` values, Last-Modified (the latest of them). Both are
+    stored with the entry, so a conditional hit is answered with 304 before
+    the body is decoded or serialized and without touching the database.
+
+    What is stored is the final response body, rendered once through the
+    route's response_model and gzipped when large. Hits send those bytes
+    as they are (decompressing only for clients that do not accept gzip).
+
+    A 404 raised by the endpoint is cached too, for the policy's
+    `not_found_ttl` seconds and filed under the "<table>:list" tags, so
+    creating the missing row drops it. It is never served stale.
+
+    With read replicas, an entry whose tags were invalidated less than
+    READ_YOUR_WRITES_SECONDS ago is filled from the primary (see
+    invalidate()); otherwise fills use the request's session.
+
+    Every request is counted in `cache_stats` under its route path, see
+    get_cache_stats().
+    """
+    injected = [
+        inspect.Parameter("_cache_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+        inspect.Parameter("_cache_response", inspect.Parameter.KEYWORD_ONLY, annotation=Response),
+    ]
+
+    def wrapper(func):
+        signature = inspect.signature(func)
+        name = f"{func.__module__}.{func.__name__}"
+        # Tags that can be formatted before the endpoint has run
+        known_tags = [tag for tag in tags if "{result" not in tag]
+        result_tags = [tag for tag in tags if "{result" in tag]
+
+        @wraps(func)
+        async def inner(*args, **kwargs):
+            request: Optional[Request] = kwargs.pop("_cache_request", None)
+            response: Optional[Response] = kwargs.pop("_cache_response", None)
+            policy = route_policy(request)
+            if (
+                policy.ttl <= 0
+                or not FastAPICache._init
+                or not FastAPICache.get_enable()
+                or (request is not None and (request.method != "GET" or bypasses_cache(request)))
+            ):
+                return await func(*args, **kwargs)
+
+            started = time.perf_counter()
+            fresh, stale_ttl = policy.ttl, policy.stale
+            route = request.scope.get("route") if request is not None else None
+            route_label = getattr(route, "path", name)
+            backend = FastAPICache.get_backend()
+            status_header = FastAPICache.get_cache_status_header()
+            key = FastAPICache.get_key_builder()(
+                func, FastAPICache.get_prefix(), request=request, response=response, args=args, kwargs=kwargs
+            )
+            if inspect.isawaitable(key):
+                key = await key
+
+            async def store(encoded: bytes, ttl: int, tag_names: List[str]) -> None:
+                try:
+                    await backend.set(key, encoded, ttl)
+                    if tag_names:
+                        await _file_under_tags(key, tag_names, ttl)
+                except Exception:
+                    logger.warning("Error setting cache key '%s' in backend:", key, exc_info=True)
+                    cache_stats.record_error(route_label)
+
+            async def fill(call_kwargs: Dict[str, Any] = kwargs, primary: bool = False) -> Tuple[Any, bytes]:
+                # Right after a write the session's replica may not have it
+                # yet; what is stored now is served for a whole TTL
+                if not primary and await _written_recently(backend, _format_tags(known_tags, call_kwargs, None)):
+                    primary = True
+                fill_started = time.perf_counter()
+                try:
+                    if primary:
+                        async with AsyncSessionLocal() as db:
+                            result = await func(*args, **_with_session(call_kwargs, db))
+                    else:
+                        result = await func(*args, **call_kwargs)
+                except HTTPException as e:
+                    if e.status_code != HTTP_404_NOT_FOUND or policy.not_found_ttl <= 0:
+                        raise
+                    tag_names = _not_found_tags(tags)
+                    if not primary and await _written_recently(backend, tag_names):
+                        return await fill(call_kwargs, primary=True)
+                    # Negative entry: the exception stands in for the result
+                    encoded = _pack(JSONResponse({"detail": e.detail}).body, None, e.status_code)
+                    await store(encoded, policy.not_found_ttl, tag_names)
+                    return e, encoded
+                # Tags that depend on the result can only be checked now
+                if not primary and await _written_recently(backend, _format_tags(result_tags, call_kwargs, result)):
+                    return await fill(call_kwargs, primary=True)
+                _fill_seconds[name] = time.perf_counter() - fill_started
+                encoded = _pack(await _render(route, result), _last_modified(result))
+                cache_stats.record_fill(route_label, _fill_seconds[name], len(encoded))
+                await store(encoded, fresh + stale_ttl, _format_tags(tags, call_kwargs, result))
+                return result, encoded
+
+            async def refill() -> Tuple[Any, bytes]:
+                # The request's own session is closed once it has responded
+                async with read_session() as db:
+                    return await fill(_with_session(kwargs, db))
+
+            try:
+                remaining, cached = await backend.get_with_ttl(key)
+            except Exception:
+                logger.warning("Error retrieving cache key '%s' from backend:", key, exc_info=True)
+                cache_stats.record_error(route_label)
+                remaining, cached = 0, None
+            entry = _unpack(cached) if cached is not None else None
+            if entry is None:
+                # Missing, or stored by an older version of this decorator
+                remaining, cached = 0, None
+            # Negative entries are never served stale
+            negative = entry is not None and entry[3] != HTTP_200_OK
+            fresh_left = remaining if negative else remaining - stale_ttl
+            stale = cached is not None and not negative and stale_ttl > 0 and fresh_left <= 0
+
+            if cached is None or forces_refresh(request):
+                # Concurrent forced refreshes of a key collapse too
+                result, encoded = await _single_flight(key, lambda: _locked_fill(backend, key, fill, wait=True))
+            elif stale:
+                _revalidate_in_background(key, backend, refill)
+                result, encoded = _FROM_CACHE, None
+            elif key not in _inflight and _refresh_early(name, fresh_left, policy.early_refresh):
+                # Recompute ahead of expiry unless someone already is; the
+                # current value is served meanwhile
+                result, encoded = await _single_flight(key, lambda: _locked_fill(backend, key, fill, wait=False))
+            else:
+                result, encoded = _FROM_CACHE, None
+            if encoded is not None:
+                cached = encoded
+            elif cached is None:
+                # Joined an early refresh that deferred to another worker
+                result, cached = await fill()
+            leader = result is not _FROM_CACHE
+            if leader:
+                fresh_left, stale = fresh, False
+
+            entry = _unpack(cached)
+            if entry is None:
+                # A waiter picked up a value in an older format
+                result, cached = await fill()
+                entry, leader, fresh_left, stale = _unpack(cached), True, fresh, False
+            etag, last_modified, encoding, status, body = entry
+            outcome = "miss" if leader else "stale" if stale else "hit"
+            if request is None or response is None:
+                # Called directly rather than as an endpoint
+                cache_stats.record(route_label, key, outcome, time.perf_counter() - started, 0)
+                if leader and not isinstance(result, HTTPException):
+                    return result
+                content = json.loads(gzip.decompress(body) if encoding == "gzip" else body)
+                if status != HTTP_200_OK:
+                    raise HTTPException(status_code=status, detail=content["detail"])
+                return content
+
+            if status != HTTP_200_OK:
+                body = gzip.decompress(body) if encoding == "gzip" else body
+                cache_stats.record(route_label, key, outcome, time.perf_counter() - started, len(body))
+                return Response(
+                    content=body,
+                    status_code=status,
+                    headers={
+                        **cache_control_headers(policy, policy.not_found_ttl if leader else remaining),
+                        status_header: outcome.upper(),
+                    },
+                    media_type="application/json",
+                )
+
+            headers = {
+                **cache_control_headers(policy, fresh_left, remaining if stale else stale_ttl),
+                status_header: outcome.upper(),
+            }
+            if encoding == "gzip":
+                headers["Vary"] = "Accept-Encoding"
+                if _accepts_gzip(request):
+                    # Same content, different representation, so a different strong ETag
+                    etag = etag[:-1] + '-gzip"'
+                    headers["Content-Encoding"] = "gzip"
+                else:
+                    body = gzip.decompress(body)
+            headers["ETag"] = etag
+            if last_modified is not None:
+                headers["Last-Modified"] = _http_date(last_modified)
+            url = request.url.path + (f"?{request.url.query}" if request.url.query else "")
+            if is_not_modified(request, etag, last_modified):
+                headers.pop("Content-Encoding", None)
+                response.headers.update(headers)
+                response.status_code = HTTP_304_NOT_MODIFIED
+                # A 304 the endpoint had to be run for still counts as a miss
+                cache_stats.record(route_label, key, outcome if leader else "not_modified", time.perf_counter() - started, 0, url)
+                return response
+            cache_stats.record(route_label, key, outcome, time.perf_counter() - started, len(body), url)
+            # The stored bytes are the final body, so hits skip decoding and
+            # response_model serialization altogether
+            return Response(
+                content=body,
+                status_code=getattr(route, "status_code", None) or 200,
+                headers=headers,
+                media_type="application/json",
+            )
+
+        inner.__signature__ = signature.replace(parameters=[*signature.parameters.values(), *injected])
+        return inner
+
+    return wrapper
+
+async def get_cached_count(key: str) -> Optional[int]:
+    """Return a total stored by set_cached_count, or None on a miss or before init_cache()"""
+    if not FastAPICache._init or settings.COUNT_CACHE_TTL <= 0:
+        return None
+    value = await FastAPICache.get_backend().get(FastAPICache.get_prefix() + key)
+    return int(value) if value is not None else None
+
+async def set_cached_count(key: str, total: int, tags: Sequence[str] = ()) -> None:
+    """Store a total for COUNT_CACHE_TTL seconds, filed under `tags` so writes drop it"""
+    if not FastAPICache._init or settings.COUNT_CACHE_TTL <= 0:
+        return
+    key = FastAPICache.get_prefix() + key
+    await FastAPICache.get_backend().set(key, str(total), expire=settings.COUNT_CACHE_TTL)
+    if tags:
+        await _file_under_tags(key, tags, settings.COUNT_CACHE_TTL)
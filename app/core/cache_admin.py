@@ -0,0 +1,105 @@
+import inspect
+from typing import Dict, List, Optional
+from fastapi import HTTPException
+from fastapi.routing import APIRoute
+from fastapi_cache import FastAPICache
+from ..core.cache import CACHE_PREFIX, delete_keys, describe_keys, glob_escape, invalidate, scan_keys, table_tags
+from ..core.config import settings
+from ..models import Base
+from ..utils.multilingual import SUPPORTED_LANGUAGES
+
+def _current_namespace() -> str:
+    return FastAPICache.get_prefix()[len(CACHE_PREFIX):].rstrip(":")
+
+def cached_routes(app) -> Dict[str, str]:
+    """Route path (without API_V1_STR) -> "<module>.<function>", as it
+    appears in cache keys, of every @cache endpoint"""
+    found = {}
+    routes = list(app.router.routes)
+    while routes:
+        route = routes.pop()
+        included = getattr(route, "original_router", None)
+        if included is not None:
+            routes.extend(included.routes)
+        elif isinstance(route, APIRoute) and "_cache_request" in inspect.signature(route.endpoint).parameters:
+            endpoint = route.endpoint
+            found[route.path.removeprefix(settings.API_V1_STR)] = f"{endpoint.__module__}.{endpoint.__name__}"
+    return found
+
+def _pattern(app, route: Optional[str], language: Optional[str]) -> str:
+    """Glob over the current namespace's cached responses of `route` and/or
+    in `language` (see request_key_builder for the key layout)"""
+    function = "*.*"
+    if route is not None:
+        routes = cached_routes(app)
+        route = route.removeprefix(settings.API_V1_STR)
+        if route not in routes:
+            raise HTTPException(status_code=404, detail=f"No cached route {route}")
+        function = glob_escape(routes[route])
+    if language is not None and language not in SUPPORTED_LANGUAGES:
+        raise HTTPException(status_code=400, detail=f"Language must be one of {SUPPORTED_LANGUAGES}")
+    return f"{glob_escape(FastAPICache.get_prefix())}{function}:{language or '*'}:*"
+
+async def list_keys(app, route: Optional[str] = None, language: Optional[str] = None, limit: int = 100) -> dict:
+    """Up to `limit` cached responses of `route` and/or in `language`, with
+    their TTL and stored size"""
+    pattern = _pattern(app, route, language)
+    keys: List[str] = []
+    async for batch in scan_keys(pattern):
+        keys.extend(batch)
+        if len(keys) > limit:
+            break
+    return {
+        "namespace": _current_namespace(),
+        "pattern": pattern,
+        "keys": await describe_keys(keys[:limit]),
+        "truncated": len(keys) > limit,
+    }
+
+async def _delete_matching(pattern: str) -> int:
+    deleted = 0
+    async for batch in scan_keys(pattern):
+        deleted += await delete_keys(batch)
+    return deleted
+
+async def purge_keys(app, route: Optional[str] = None, language: Optional[str] = None) -> dict:
+    """Delete the cached responses of `route` and/or in `language`, one SCAN
+    batch at a time"""
+    if route is None and language is None:
+        raise HTTPException(status_code=400, detail="Give a route and/or a language, or purge the namespace")
+    pattern = _pattern(app, route, language)
+    return {"pattern": pattern, "deleted": await _delete_matching(pattern)}
+
+async def purge_entity(table: str, id: Optional[int] = None) -> dict:
+    """Invalidate what is cached for one row of `table` (and its lists), or
+    for every row when `id` is None, through the tag index"""
+    if table not in Base.metadata.tables:
+        raise HTTPException(status_code=404, detail=f"Unknown table {table}")
+    tags = {f"{table}:list"}
+    if id is not None:
+        tags.add(f"{table}:{id}")
+    else:
+        tags.update(await table_tags(table))
+    return {"tags": len(tags), "deleted": await invalidate(*sorted(tags))}
+
+async def list_namespaces() -> dict:
+    """Key counts per cache namespace; older ones expire on their own once
+    no worker uses them"""
+    counts: Dict[str, int] = {}
+    async for batch in scan_keys(f"{CACHE_PREFIX}*"):
+        for key in batch:
+            namespace = key[len(CACHE_PREFIX):].split(":", 1)[0]
+            counts[namespace] = counts.get(namespace, 0) + 1
+    current = _current_namespace()
+    return {
+        "current": current,
+        "namespaces": [
+            {"namespace": namespace, "keys": count, "current": namespace == current}
+            for namespace, count in sorted(counts.items())
+        ],
+    }
+
+async def purge_namespace(namespace: str) -> dict:
+    """Delete every key of `namespace`, e.g. to free an old deploy's
+    entries before they expire"""
+    return {"namespace": namespace, "deleted": await _delete_matching(f"{CACHE_PREFIX}{glob_escape(namespace)}:*")}
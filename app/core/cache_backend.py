@@ -0,0 +1,317 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+from fastapi_cache.backends import Backend
+from fastapi_cache.backends.redis import RedisBackend
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Lifetime of fallback entries stored without an expiry
+FALLBACK_TTL = 60
+
+class LRUCache:
+    """Byte-bounded LRU of cache values with per-entry expiry"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        # key -> (value, local expiry, Redis expiry), monotonic seconds
+        self._entries: "OrderedDict[str, Tuple[bytes, float, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        """(value, Redis expiry) for a live entry, marking it recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires, remote_expires = entry
+        if expires <= time.monotonic():
+            self.pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return value, remote_expires
+
+    def put(self, key: str, value: bytes, ttl: float, max_ttl: float) -> None:
+        self.pop(key)
+        cost = len(key) + len(value)
+        if ttl <= 0 or cost > self.max_bytes:
+            return
+        now = time.monotonic()
+        self._entries[key] = (value, now + min(ttl, max_ttl), now + ttl)
+        self.size += cost
+        while self.size > self.max_bytes:
+            old_key, (old_value, _, _) = self._entries.popitem(last=False)
+            self.size -= len(old_key) + len(old_value)
+
+    def pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(key) + len(entry[0])
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+class TieredBackend(RedisBackend):
+    """RedisBackend with a per-worker LRU in front of it.
+
+    Reads are answered from memory while the entry lives (at most
+    max_ttl seconds, never past its Redis TTL). Every set and delete is
+    published on `channel`, and each worker's listener drops those keys
+    from its own LRU, so all workers and nodes stay coherent. A worker
+    that loses its subscription empties its LRU, since it may have missed
+    messages.
+    """
+
+    def __init__(self, redis, *, max_bytes: int, max_ttl: int, channel: str):
+        super().__init__(redis)
+        self.local = LRUCache(max_bytes)
+        self.max_ttl = max_ttl
+        self.channel = channel
+        self._origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:
+        entry = self.local.get(key)
+        if entry is not None:
+            value, remote_expires = entry
+            return max(int(remote_expires - time.monotonic()), 0), value
+        ttl, value = await super().get_with_ttl(key)
+        if value is not None:
+            self.local.put(key, value, ttl, self.max_ttl)
+        return ttl, value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return (await self.get_with_ttl(key))[1]
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        await super().set(key, value, expire)
+        await self.forget([key])
+        if expire:
+            self.local.put(key, value, expire, self.max_ttl)
+
+    async def clear(self, namespace: Optional[str] = None, key: Optional[str] = None) -> int:
+        count = await super().clear(namespace, key)
+        if namespace:
+            self.local.clear()
+            await self._publish(["*"])
+        elif key:
+            await self.forget([key])
+        return count
+
+    async def forget(self, keys: Iterable[str]) -> None:
+        """Drop `keys` from this worker's LRU and tell the other workers to"""
+        keys = list(keys)
+        for key in keys:
+            self.local.pop(key)
+        if keys:
+            await self._publish(keys)
+
+    async def _publish(self, keys) -> None:
+        try:
+            await self.redis.publish(self.channel, json.dumps({"origin": self._origin, "keys": keys}))
+        except Exception:
+            logger.warning("Could not publish L1 cache invalidation", exc_info=True)
+
+    def _on_message(self, data) -> None:
+        message = json.loads(data)
+        # This worker already dropped its own keys, and may since have
+        # stored fresh values under them
+        if message["origin"] != self._origin:
+            self._drop(message["keys"])
+
+    def _drop(self, keys) -> None:
+        if "*" in keys:
+            self.local.clear()
+        for key in keys:
+            self.local.pop(key)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(self.channel)
+                # Anything published before the subscription was missed
+                self.local.clear()
+                async for message in pubsub.listen():
+                    self._on_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("L1 cache invalidation listener lost, retrying", exc_info=True)
+                self.local.clear()
+                await asyncio.sleep(1)
+
+    def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+class CircuitBreaker:
+    """Closed while calls succeed; open for `reset_seconds` after `failures`
+    consecutive failures; then half-open while one probe decides whether it
+    closes or reopens. `on_change(old, new)` is called on every transition."""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, *, failures: int, reset_seconds: float, on_change: Callable[[str, str], None]):
+        self.failures = failures
+        self.reset_seconds = reset_seconds
+        self.on_change = on_change
+        self.state = self.CLOSED
+        self._failed = 0
+        self._retry_at = 0.0
+
+    def allows(self) -> bool:
+        return self.state == self.CLOSED
+
+    def retry_due(self) -> bool:
+        return self.state == self.OPEN and time.monotonic() >= self._retry_at
+
+    def half_open(self) -> None:
+        self._set(self.HALF_OPEN)
+
+    def success(self) -> None:
+        self._failed = 0
+        if self.state != self.CLOSED:
+            self._set(self.CLOSED)
+
+    def failure(self) -> None:
+        self._failed += 1
+        if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self._failed >= self.failures):
+            self._retry_at = time.monotonic() + self.reset_seconds
+            self._set(self.OPEN)
+
+    def _set(self, state: str) -> None:
+        old, self.state = self.state, state
+        self.on_change(old, state)
+
+class FallbackBackend(Backend):
+    """Redis backend behind a circuit breaker, with a local LRU to use while
+    Redis is failing.
+
+    Every Redis call is bounded by `timeout` seconds. Enough consecutive
+    errors or timeouts open the breaker, and the cache is then served from
+    memory (per worker) instead of each request waiting on Redis. After
+    `reset_seconds` one probe pings Redis and runs `on_recover` (e.g. to
+    replay invalidations Redis missed) before traffic returns to it.
+    """
+
+    def __init__(
+        self,
+        primary: RedisBackend,
+        *,
+        timeout: float,
+        failures: int,
+        reset_seconds: float,
+        max_bytes: int,
+        on_recover: Optional[Callable[["FallbackBackend"], Awaitable[None]]] = None,
+    ):
+        self.primary = primary
+        self.timeout = timeout
+        self.local = LRUCache(max_bytes)
+        self.on_recover = on_recover
+        self.transitions: Dict[str, int] = {}
+        self.errors = 0
+        self.breaker = CircuitBreaker(failures=failures, reset_seconds=reset_seconds, on_change=self._on_change)
+        self._probe: Optional[asyncio.Task] = None
+
+    @property
+    def redis(self):
+        return self.primary.redis
+
+    def available(self) -> bool:
+        """Whether Redis should be used right now"""
+        if self.breaker.retry_due():
+            self.breaker.half_open()
+            self._probe = asyncio.get_running_loop().create_task(self._probe_redis())
+        return self.breaker.allows()
+
+    async def _probe_redis(self) -> None:
+        try:
+            await asyncio.wait_for(self.primary.redis.ping(), self.timeout)
+            if self.on_recover is not None:
+                await asyncio.wait_for(self.on_recover(self), self.timeout)
+        except Exception:
+            logger.warning("Cache backend still unavailable", exc_info=True)
+            self.breaker.failure()
+            return
+        # Entries stored meanwhile may miss later writes; Redis is authoritative again
+        self.local.clear()
+        self.breaker.success()
+
+    async def guard(self, awaitable: Awaitable[Any]) -> Any:
+        """Await a Redis call with the timeout, recording its outcome in the
+        breaker; errors are re-raised for the caller to handle"""
+        try:
+            result = await asyncio.wait_for(awaitable, self.timeout)
+        except (asyncio.TimeoutError, RedisError, OSError):
+            self.errors += 1
+            self.breaker.failure()
+            raise
+        self.breaker.success()
+        return result
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:
+        if self.available():
+            try:
+                return await self.guard(self.primary.get_with_ttl(key))
+            except (asyncio.TimeoutError, RedisError, OSError):
+                logger.warning("Cache read of '%s' failed, using the local fallback", key, exc_info=True)
+        entry = self.local.get(key)
+        if entry is None:
+            return 0, None
+        value, expires = entry
+        return max(int(expires - time.monotonic()), 0), value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return (await self.get_with_ttl(key))[1]
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        if self.available():
+            try:
+                return await self.guard(self.primary.set(key, value, expire))
+            except (asyncio.TimeoutError, RedisError, OSError):
+                logger.warning("Cache write of '%s' failed, using the local fallback", key, exc_info=True)
+        ttl = expire or FALLBACK_TTL
+        self.local.put(key, value, ttl, ttl)
+
+    async def clear(self, namespace: Optional[str] = None, key: Optional[str] = None) -> int:
+        if self.available():
+            try:
+                return await self.guard(self.primary.clear(namespace, key))
+            except (asyncio.TimeoutError, RedisError, OSError):
+                logger.warning("Cache clear failed, using the local fallback", exc_info=True)
+        if namespace:
+            count = len(self.local)
+            self.local.clear()
+            return count
+        if key:
+            self.local.pop(key)
+            return 1
+        return 0
+
+    def _on_change(self, old: str, new: str) -> None:
+        self.transitions[new] = self.transitions.get(new, 0) + 1
+        logger.warning("Cache circuit breaker %s -> %s", old, new)
+
+async def guarded(backend, awaitable: Awaitable[Any]) -> Any:
+    """Await a direct Redis call through `backend`'s breaker, if it has one"""
+    if isinstance(backend, FallbackBackend):
+        return await backend.guard(awaitable)
+    return await awaitable
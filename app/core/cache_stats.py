@@ -0,0 +1,160 @@
+import os
+import random
+from typing import Dict, List, Optional, Set
+
+# Outcomes of a cached request
+OUTCOMES = ("hit", "miss", "stale", "not_modified")
+
+class RouteStats:
+    """Counters for one cached route in this worker"""
+
+    def __init__(self):
+        self.requests: Dict[str, int] = dict.fromkeys(OUTCOMES, 0)
+        self.errors = 0
+        self.bytes_sent = 0
+        self.seconds = 0.0
+        self.fills = 0
+        self.fill_seconds = 0.0
+        self.stored_bytes = 0
+        self.keys: Set[str] = set()
+
+class CacheStats:
+    """Per-route request/byte/latency counters and a sampled hot-key table
+    for the response cache, per worker process.
+
+    Hot keys are counted for a `sample_rate` fraction of requests in a
+    table of `hot_keys * 10` slots; when it is full the least counted key
+    is replaced (space-saving), so heavy hitters stay in and counts are
+    upper bounds. Distinct keys are tracked up to `max_keys` per route.
+    """
+
+    def __init__(self, *, sample_rate: float, hot_keys: int, max_keys: int):
+        self.sample_rate = sample_rate
+        self.hot_keys = hot_keys
+        self.max_keys = max_keys
+        self.reset()
+
+    def reset(self) -> None:
+        self.routes: Dict[str, RouteStats] = {}
+        self._hot: Dict[str, int] = {}
+        # A URL that produced each hot key, since keys are digests
+        self._hot_urls: Dict[str, str] = {}
+
+    def _route(self, route: str) -> RouteStats:
+        stats = self.routes.get(route)
+        if stats is None:
+            stats = self.routes[route] = RouteStats()
+        return stats
+
+    def record(self, route: str, key: str, outcome: str, seconds: float, size: int, url: str = "") -> None:
+        stats = self._route(route)
+        stats.requests[outcome] += 1
+        stats.seconds += seconds
+        stats.bytes_sent += size
+        if len(stats.keys) < self.max_keys:
+            stats.keys.add(key)
+        if self.hot_keys and random.random() < self.sample_rate:
+            self._sample(key, url)
+
+    def record_fill(self, route: str, seconds: float, size: int) -> None:
+        stats = self._route(route)
+        stats.fills += 1
+        stats.fill_seconds += seconds
+        stats.stored_bytes += size
+
+    def record_error(self, route: str) -> None:
+        self._route(route).errors += 1
+
+    def _sample(self, key: str, url: str) -> None:
+        if key in self._hot:
+            self._hot[key] += 1
+            return
+        if len(self._hot) < self.hot_keys * 10:
+            self._hot[key] = 1
+        else:
+            coldest = min(self._hot, key=self._hot.get)
+            self._hot[key] = self._hot.pop(coldest) + 1
+            del self._hot_urls[coldest]
+        self._hot_urls[key] = url
+
+    def hot(self, limit: Optional[int] = None) -> List[dict]:
+        top = sorted(self._hot.items(), key=lambda item: item[1], reverse=True)[:limit or self.hot_keys]
+        return [{"key": key, "url": self._hot_urls[key], "samples": count} for key, count in top]
+
+    def snapshot(self) -> dict:
+        routes = {}
+        for route, stats in sorted(self.routes.items()):
+            served = sum(stats.requests.values())
+            hits = served - stats.requests["miss"]
+            routes[route] = {
+                **stats.requests,
+                "errors": stats.errors,
+                "hit_ratio": round(hits / served, 4) if served else None,
+                "keys": len(stats.keys),
+                "keys_capped": len(stats.keys) >= self.max_keys,
+                "bytes_sent": stats.bytes_sent,
+                "avg_ms": round(stats.seconds / served * 1000, 3) if served else 0.0,
+                "fills": stats.fills,
+                "avg_fill_ms": round(stats.fill_seconds / stats.fills * 1000, 3) if stats.fills else 0.0,
+                "avg_stored_bytes": stats.stored_bytes // stats.fills if stats.fills else 0,
+            }
+        return {"pid": os.getpid(), "routes": routes, "hot_keys": self.hot()}
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def prometheus_text(stats: CacheStats, backend: dict) -> str:
+    """Prometheus text exposition of `stats` and the backend snapshot from
+    get_cache_stats(); series carry this worker's pid so workers scraped in
+    turn stay separate"""
+    worker = f'worker="{os.getpid()}"'
+    lines = []
+
+    def metric(name: str, kind: str, help_text: str, samples: List[tuple]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            lines.append(f"{name}{{{','.join([worker, *labels])}}} {value}")
+
+    routes = stats.routes.items()
+    metric("sda_cache_requests_total", "counter", "Cached route requests by outcome", [
+        ((f'route="{_label(route)}"', f'outcome="{outcome}"'), count)
+        for route, route_stats in routes for outcome, count in route_stats.requests.items()
+    ])
+    metric("sda_cache_errors_total", "counter", "Cache backend errors seen by the cache decorator", [
+        ((f'route="{_label(route)}"',), route_stats.errors) for route, route_stats in routes
+    ])
+    metric("sda_cache_sent_bytes_total", "counter", "Response body bytes sent by cached routes", [
+        ((f'route="{_label(route)}"',), route_stats.bytes_sent) for route, route_stats in routes
+    ])
+    metric("sda_cache_request_seconds_total", "counter", "Time spent in cached routes", [
+        ((f'route="{_label(route)}"',), route_stats.seconds) for route, route_stats in routes
+    ])
+    metric("sda_cache_fills_total", "counter", "Cache entries computed", [
+        ((f'route="{_label(route)}"',), route_stats.fills) for route, route_stats in routes
+    ])
+    metric("sda_cache_fill_seconds_total", "counter", "Time spent computing cache entries", [
+        ((f'route="{_label(route)}"',), route_stats.fill_seconds) for route, route_stats in routes
+    ])
+    metric("sda_cache_stored_bytes_total", "counter", "Bytes of cache entries stored", [
+        ((f'route="{_label(route)}"',), route_stats.stored_bytes) for route, route_stats in routes
+    ])
+    metric("sda_cache_keys", "gauge", "Distinct cache keys seen (capped)", [
+        ((f'route="{_label(route)}"',), len(route_stats.keys)) for route, route_stats in routes
+    ])
+    if "breaker" in backend:
+        breaker = backend["breaker"]
+        metric("sda_cache_breaker_open", "gauge", "1 while Redis is bypassed", [((), int(breaker["state"] != "closed"))])
+        metric("sda_cache_breaker_transitions_total", "counter", "Circuit breaker state changes", [
+            ((f'state="{state}"',), count) for state, count in breaker["transitions"].items()
+        ])
+        metric("sda_cache_backend_errors_total", "counter", "Failed or timed out Redis calls", [((), breaker["errors"])])
+    for name, help_text in (("l1", "per-worker in-memory tier"), ("fallback", "fallback used while Redis is down")):
+        if name in backend:
+            metric(f"sda_cache_{name}_bytes", "gauge", f"Bytes held by the {help_text}", [((), backend[name]["bytes"])])
+            metric(f"sda_cache_{name}_entries", "gauge", f"Entries held by the {help_text}", [((), backend[name]["entries"])])
+    if "key_filters" in backend:
+        metric("sda_key_filter_rejected_total", "counter", "Lookups of unknown ids/slugs answered 404 by the key filters", [
+            ((), backend["key_filters"]["rejected"])
+        ])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+from fastapi_cache import FastAPICache
+from sqlalchemy import select
+from ..core.cache import REFRESH_SCOPE_KEY
+from ..core.config import settings
+from ..core.db import read_session
+from ..crud.about import about
+from ..crud.news import news
+from ..crud.partners import partner
+from ..crud.projects import project
+from ..crud.property_sectors import property_sector
+from ..crud.services import service
+from ..crud.team import team_member, team_section
+from ..crud.work_process import work_process
+from ..utils.multilingual import SUPPORTED_LANGUAGES
+
+logger = logging.getLogger(__name__)
+
+# List routes, warmed with their default parameters
+LIST_ROUTES = [
+    "/services",
+    "/projects",
+    "/news",
+    "/partners",
+    "/team-members",
+    "/team-sections",
+    "/about",
+    "/work-processes",
+    "/property-sectors",
+]
+
+# Detail routes and the column whose values fill their path parameter
+DETAIL_ROUTES = [
+    ("/services/slug/{service_slug}", service, "slug"),
+    ("/projects/{project_id}", project, "id"),
+    ("/news/slug/{news_slug}", news, "slug"),
+    ("/partners/{partner_id}", partner, "id"),
+    ("/team-members/{member_id}", team_member, "id"),
+    ("/team-sections/{section_id}", team_section, "id"),
+    ("/about/{about_id}", about, "id"),
+    ("/work-processes/{process_id}", work_process, "id"),
+    ("/property-sectors/{property_sector_id}", property_sector, "id"),
+]
+
+def _takes_language(app, path: str) -> bool:
+    """Whether the GET route at `path` has a `language` query parameter,
+    going by the app's OpenAPI schema"""
+    operation = app.openapi()["paths"].get(settings.API_V1_STR + path, {}).get("get", {})
+    return any(param["name"] == "language" and param["in"] == "query" for param in operation.get("parameters", []))
+
+async def _detail_values(crud, column: str) -> List[str]:
+    """Path parameter values of the most recent CACHE_WARM_DETAIL_LIMIT rows"""
+    model = crud.model
+    query = (
+        select(getattr(model, column))
+        .filter(getattr(model, column).isnot(None))
+        .order_by(model.id.desc())
+        .limit(settings.CACHE_WARM_DETAIL_LIMIT)
+    )
+    async with read_session() as db:
+        return [str(value) for value in (await db.execute(query)).scalars()]
+
+async def _get(app, path: str, params: Dict[str, str], refresh: bool) -> Tuple[int, Optional[str]]:
+    """GET `path` through the ASGI app in-process (middleware, dependencies
+    and @cache included) and return the status and X-FastAPI-Cache header"""
+    status, cache_status = 0, None
+    done = asyncio.Event()
+    requested = False
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": quote(path).encode(),
+        "root_path": "",
+        "query_string": urlencode(params).encode(),
+        "headers": [(b"host", b"cache-warmer")],
+        "client": None,
+        "server": None,
+        REFRESH_SCOPE_KEY: refresh,
+    }
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status, cache_status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            cache_header = FastAPICache.get_cache_status_header().lower().encode()
+            for name, value in message.get("headers", []):
+                if name.lower() == cache_header:
+                    cache_status = value.decode()
+        elif message["type"] == "http.response.body" and not message.get("more_body"):
+            done.set()
+
+    try:
+        await app(scope, receive, send)
+    finally:
+        done.set()
+    return status, cache_status
+
+async def warm_cache(app, refresh: bool = False) -> dict:
+    """Request every LIST_ROUTES and DETAIL_ROUTES URL in each supported
+    language, CACHE_WARM_CONCURRENCY at a time, so the response cache (and
+    this worker's in-memory tier) is filled before visitors arrive.
+
+    With `refresh` the requests are marked (REFRESH_SCOPE_KEY) to recompute
+    entries that are already cached. Returns counts and the time taken.
+    """
+    started = time.perf_counter()
+    # (route path template, URL path)
+    paths = [(path, path) for path in LIST_ROUTES]
+    for template, crud, column in DETAIL_ROUTES:
+        try:
+            values = await _detail_values(crud, column)
+        except Exception:
+            logger.warning("Cache warmer could not list %s", template, exc_info=True)
+            continue
+        prefix = template[:template.index("{")]
+        paths.extend((template, prefix + value) for value in values)
+
+    requests = []
+    for template, path in paths:
+        languages = SUPPORTED_LANGUAGES if _takes_language(app, template) else [None]
+        requests.extend((settings.API_V1_STR + path, {"language": language} if language else {}) for language in languages)
+
+    semaphore = asyncio.Semaphore(max(settings.CACHE_WARM_CONCURRENCY, 1))
+    counts = {"filled": 0, "cached": 0, "failed": 0}
+
+    async def warm(path: str, params: Dict[str, str]) -> None:
+        async with semaphore:
+            try:
+                status, cache_status = await _get(app, path, params, refresh)
+            except Exception:
+                logger.warning("Cache warmer request %s failed", path, exc_info=True)
+                status, cache_status = 0, None
+        if status != 200:
+            counts["failed"] += 1
+        elif cache_status == "MISS":
+            counts["filled"] += 1
+        else:
+            counts["cached"] += 1
+
+    await asyncio.gather(*(warm(path, params) for path, params in requests))
+    report = {"requests": len(requests), **counts, "seconds": round(time.perf_counter() - started, 3)}
+    logger.info("Cache warmed: %s", report)
+    return report
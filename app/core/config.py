@@ -1,5 +1,16 @@
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
+
+class CachePolicy(BaseModel):
+    """How responses of one route are cached, server-side and downstream"""
+    ttl: int = 300  # seconds a response is served fresh from Redis, 0 = not cached
+    stale: int = 0  # further seconds it is served while one request refreshes it
+    early_refresh: float = 0  # XFetch beta, 1.0 recomputes hot entries shortly before expiry
+    max_age: int = 0  # browser max-age; 0 revalidates each time (ETag/304)
+    s_maxage: int = 60  # nginx/CDN max-age, sent as Surrogate-Control
+    private: bool = False  # Cache-Control: private, no-store (admin data)
+    not_found_ttl: int = 30  # seconds a 404 is cached, 0 = not cached
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "SDA API"
@@ -14,6 +25,24 @@ class Settings(BaseSettings):
     
     DATABASE_URL: str | None = None
     
+    # Connection pool (per uvicorn worker, per engine)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # seconds, -1 disables recycling
+    DB_POOL_PRE_PING: bool = True  # ping on every checkout; rely on DB_POOL_RECYCLE when off
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 leaves the server default
+    DB_CONNECT_TIMEOUT: int = 10  # seconds to establish a new connection
+    
+    # Read replicas for GET endpoints (comma-separated URLs, empty = primary only)
+    DATABASE_REPLICA_URLS: str = ""
+    DB_REPLICA_EJECT_SECONDS: int = 30  # how long a failing replica is skipped
+    READ_YOUR_WRITES_SECONDS: int = 5  # a client's reads stay on the primary this long after it writes
+    
+    # Page totals for list endpoints called with ?count=exact|window|estimate
+    COUNT_CACHE_TTL: int = 60  # seconds a total is reused per filter combination, 0 disables
+    COUNT_ESTIMATE_MIN_ROWS: int = 10000  # smaller tables are counted exactly
+    
     # Server configuration
     SERVER_HOST: str = "153.92.223.91"
     SERVER_PORT: str = "8000"
@@ -26,6 +55,62 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_URL: str | None = None
     
+    # Per-worker in-memory tier in front of Redis, kept coherent via pub/sub
+    CACHE_L1_MAX_BYTES: int = 32 * 1024 * 1024  # 0 disables the tier
+    CACHE_L1_MAX_TTL: int = 60  # upper bound on how long a worker keeps an entry
+    CACHE_LOCK_SECONDS: int = 10  # how long one worker may hold a key's recompute lock
+    CACHE_REDIS_TIMEOUT: float = 0.25  # seconds any one Redis call may take before it counts as failed
+    CACHE_BREAKER_FAILURES: int = 3  # consecutive Redis failures that open the circuit breaker
+    CACHE_BREAKER_RESET_SECONDS: int = 15  # how long the breaker stays open before Redis is retried
+    CACHE_FALLBACK_MAX_BYTES: int = 32 * 1024 * 1024  # per-worker cache used while the breaker is open
+    CACHE_COMPRESS_MIN_BYTES: int = 1024  # cached bodies this large are stored gzipped, 0 disables
+    CACHE_COMPRESS_LEVEL: int = 6
+    CACHE_NAMESPACE: str = ""  # cache key namespace; empty derives it from VERSION and the response shapes
+    CACHE_ADMIN_SCAN_COUNT: int = 500  # keys per SCAN call and per UNLINK batch in the cache admin API
+    CACHE_WARM_ON_STARTUP: bool = True  # warm list/detail routes in the background at startup
+    CACHE_WARM_CONCURRENCY: int = 4  # warm requests in flight at once, keep below DB_POOL_SIZE
+    CACHE_WARM_DETAIL_LIMIT: int = 50  # most recent rows warmed per detail route
+    INTERNAL_API_TOKEN: str = ""  # X-Internal-Token value required by every /internal endpoint; empty disables them
+    CACHE_STATS_SAMPLE_RATE: float = 0.1  # fraction of cached requests counted for the hot-key report
+    CACHE_STATS_HOT_KEYS: int = 20  # keys in the hot-key report, 0 disables sampling
+    CACHE_STATS_MAX_KEYS: int = 10000  # distinct keys counted per route before the count is capped
+    BLOOM_FILTER_ENABLED: bool = False  # answer unknown ids/slugs 404 from per-worker filters (see app.core.bloom); needs Redis
+    BLOOM_FILTER_ERROR_RATE: float = 0.01  # share of unknown ids/slugs that still reach the cache/database
+    BLOOM_FILTER_REBUILD_SECONDS: int = 600  # filters are rebuilt from the database this often
+    
+    # Cache policy per route path (without API_V1_STR); unlisted routes use "default"
+    CACHE_POLICIES: Dict[str, CachePolicy] = {
+        "default": CachePolicy(),
+        "/news": CachePolicy(early_refresh=1.0),
+        "/projects": CachePolicy(early_refresh=1.0),
+        # Rarely edited, so served stale for a day while refreshing
+        "/about": CachePolicy(ttl=3600, stale=86400, s_maxage=300),
+        "/about/{about_id}": CachePolicy(ttl=3600, stale=86400, s_maxage=300),
+        "/work-processes": CachePolicy(ttl=3600, stale=86400, s_maxage=300),
+        "/work-processes/{process_id}": CachePolicy(ttl=3600, stale=86400, s_maxage=300),
+        "/property-sectors": CachePolicy(ttl=3600, stale=86400, s_maxage=300),
+        "/property-sectors/{property_sector_id}": CachePolicy(ttl=3600, stale=86400, s_maxage=300),
+        # Admin only
+        "/contact-messages": CachePolicy(private=True),
+        "/contact-messages/unread": CachePolicy(ttl=60, private=True),
+        "/contact-messages/{message_id}": CachePolicy(private=True),
+        "/internal/db-pool": CachePolicy(ttl=0, private=True),
+        "/internal/cache/stats": CachePolicy(ttl=0, private=True),
+        "/internal/metrics": CachePolicy(ttl=0, private=True),
+        "/internal/cache/keys": CachePolicy(ttl=0, private=True),
+        "/internal/cache/namespaces": CachePolicy(ttl=0, private=True),
+        # Uploaded files
+        "/uploads": CachePolicy(ttl=0, max_age=3600, s_maxage=86400),
+        "/resources": CachePolicy(ttl=0, max_age=3600, s_maxage=86400),
+        "/resources/{filename}": CachePolicy(ttl=0, max_age=3600, s_maxage=86400),
+    }
+    
+    def cache_policy(self, route_path: str) -> CachePolicy:
+        """Policy for a route, given its path template with or without API_V1_STR"""
+        if route_path.startswith(self.API_V1_STR):
+            route_path = route_path[len(self.API_V1_STR):]
+        return self.CACHE_POLICIES.get(route_path) or self.CACHE_POLICIES.get("default") or CachePolicy()
+    
     @property
     def get_redis_url(self) -> str:
         if self.REDIS_URL:
@@ -38,6 +123,22 @@ class Settings(BaseSettings):
             return self.DATABASE_URL
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
     
+    @staticmethod
+    def _asyncpg_url(url: str) -> str:
+        for scheme in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+            if url.startswith(scheme):
+                return "postgresql+asyncpg://" + url[len(scheme):]
+        return url
+    
+    @property
+    def async_database_url(self) -> str:
+        # Same database as sync_database_url, driven through asyncpg
+        return self._asyncpg_url(self.sync_database_url)
+    
+    @property
+    def replica_database_urls(self) -> List[str]:
+        return [self._asyncpg_url(url.strip()) for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    
     BACKEND_CORS_ORIGINS: List[str] = [
         "http://localhost:3000", 
         "http://localhost:3001",
@@ -1,19 +1,185 @@
-from sqlalchemy import create_engine
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import List
+from fastapi import Request
+from sqlalchemy import create_engine, exc
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from ..core.config import settings
 from ..models import Base
 from .. import models  # This imports all models to register them with Base.metadata
 
+# Sync engine, kept for alembic and the populate_* scripts
 engine = create_engine(
     settings.sync_database_url,
     pool_pre_ping=True,
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a free connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+def _async_connect_args() -> dict:
+    args = {"timeout": settings.DB_CONNECT_TIMEOUT}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    return args
+
+def _create_async_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        poolclass=TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        connect_args=_async_connect_args(),
+    )
+
+# Async engine used by the API routers so queries don't block the event loop
+async_engine = _create_async_engine(settings.async_database_url)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+class ReplicaSet:
+    """Read replicas handed out round robin, skipping any that failed recently"""
+
+    def __init__(self, urls: List[str], eject_seconds: int):
+        self.engines = [_create_async_engine(url) for url in urls]
+        self.eject_seconds = eject_seconds
+        self._ejected_until = [0.0] * len(self.engines)
+        self._next = 0
+
+    def healthy(self, index: int) -> bool:
+        return self._ejected_until[index] <= time.monotonic()
+
+    def candidates(self) -> List[AsyncEngine]:
+        """Healthy replicas, starting at the next round-robin position"""
+        count = len(self.engines)
+        if not count:
+            return []
+        start = self._next
+        self._next = (start + 1) % count
+        order = [(start + i) % count for i in range(count)]
+        return [self.engines[i] for i in order if self.healthy(i)]
+
+    def eject(self, engine: AsyncEngine) -> None:
+        self._ejected_until[self.engines.index(engine)] = time.monotonic() + self.eject_seconds
+
+replicas = ReplicaSet(settings.replica_database_urls, settings.DB_REPLICA_EJECT_SECONDS)
+
+# Set by the read-your-writes middleware; holds the time until which the
+# client's reads go to the primary
+PRIMARY_READS_COOKIE = "sda_primary_reads"
+
+def _reads_pinned_to_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(PRIMARY_READS_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+@asynccontextmanager
+async def _read_session(pinned: bool):
+    engines = [] if pinned else replicas.candidates()
+    for engine in engines:
+        db = AsyncSessionLocal(bind=engine)
+        try:
+            await db.connection()
+        except (OSError, asyncio.TimeoutError, exc.DBAPIError, exc.TimeoutError):
+            await db.close()
+            replicas.eject(engine)
+            continue
+        try:
+            yield db
+        except exc.DBAPIError as e:
+            if e.connection_invalidated:
+                replicas.eject(engine)
+            raise
+        finally:
+            await db.close()
+        return
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_read_db(request: Request):
+    """Session for read-only endpoints.
+
+    Uses a healthy replica (round robin) and ejects one that fails to
+    connect or drops its connection, falling back to the primary when no
+    replica is configured or reachable, or the client wrote recently.
+    """
+    async with _read_session(_reads_pinned_to_primary(request)) as db:
+        yield db
+
+def read_session():
+    """Replica-routed session for reads outside a request, e.g. background
+    cache refreshes"""
+    return _read_session(pinned=False)
+
+def _engine_pool_stats(engine: AsyncEngine) -> dict:
+    pool = engine.sync_engine.pool
+    stats = {
+        "pool_size": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    if isinstance(pool, TimedQueuePool):
+        stats.update({
+            "checkouts": pool.checkouts,
+            "timeouts": pool.timeouts,
+            "avg_wait_ms": round(pool.total_wait / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+            "max_wait_ms": round(pool.max_wait * 1000, 3),
+        })
+    return stats
+
+def get_pool_stats() -> dict:
+    """Snapshot of the async engines' pools for the current worker process"""
+    stats = {"pid": os.getpid(), **_engine_pool_stats(async_engine)}
+    if replicas.engines:
+        stats["replicas"] = [
+            {"replica": i, "healthy": replicas.healthy(i), **_engine_pool_stats(engine)}
+            for i, engine in enumerate(replicas.engines)
+        ]
+    return stats
@@ -1,22 +1,92 @@
-from typing import TypeVar, Generic, Sequence
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, TypeVar, Generic, Sequence, Tuple, Union
+from fastapi import Query
 from pydantic import BaseModel
 
 T = TypeVar("T")
 
+# Query parameters shared by the list endpoints
+CURSOR_QUERY = Query(None, description="Keyset cursor (next_cursor of the previous page); send it empty to start")
+COUNT_QUERY = Query(
+    None,
+    pattern="^(exact|window|estimate)$",
+    description="Return a Page envelope with a total counted exactly, via count(*) OVER (), or from planner statistics",
+)
+
 class Page(BaseModel, Generic[T]):
     items: Sequence[T]
     total: int
     page: int
     size: int
     pages: int
-    
+    next_cursor: Optional[str] = None
+
     @classmethod
-    def create(cls, items: Sequence[T], total: int, page: int, size: int):
+    def create(cls, items: Sequence[T], total: int, page: int, size: int, next_cursor: Optional[str] = None):
         pages = (total + size - 1) // size if size > 0 else 0
         return cls(
             items=items,
             total=total,
             page=page,
             size=size,
-            pages=pages
+            pages=pages,
+            next_cursor=next_cursor
         )
+
+class CursorPage(BaseModel, Generic[T]):
+    items: Sequence[T]
+    next_cursor: Optional[str] = None
+
+class CursorList(list):
+    """Rows of one page plus the cursor of the page after it (None on the last
+    page) and, when a count strategy was requested, the total row count"""
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    skip: int = 0
+    limit: int = 100
+
+def encode_cursor(order: str, values: Sequence[Any]) -> str:
+    """Encode the sort-key values of the last row of a page, and the
+    ordering (see CRUDBase._fetch) they belong to, as an opaque token"""
+    payload = {
+        "o": order,
+        "v": [{"dt": value.isoformat()} if isinstance(value, datetime) else value for value in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, List[Any]]:
+    """Inverse of encode_cursor, returning the ordering and the values;
+    raises ValueError on anything malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if not isinstance(payload, dict) or not isinstance(payload.get("o"), str) or not isinstance(payload.get("v"), list):
+        raise ValueError("Malformed cursor")
+    try:
+        return payload["o"], [
+            datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+            for value in payload["v"]
+        ]
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError("Malformed cursor") from e
+
+def list_response(schema):
+    """response_model for list endpoints answered through paginate()"""
+    return Union[List[schema], CursorPage[schema], Page[schema]]
+
+def paginate(rows: CursorList, cursor: Optional[str], items: Optional[Sequence[Any]] = None):
+    """Shape `items` (default: the rows) for the response: a Page when a total
+    was counted, a CursorPage when the caller sent a cursor, else a plain list"""
+    if items is None:
+        items = rows
+    if rows.total is not None:
+        page = rows.skip // rows.limit + 1 if rows.limit else 1
+        return Page.create(items, rows.total, page, rows.limit, next_cursor=rows.next_cursor)
+    if cursor is None:
+        return items
+    return CursorPage(items=items, next_cursor=rows.next_cursor)
@@ -1,5 +1,7 @@
-from typing import List
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 from ..crud.base import CRUDBase
 from ..models.about import About, AboutLogo
 from ..schemas.about import (
@@ -10,61 +12,44 @@ from ..schemas.about import (
 )
 
 class CRUDAbout(CRUDBase[About, AboutCreate, AboutUpdate]):
-    def create(self, db: Session, *, obj_in: AboutCreate) -> About:
-        # Extract logos data before creating the about
-        obj_in_data = obj_in.model_dump()
-        logos_data = obj_in_data.pop('logos', [])
-        
-        # Create the about without logos
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        
-        # Add logos if any
-        if logos_data:
-            for logo_data in logos_data:
-                logo_obj = AboutLogo(about_id=db_obj.id, **logo_data)
-                db.add(logo_obj)
-            db.commit()
-            db.refresh(db_obj)
-        
-        return db_obj
+    load_profiles = {
+        "list": (selectinload(About.logos),),
+        "detail": (joinedload(About.logos),),
+    }
 
-    def get_multi_ordered(
+    async def get_multi_ordered(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None,
+        profile: str = "list",
+        language: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> List[About]:
         """Get about sections ordered by id"""
-        return (
-            db.query(self.model)
-            .order_by(self.model.id.asc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        query = self._load(select(self.model), profile)
+        return await self._fetch(db, query, [], skip=skip, limit=limit, cursor=cursor, count=count, language=language, fields=fields)
 
 class CRUDAboutLogo(CRUDBase[AboutLogo, AboutLogoCreate, AboutLogoUpdate]):
-    def get_by_about(
+    async def get_by_about(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         about_id: int,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None
     ) -> List[AboutLogo]:
         """Get logos by about section ID"""
-        return (
-            db.query(self.model)
+        query = (
+            select(self.model)
             .filter(self.model.about_id == about_id)
-            .order_by(self.model.display_order.asc())
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return await self._fetch(db, query, [(self.model.order, "asc")], skip=skip, limit=limit, cursor=cursor, count=count)
 
 about = CRUDAbout(About)
 about_logo = CRUDAboutLogo(AboutLogo)
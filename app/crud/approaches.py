@@ -1,20 +1,25 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import asc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from ..crud.base import CRUDBase
 from ..models.approaches import Approach
 from ..schemas.approaches import ApproachCreate, ApproachUpdate
 
 class CRUDApproach(CRUDBase[Approach, ApproachCreate, ApproachUpdate]):
-    def get_multi_ordered(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+    async def get_multi_ordered(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None,
+        language: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> List[Approach]:
-        return (
-            db.query(self.model)
-            .order_by(asc(self.model.order), asc(self.model.id))
-            .offset(skip)
-            .limit(limit)
-            .all()
+        query = select(self.model)
+        return await self._fetch(
+            db, query, [(self.model.order, "asc")], skip=skip, limit=limit, cursor=cursor, count=count, language=language, fields=fields
         )
 
 approach = CRUDApproach(Approach)
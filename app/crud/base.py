@@ -1,68 +1,459 @@
-from typing import Generic, TypeVar, Type, Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc
+import hashlib
+from datetime import date, datetime
+from typing import Any, Dict, Generic, TypeVar, Type, Optional, List, Sequence, Tuple, Union
+from sqlalchemy import (
+    and_, asc, column, delete, desc, false, func, insert, inspect, or_, select, text, tuple_, update, values
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import MANYTOONE
+from sqlalchemy.orm.attributes import set_committed_value
 from fastapi import HTTPException
+from ..core.bloom import key_filters
+from ..core.cache import get_cached_count, invalidate, set_cached_count
+from ..core.config import settings
+from ..core.pagination import CursorList, decode_cursor, encode_cursor
+from ..utils.multilingual import DEFAULT_LANGUAGE, localized_columns, localized_row
 
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType")
 UpdateSchemaType = TypeVar("UpdateSchemaType")
 
+# (column, "asc" | "desc") pairs describing a list ordering
+OrderSpec = Sequence[Tuple[Any, str]]
+
+# asyncpg caps a statement at 32767 bind parameters
+_MAX_BIND_PARAMS = 30000
+
+def _chunks(items: Sequence[Any], size: int):
+    for start in range(0, len(items), max(size, 1)):
+        yield items[start:start + size]
+
+def _after(key, direction: str, value):
+    # Rows strictly after `value` in Postgres' default NULL placement
+    # (NULLS LAST for ascending, NULLS FIRST for descending)
+    if direction == "asc":
+        return false() if value is None else or_(key > value, key.is_(None))
+    return key.is_not(None) if value is None else key < value
+
+def _keyset_filter(order: OrderSpec, values: Sequence[Any]):
+    keys = [key for key, _ in order]
+    directions = {direction for _, direction in order}
+    nullable = any(getattr(key.expression, "nullable", True) for key in keys)
+    if len(directions) == 1 and not nullable and None not in values:
+        # Row-value comparison lets Postgres walk a matching index directly
+        row, cursor = tuple_(*keys), tuple_(*values)
+        return row > cursor if directions == {"asc"} else row < cursor
+    clauses = []
+    for i, (key, direction) in enumerate(order):
+        ties = [k.is_not_distinct_from(v) for k, v in zip(keys[:i], values[:i])]
+        clauses.append(and_(*ties, _after(key, direction, values[i])))
+    return or_(*clauses)
+
+def _order_key(order: OrderSpec) -> str:
+    # Identifies an ordering in its cursors, so one cannot be resumed under another
+    spec = ",".join(f"{key} {direction}" for key, direction in order)
+    return hashlib.sha1(spec.encode()).hexdigest()[:12]
+
+def _cursor_value(key, value):
+    """`value` as the Python type of sort key `key`; raises ValueError when
+    it cannot be one"""
+    if value is None:
+        return None
+    try:
+        python_type = key.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        # decode_cursor() has turned datetimes back into datetime objects
+        if not isinstance(value, datetime) or (getattr(key.type, "timezone", False) and value.tzinfo is None):
+            raise ValueError(f"{key} needs an aware datetime")
+        return value
+    if python_type is date and isinstance(value, str):
+        return date.fromisoformat(value)
+    # JSON booleans are ints to isinstance(), datetimes are dates
+    if isinstance(value, bool) == (python_type is bool) and not isinstance(value, datetime):
+        if python_type is float and isinstance(value, int):
+            return float(value)
+        if isinstance(value, python_type):
+            return value
+    raise ValueError(f"{key} needs {python_type.__name__} values")
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Loader options per profile. Lazy loading is not available on an
+    # AsyncSession, so any relationship a response serializes must be
+    # loaded by the profile the endpoint picks. get() defaults to "detail",
+    # list methods to "list"; an unknown profile (e.g. "summary") loads no
+    # relationships at all.
+    load_profiles: Dict[str, Sequence[Any]] = {}
+
     def __init__(self, model: Type[ModelType]):
         self.model = model
-    
-    def get(self, db: Session, id: int) -> Optional[ModelType]:
-        return db.query(self.model).filter(self.model.id == id).first()
-    
-    def get_multi(
+
+    def _load(self, query, profile: Optional[str]):
+        return query.options(*self.load_profiles.get(profile, ()))
+
+    def _parent_keys(self) -> List[Tuple[str, str]]:
+        """(parent table, foreign key attribute) for each parent whose
+        responses embed this model as a collection"""
+        return [
+            (rel.mapper.local_table.name, next(iter(rel.local_columns)).key)
+            for rel in inspect(self.model).relationships
+            if rel.direction is MANYTOONE and rel.back_populates
+        ]
+
+    async def _invalidate(self, rows: Sequence[Any]) -> None:
+        """Drop cached responses a write to `rows` made stale: this table's
+        lists and the rows themselves, plus the lists and rows of parents
+        that embed them (see cache tags in app.core.cache)"""
+        table = self.model.__tablename__
+        tags = {f"{table}:list", *(f"{table}:{row.id}" for row in rows)}
+        for parent, fk in self._parent_keys():
+            tags.add(f"{parent}:list")
+            tags.update(f"{parent}:{getattr(row, fk)}" for row in rows if getattr(row, fk) is not None)
+        await invalidate(*sorted(tags))
+
+    async def get(self, db: AsyncSession, id: int, profile: str = "detail") -> Optional[ModelType]:
+        query = self._load(select(self.model).filter(self.model.id == id), profile)
+        result = await db.execute(query)
+        return result.unique().scalars().first()
+
+    async def get_localized(
+        self, db: AsyncSession, *, language: str, fields: Sequence[str], **filters
+    ) -> Optional[Dict[str, Any]]:
+        """First row matching `filters` (column=value), localized in SQL into
+        the dict prepare_multilingual_response() would build"""
+        columns = localized_columns(self.model, fields, language)
+        query = select(*columns).filter(*[getattr(self.model, k) == v for k, v in filters.items()])
+        row = (await db.execute(query.limit(1))).mappings().first()
+        return localized_row(row, columns, fields) if row is not None else None
+
+    async def _count(self, db: AsyncSession, query, strategy: str) -> int:
+        """Total rows matching the filters of `query` (before ordering and paging).
+
+        "estimate" reads the planner's pg_class.reltuples, which is only
+        meaningful for an unfiltered query on a large table; anything else is
+        counted exactly. Exact totals are cached per filter combination for
+        COUNT_CACHE_TTL seconds.
+        """
+        table = self.model.__tablename__
+        if strategy == "estimate" and query.whereclause is None:
+            result = await db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": table}
+            )
+            estimate = result.scalar()
+            if estimate is not None and estimate >= settings.COUNT_ESTIMATE_MIN_ROWS:
+                return estimate
+
+        count_query = query.with_only_columns(func.count(), maintain_column_froms=True)
+        count_query = count_query.order_by(None).limit(None).offset(None)
+        compiled = count_query.compile(dialect=db.get_bind().dialect)
+        digest = hashlib.sha1(f"{compiled}|{sorted(compiled.params.items())!r}".encode()).hexdigest()
+        key = f"count:{table}:{digest}"
+
+        total = await get_cached_count(key)
+        if total is None:
+            total = (await db.execute(count_query)).scalar_one()
+            await set_cached_count(key, total, tags=[f"{table}:list"])
+        return total
+
+    async def _get_many(self, db: AsyncSession, ids: Sequence[int], profile: str = "list") -> List[ModelType]:
+        # Rows for `ids` in the given order; unknown ids are skipped
+        by_id = {}
+        for chunk in _chunks(list(ids), _MAX_BIND_PARAMS):
+            query = self._load(select(self.model).filter(self.model.id.in_(chunk)), profile)
+            result = await db.execute(query.execution_options(populate_existing=True))
+            by_id.update({db_obj.id: db_obj for db_obj in result.unique().scalars()})
+        return [by_id[i] for i in ids if i in by_id]
+
+    async def _fetch(
         self,
-        db: Session,
+        db: AsyncSession,
+        query,
+        order: OrderSpec,
         *,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None,
+        language: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> CursorList:
+        """Run a list query with a stable ordering and either offset or keyset paging.
+
+        The ordering is tie-broken on id. A non-empty cursor (the next_cursor
+        of a previous page) replaces the offset, so every page costs the same
+        index range scan instead of discarding `skip` rows.
+
+        `count` ("exact", "window" or "estimate") also sets the total on the
+        returned list. "window" piggybacks count(*) OVER () on the page query
+        itself; with a cursor the window would only see the rows after it, so
+        that case (and an empty page) falls back to an exact count.
+
+        With `fields` (localized field bases, as passed to
+        prepare_multilingual_response) the query selects localized_columns()
+        instead of the entity, so the rows come back from Postgres already
+        localized to `language` and the list holds response dicts.
+        """
+        filtered = query
+        window = count == "window" and not cursor
+        order = list(order) + [(self.model.id, order[-1][1] if order else "asc")]
+        query = query.order_by(*[asc(c) if d == "asc" else desc(c) for c, d in order])
+        order_key = _order_key(order)
+        if cursor:
+            # A forged or stale cursor must not reach Postgres as a bad parameter
+            try:
+                cursor_order, values = decode_cursor(cursor)
+                if cursor_order != order_key or len(values) != len(order):
+                    raise ValueError("Cursor of another ordering")
+                values = [_cursor_value(key, value) for (key, _), value in zip(order, values)]
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            query = query.filter(_keyset_filter(order, values))
+        else:
+            query = query.offset(skip)
+
+        columns = None
+        if fields is not None:
+            columns = localized_columns(self.model, fields, language or DEFAULT_LANGUAGE)
+            query = query.with_only_columns(*columns, maintain_column_froms=True)
+        # Raw sort keys ride along for the cursor; a localized column of the
+        # same name would not do
+        keys = [key.label(f"_key{i}") for i, (key, _) in enumerate(order)]
+        query = query.add_columns(*keys)
+        if window:
+            query = query.add_columns(func.count().over().label("_total"))
+
+        # One extra row tells us whether there is a next page
+        result = await db.execute(query.limit(limit + 1))
+        rows = result.all()
+        items = CursorList(
+            row[0] if columns is None else localized_row(row._mapping, columns, fields)
+            for row in rows[:limit]
+        )
+        items.skip, items.limit = skip, limit
+        if len(rows) > limit:
+            last = rows[limit - 1]._mapping
+            items.next_cursor = encode_cursor(order_key, [last[key.name] for key in keys])
+        if window and rows:
+            items.total = rows[0]._mapping["_total"]
+        elif count:
+            items.total = await self._count(db, filtered, count)
+        return items
+
+    async def get_multi(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None,
         order_by: Optional[str] = None,
         direction: str = "asc",
+        profile: str = "list",
+        language: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
         **filters
     ) -> List[ModelType]:
-        query = db.query(self.model)
-        
+        query = self._load(select(self.model), profile)
+
         # Apply filters
         for field, value in filters.items():
             if hasattr(self.model, field) and value is not None:
                 query = query.filter(getattr(self.model, field) == value)
-        
+
         # Apply ordering
+        order = []
         if order_by and hasattr(self.model, order_by):
-            order_func = asc if direction.lower() == "asc" else desc
-            query = query.order_by(order_func(getattr(self.model, order_by)))
-        
+            order.append((getattr(self.model, order_by), "asc" if direction.lower() == "asc" else "desc"))
+
         if hasattr(self.model, "order"):
-            query = query.order_by(self.model.order)
-        
-        return query.offset(skip).limit(limit).all()
-    
-    def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
-        obj_in_data = obj_in.model_dump()
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+            order.append((self.model.order, "asc"))
+
+        return await self._fetch(
+            db, query, order, skip=skip, limit=limit, cursor=cursor, count=count, language=language, fields=fields
+        )
+
+    async def _insert(self, db: AsyncSession, objs_in: Sequence[CreateSchemaType]) -> List[ModelType]:
+        # One multi-row INSERT ... RETURNING for the parents and one per child
+        # collection given inline (e.g. ProjectCreate.photos), covering every
+        # parent; the returned objects come back with their collections set
+        collections = [rel for rel in inspect(self.model).relationships if rel.uselist]
+        rows = [obj_in.model_dump() for obj_in in objs_in]
+        children_data = [{rel.key: row.pop(rel.key, None) or [] for rel in collections} for row in rows]
+        if not rows:
+            return []
+
+        result = await db.execute(insert(self.model).returning(self.model, sort_by_parameter_order=True), rows)
+        db_objs = result.scalars().all()
+        for rel in collections:
+            child_rows, owners = [], []
+            for db_obj, children in zip(db_objs, children_data):
+                fk = {remote.key: getattr(db_obj, local.key) for local, remote in rel.local_remote_pairs}
+                for child in children[rel.key]:
+                    child_rows.append({**child, **fk})
+                    owners.append(db_obj)
+            inserted = []
+            if child_rows:
+                child_model = rel.mapper.class_
+                result = await db.execute(
+                    insert(child_model).returning(child_model, sort_by_parameter_order=True), child_rows
+                )
+                inserted = result.scalars().all()
+            # A new row can only have the children inserted here
+            for db_obj in db_objs:
+                set_committed_value(db_obj, rel.key, [c for c, owner in zip(inserted, owners) if owner is db_obj])
+        return db_objs
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        """Insert the row and any child collections given inline in one
+        transaction, with no follow-up SELECT (see _insert)"""
+        (db_obj,) = await self._insert(db, [obj_in])
+        await db.commit()
+        await self._invalidate([db_obj])
+        await key_filters.added(self.model.__tablename__, [db_obj])
         return db_obj
-    
-    def update(self, db: Session, *, db_obj: ModelType, obj_in: UpdateSchemaType) -> ModelType:
-        update_data = obj_in.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            if hasattr(db_obj, field):
-                setattr(db_obj, field, value)
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+
+    async def bulk_create(self, db: AsyncSession, *, objs_in: Sequence[CreateSchemaType]) -> List[ModelType]:
+        """Insert many rows (and their inline children) in one transaction"""
+        db_objs = await self._insert(db, objs_in)
+        await db.commit()
+        await self._invalidate(db_objs)
+        await key_filters.added(self.model.__tablename__, db_objs)
+        return db_objs
+
+    async def bulk_update(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Union[UpdateSchemaType, Dict[str, Any]]]
+    ) -> List[ModelType]:
+        """Apply many partial updates, each carrying its row's `id`, in one transaction.
+
+        Rows setting the same columns share an UPDATE ... FROM (VALUES ...)
+        statement. Only column fields are written; nested collections are
+        ignored. A missing or duplicated id rolls the whole batch back.
+        """
+        columns = inspect(self.model).columns
+        rows = [obj if isinstance(obj, dict) else obj.model_dump(exclude_unset=True) for obj in objs_in]
+        ids = [row.get("id") for row in rows]
+        if None in ids or len(set(ids)) != len(ids):
+            raise HTTPException(status_code=400, detail="Every item needs a distinct id")
+
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in rows:
+            keys = tuple(sorted(k for k in row if k != "id" and k in columns))
+            if keys:
+                groups.setdefault(keys, []).append(row)
+
+        for keys, group in groups.items():
+            names = ("id",) + keys
+            for chunk in _chunks(group, _MAX_BIND_PARAMS // len(names)):
+                batch = values(
+                    *[column(name, columns[name].type) for name in names], name="batch"
+                ).data([tuple(row[name] for name in names) for row in chunk])
+                stmt = (
+                    update(self.model)
+                    .where(self.model.id == batch.c.id)
+                    .values({name: batch.c[name] for name in keys})
+                    .execution_options(synchronize_session=False)
+                )
+                await db.execute(stmt)
+
+        # Reloaded inside the transaction, which also tells us about unknown ids
+        db_objs = await self._get_many(db, ids)
+        if len(db_objs) != len(ids):
+            found = {db_obj.id for db_obj in db_objs}
+            await db.rollback()
+            raise HTTPException(status_code=404, detail=f"Items not found: {[i for i in ids if i not in found]}")
+        await db.commit()
+        await self._invalidate(db_objs)
+        # Slugs may have changed
+        await key_filters.added(self.model.__tablename__, db_objs)
+        return db_objs
+
+    async def bulk_delete(self, db: AsyncSession, *, ids: Sequence[int]) -> List[int]:
+        """Delete many rows by id in one transaction and return their ids.
+
+        Runs as plain DELETEs, so child rows go through the ON DELETE CASCADE
+        of their foreign keys rather than ORM cascades. A missing id rolls the
+        whole batch back.
+        """
+        # Parent keys come back too, for cache invalidation
+        returned = [self.model.id, *(getattr(self.model, fk) for _, fk in self._parent_keys())]
+        rows = []
+        for chunk in _chunks(list(dict.fromkeys(ids)), _MAX_BIND_PARAMS):
+            stmt = (
+                delete(self.model)
+                .where(self.model.id.in_(chunk))
+                .returning(*returned)
+                .execution_options(synchronize_session=False)
+            )
+            result = await db.execute(stmt)
+            rows.extend(result.all())
+
+        deleted = [row.id for row in rows]
+        missing = [i for i in dict.fromkeys(ids) if i not in set(deleted)]
+        if missing:
+            await db.rollback()
+            raise HTTPException(status_code=404, detail=f"Items not found: {missing}")
+        await db.commit()
+        await self._invalidate(rows)
+        await key_filters.removed(self.model.__tablename__, len(rows))
+        return deleted
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        id: int,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        profile: str = "list"
+    ) -> Optional[ModelType]:
+        """Partially update one row with a single UPDATE ... RETURNING.
+
+        Only column fields are written; nested collections are ignored, as
+        in bulk_update. The returned object is loaded with the selectin
+        options of `profile` (joinedload cannot ride on RETURNING). Returns
+        None when no row has that id.
+        """
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        columns = inspect(self.model).columns
+        update_data = {k: v for k, v in update_data.items() if k != "id" and k in columns}
+        if not update_data:
+            return await self.get(db, id, profile)
+
+        stmt = self._load(
+            update(self.model)
+            .where(self.model.id == id)
+            .values(update_data)
+            .returning(self.model),
+            profile,
+        ).execution_options(synchronize_session=False, populate_existing=True)
+        db_obj = (await db.execute(stmt)).scalars().first()
+        await db.commit()
+        if db_obj is not None:
+            await self._invalidate([db_obj])
+            await key_filters.added(self.model.__tablename__, [db_obj])
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[ModelType]:
+        """Delete one row with a single DELETE ... RETURNING and return it
+        (columns only), or None when no row has that id. Child rows go
+        through ON DELETE CASCADE, as in bulk_delete."""
+        stmt = (
+            delete(self.model)
+            .where(self.model.id == id)
+            .returning(self.model)
+            .execution_options(synchronize_session=False)
+        )
+        db_obj = (await db.execute(stmt)).scalars().first()
+        await db.commit()
+        if db_obj is not None:
+            await self._invalidate([db_obj])
+            await key_filters.removed(self.model.__tablename__, 1)
         return db_obj
-    
-    def remove(self, db: Session, *, id: int) -> ModelType:
-        obj = db.query(self.model).get(id)
-        if not obj:
-            raise HTTPException(status_code=404, detail="Item not found")
-        db.delete(obj)
-        db.commit()
-        return obj
@@ -1,60 +1,55 @@
-from typing import List
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from ..crud.base import CRUDBase
 from ..models.contact import ContactMessage
 from ..schemas.contact import ContactMessageCreate, ContactMessageUpdate
 
 class CRUDContactMessage(CRUDBase[ContactMessage, ContactMessageCreate, ContactMessageUpdate]):
-    def get_multi_ordered(
+    async def get_multi_ordered(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None
     ) -> List[ContactMessage]:
         """Get contact messages ordered by creation date (newest first)"""
-        return (
-            db.query(self.model)
-            .order_by(desc(self.model.created_at))
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        query = select(self.model)
+        return await self._fetch(db, query, [(self.model.created_at, "desc")], skip=skip, limit=limit, cursor=cursor, count=count)
     
-    def get_unread(
+    async def get_unread(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None
     ) -> List[ContactMessage]:
         """Get unread contact messages"""
-        return (
-            db.query(self.model)
+        query = (
+            select(self.model)
             .filter(self.model.is_read == False)
-            .order_by(desc(self.model.created_at))
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return await self._fetch(db, query, [(self.model.created_at, "desc")], skip=skip, limit=limit, cursor=cursor, count=count)
     
-    def get_by_status(
+    async def get_by_status(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         status: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None
     ) -> List[ContactMessage]:
         """Get contact messages by status"""
-        return (
-            db.query(self.model)
+        query = (
+            select(self.model)
             .filter(self.model.status == status)
-            .order_by(desc(self.model.created_at))
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return await self._fetch(db, query, [(self.model.created_at, "desc")], skip=skip, limit=limit, cursor=cursor, count=count)
 
 contact_message = CRUDContactMessage(ContactMessage)
@@ -1,69 +1,53 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc, and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import and_, func, select
 from ..crud.base import CRUDBase
 from ..models.news import News, NewsSection
 from ..schemas.news import NewsCreate, NewsUpdate, NewsSectionCreate, NewsSectionUpdate
 
 class CRUDNews(CRUDBase[News, NewsCreate, NewsUpdate]):
-    def get_by_slug(self, db: Session, *, slug: str) -> Optional[News]:
-        return db.query(News).filter(News.slug == slug).first()
-    
-    def create(self, db: Session, *, obj_in: NewsCreate) -> News:
-        # Extract sections data before creating the news
-        obj_in_data = obj_in.model_dump()
-        sections_data = obj_in_data.pop('sections', [])
-        
-        # Create the news without sections
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        
-        # Add sections if any
-        if sections_data:
-            for section_data in sections_data:
-                section_obj = NewsSection(news_id=db_obj.id, **section_data)
-                db.add(section_obj)
-            db.commit()
-            db.refresh(db_obj)
-        
-        return db_obj
+    load_profiles = {
+        "list": (selectinload(News.sections),),
+        "detail": (joinedload(News.sections),),
+    }
 
-    def get_multi_filtered(
+    async def get_by_slug(self, db: AsyncSession, *, slug: str, profile: str = "detail") -> Optional[News]:
+        result = await db.execute(self._load(select(News).filter(News.slug == slug), profile))
+        return result.unique().scalars().first()
+    
+    async def get_multi_filtered(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         skip: int = 0, 
         limit: int = 100,
-        tags: Optional[List[str]] = None
+        cursor: Optional[str] = None,
+        count: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        profile: str = "list",
+        language: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> List[News]:
-        query = db.query(self.model)
+        query = self._load(select(self.model), profile)
         
         if tags:
             # Filter by any of the provided tags using PostgreSQL array operations
             query = query.filter(self.model.tags.overlap(tags))
             
-        return (
-            query
-            .order_by(desc(self.model.created_at))
-            .offset(skip)
-            .limit(limit)
-            .all()
+        return await self._fetch(
+            db, query, [(self.model.created_at, "desc")], skip=skip, limit=limit, cursor=cursor, count=count, language=language, fields=fields
         )
 
 class CRUDNewsSection(CRUDBase[NewsSection, NewsSectionCreate, NewsSectionUpdate]):
-    def get_by_news(
-        self, db: Session, *, news_id: int, skip: int = 0, limit: int = 100
+    async def get_by_news(
+        self, db: AsyncSession, *, news_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, count: Optional[str] = None
     ) -> List[NewsSection]:
-        return (
-            db.query(self.model)
+        query = (
+            select(self.model)
             .filter(self.model.news_id == news_id)
-            .order_by(asc(self.model.order), asc(self.model.id))
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return await self._fetch(db, query, [(self.model.order, "asc")], skip=skip, limit=limit, cursor=cursor, count=count)
 
 news = CRUDNews(News)
 news_section = CRUDNewsSection(NewsSection)
@@ -1,71 +1,56 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import and_, select
 from ..crud.base import CRUDBase
 from ..models.projects import Project, ProjectPhoto
 from ..schemas.projects import ProjectCreate, ProjectUpdate, ProjectPhotoCreate, ProjectPhotoUpdate
 
 class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdate]):
-    def create(self, db: Session, *, obj_in: ProjectCreate) -> Project:
-        # Extract photos data before creating the project
-        obj_in_data = obj_in.model_dump()
-        photos_data = obj_in_data.pop('photos', [])
-        
-        # Create the project without photos
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        
-        # Add photos if any
-        if photos_data:
-            for photo_data in photos_data:
-                photo_obj = ProjectPhoto(project_id=db_obj.id, **photo_data)
-                db.add(photo_obj)
-            db.commit()
-            db.refresh(db_obj)
-        
-        return db_obj
+    load_profiles = {
+        "list": (selectinload(Project.photos),),
+        "detail": (joinedload(Project.photos),),
+    }
 
-    def get_multi_filtered(
+    async def get_multi_filtered(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         skip: int = 0, 
         limit: int = 100,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None,
         property_sector_id: Optional[int] = None,
         year: Optional[int] = None,
-        tag: Optional[str] = None
+        tag: Optional[str] = None,
+        profile: str = "list",
+        language: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> List[Project]:
-        query = db.query(self.model)
+        query = self._load(select(self.model), profile)
         
         if property_sector_id is not None:
             query = query.filter(self.model.property_sector_id == property_sector_id)
         if year is not None:
             query = query.filter(self.model.year == year)
         if tag is not None:
-            query = query.filter(self.model.tag.ilike(f"%{tag}%"))
+            # Bound ILIKE '%...%' served by ix_projects_tag_trgm; user
+            # wildcards are escaped so they match literally
+            query = query.filter(self.model.tag.icontains(tag, autoescape=True))
             
-        return (
-            query
-            .order_by(desc(self.model.year))
-            .offset(skip)
-            .limit(limit)
-            .all()
+        return await self._fetch(
+            db, query, [(self.model.year, "desc")], skip=skip, limit=limit, cursor=cursor, count=count, language=language, fields=fields
         )
 
 class CRUDProjectPhoto(CRUDBase[ProjectPhoto, ProjectPhotoCreate, ProjectPhotoUpdate]):
-    def get_by_project(
-        self, db: Session, *, project_id: int, skip: int = 0, limit: int = 100
+    async def get_by_project(
+        self, db: AsyncSession, *, project_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, count: Optional[str] = None
     ) -> List[ProjectPhoto]:
-        return (
-            db.query(self.model)
+        query = (
+            select(self.model)
             .filter(self.model.project_id == project_id)
-            .order_by(asc(self.model.order), asc(self.model.id))
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return await self._fetch(db, query, [(self.model.order, "asc")], skip=skip, limit=limit, cursor=cursor, count=count)
 
 project = CRUDProject(Project)
 project_photo = CRUDProjectPhoto(ProjectPhoto)
@@ -1,34 +1,43 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import asc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import select
 from ..crud.base import CRUDBase
 from ..models.property_sectors import PropertySector, SectorInn
 from ..schemas.property_sectors import PropertySectorCreate, PropertySectorUpdate, SectorInnCreate, SectorInnUpdate
 
 class CRUDPropertySector(CRUDBase[PropertySector, PropertySectorCreate, PropertySectorUpdate]):
-    def get_multi_ordered(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+    load_profiles = {
+        "list": (selectinload(PropertySector.inns),),
+        "detail": (joinedload(PropertySector.inns),),
+    }
+
+    async def get_multi_ordered(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None,
+        profile: str = "list",
+        language: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> List[PropertySector]:
-        return (
-            db.query(self.model)
-            .order_by(asc(self.model.order), asc(self.model.id))
-            .offset(skip)
-            .limit(limit)
-            .all()
+        query = self._load(select(self.model), profile)
+        return await self._fetch(
+            db, query, [(self.model.order, "asc")], skip=skip, limit=limit, cursor=cursor, count=count, language=language, fields=fields
         )
 
 class CRUDSectorInn(CRUDBase[SectorInn, SectorInnCreate, SectorInnUpdate]):
-    def get_by_property_sector(
-        self, db: Session, *, property_sector_id: int, skip: int = 0, limit: int = 100
+    async def get_by_property_sector(
+        self, db: AsyncSession, *, property_sector_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, count: Optional[str] = None
     ) -> List[SectorInn]:
-        return (
-            db.query(self.model)
+        query = (
+            select(self.model)
             .filter(self.model.property_sector_id == property_sector_id)
-            .order_by(asc(self.model.order), asc(self.model.id))
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return await self._fetch(db, query, [(self.model.order, "asc")], skip=skip, limit=limit, cursor=cursor, count=count)
 
 property_sector = CRUDPropertySector(PropertySector)
 sector_inn = CRUDSectorInn(SectorInn)
@@ -1,12 +1,14 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..models.services import Service, ServiceBenefit
 from ..schemas.services import ServiceCreate, ServiceUpdate, ServiceBenefitCreate, ServiceBenefitUpdate
 from .base import CRUDBase
 
 class CRUDService(CRUDBase[Service, ServiceCreate, ServiceUpdate]):
-    def get_by_slug(self, db: Session, *, slug: str) -> Optional[Service]:
-        return db.query(Service).filter(Service.slug == slug).first()
+    async def get_by_slug(self, db: AsyncSession, *, slug: str) -> Optional[Service]:
+        result = await db.execute(select(Service).filter(Service.slug == slug))
+        return result.scalars().first()
 
 class CRUDServiceBenefit(CRUDBase[ServiceBenefit, ServiceBenefitCreate, ServiceBenefitUpdate]):
     pass
@@ -1,6 +1,7 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import desc, or_, select
 from ..crud.base import CRUDBase
 from ..models.team import TeamMember, TeamSection, TeamSectionItem
 from ..schemas.team import (
@@ -13,96 +14,81 @@ from ..schemas.team import (
 )
 
 class CRUDTeamMember(CRUDBase[TeamMember, TeamMemberCreate, TeamMemberUpdate]):
-    def get_multi_ordered(
+    async def get_multi_ordered(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None,
+        language: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> List[TeamMember]:
         """Get team members ordered by full_name"""
-        return (
-            db.query(self.model)
-            .order_by(self.model.full_name.asc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        query = select(self.model)
+        return await self._fetch(
+            db, query, [(self.model.full_name, "asc")], skip=skip, limit=limit, cursor=cursor, count=count, language=language, fields=fields
         )
     
-    def get_by_role(
+    async def get_by_role(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         role: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None
     ) -> List[TeamMember]:
-        """Get team members by role"""
-        return (
-            db.query(self.model)
-            .filter(self.model.role.ilike(f"%{role}%"))
-            .order_by(self.model.full_name.asc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        """Get team members whose role contains `role` in any language"""
+        # One ILIKE per column so each can use its trigram index (BitmapOr)
+        query = (
+            select(self.model)
+            .filter(or_(*(
+                column.icontains(role, autoescape=True)
+                for column in (self.model.role, self.model.role_en, self.model.role_az, self.model.role_ru)
+            )))
         )
+        return await self._fetch(db, query, [(self.model.full_name, "asc")], skip=skip, limit=limit, cursor=cursor, count=count)
 
 class CRUDTeamSection(CRUDBase[TeamSection, TeamSectionCreate, TeamSectionUpdate]):
-    def create(self, db: Session, *, obj_in: TeamSectionCreate) -> TeamSection:
-        # Extract items data before creating the team section
-        obj_in_data = obj_in.model_dump()
-        items_data = obj_in_data.pop('items', [])
-        
-        # Create the team section without items
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        
-        # Add items if any
-        if items_data:
-            for item_data in items_data:
-                item_obj = TeamSectionItem(team_section_id=db_obj.id, **item_data)
-                db.add(item_obj)
-            db.commit()
-            db.refresh(db_obj)
-        
-        return db_obj
+    load_profiles = {
+        "list": (selectinload(TeamSection.items),),
+        "detail": (joinedload(TeamSection.items),),
+    }
 
-    def get_multi_ordered(
+    async def get_multi_ordered(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None,
+        profile: str = "list"
     ) -> List[TeamSection]:
         """Get team sections ordered by title"""
-        return (
-            db.query(self.model)
-            .order_by(self.model.title.asc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        query = self._load(select(self.model), profile)
+        return await self._fetch(db, query, [(self.model.title, "asc")], skip=skip, limit=limit, cursor=cursor, count=count)
 
 class CRUDTeamSectionItem(CRUDBase[TeamSectionItem, TeamSectionItemCreate, TeamSectionItemUpdate]):
-    def get_by_section(
+    async def get_by_section(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         section_id: int,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None
     ) -> List[TeamSectionItem]:
         """Get team section items by section ID"""
-        return (
-            db.query(self.model)
+        query = (
+            select(self.model)
             .filter(self.model.team_section_id == section_id)
-            .order_by(self.model.display_order.asc())
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return await self._fetch(db, query, [(self.model.order, "asc")], skip=skip, limit=limit, cursor=cursor, count=count)
 
 team_member = CRUDTeamMember(TeamMember)
 team_section = CRUDTeamSection(TeamSection)
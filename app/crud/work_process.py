@@ -1,24 +1,26 @@
-from typing import List
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..crud.base import CRUDBase
 from ..models.work_process import WorkProcess
 from ..schemas.work_process import WorkProcessCreate, WorkProcessUpdate
 
 class CRUDWorkProcess(CRUDBase[WorkProcess, WorkProcessCreate, WorkProcessUpdate]):
-    def get_multi_ordered(
+    async def get_multi_ordered(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None,
+        language: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> List[WorkProcess]:
         """Get work processes ordered by order field"""
-        return (
-            db.query(self.model)
-            .order_by(self.model.order.asc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        query = select(self.model)
+        return await self._fetch(
+            db, query, [(self.model.order, "asc")], skip=skip, limit=limit, cursor=cursor, count=count, language=language, fields=fields
         )
 
 work_process = CRUDWorkProcess(WorkProcess)
@@ -1,10 +1,15 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from fastapi_cache import FastAPICache
 from .core.config import settings
-from .core.cache import init_cache
+from .core.bloom import key_filters
+from .core.cache import bypasses_cache, cache_control_headers, close_cache, init_cache, route_policy
+from .core.cache_warmer import warm_cache
+from .core.db import PRIMARY_READS_COOKIE, replicas
 from .routers import (
     services,
     approaches,
@@ -16,7 +21,9 @@ from .routers import (
     contact,
     about,
     work_process,
-    uploads
+    uploads,
+    internal,
+    batch
 )
 
 # Create uploads directory structure if it doesn't exist
@@ -59,7 +66,44 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
-# Include routers
+# Read your writes: after a successful write, pin the client's reads to the
+# primary until the replicas have caught up
+@app.middleware("http")
+async def pin_reads_after_write(request: Request, call_next):
+    response = await call_next(request)
+    if (
+        replicas.engines
+        and request.method not in ("GET", "HEAD", "OPTIONS")
+        and response.status_code < 400
+    ):
+        window = settings.READ_YOUR_WRITES_SECONDS
+        response.set_cookie(
+            PRIMARY_READS_COOKIE,
+            str(time.time() + window),
+            max_age=window,
+            httponly=True,
+            samesite="lax",
+        )
+    return response
+
+# Cache-Control/Surrogate-Control for successful GET responses that @cache
+# did not already label (uncached routes, static files); responses to
+# no-store requests are left unlabelled
+@app.middleware("http")
+async def apply_cache_policy(request: Request, call_next):
+    response = await call_next(request)
+    if (
+        request.method == "GET"
+        and response.status_code < 400
+        and "cache-control" not in response.headers
+        and not bypasses_cache(request)
+    ):
+        policy = route_policy(request)
+        response.headers.update(cache_control_headers(policy, policy.ttl or None, policy.stale))
+    return response
+
+# Include routers (batch first so /<resource>/batch wins over /<resource>/{id})
+app.include_router(batch.router, prefix=settings.API_V1_STR)
 app.include_router(services.router, prefix=settings.API_V1_STR, tags=["services"])
 app.include_router(approaches.router, prefix=settings.API_V1_STR, tags=["approaches"])
 app.include_router(property_sectors.router, prefix=settings.API_V1_STR, tags=["property sectors"])
@@ -75,12 +119,28 @@ app.include_router(work_process.router, prefix=settings.API_V1_STR, tags=["work
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 app.mount("/resources", StaticFiles(directory="resources"), name="resources")
 
+# Startup cache warming, held so it is not garbage collected and can be cancelled
+warmer = None
+
 @app.on_event("startup")
 async def startup_event():
-    await init_cache()
+    global warmer
+    await init_cache(app)
+    if settings.BLOOM_FILTER_ENABLED:
+        key_filters.start()
+    if settings.CACHE_WARM_ON_STARTUP:
+        warmer = asyncio.create_task(warm_cache(app))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if warmer is not None and not warmer.done():
+        warmer.cancel()
+    await key_filters.stop()
+    await close_cache()
 
 # Include uploads router
 app.include_router(uploads.router, prefix=settings.API_V1_STR, tags=["uploads"])
+app.include_router(internal.router, prefix=settings.API_V1_STR, tags=["internal"])
 
 @app.get("/")
 async def root():
@@ -37,6 +37,7 @@ class Project(Base, TimestampMixin):
         Index("ix_projects_property_sector", "property_sector_id"),
         Index("ix_projects_year", "year"),
         Index("ix_projects_tag", "tag"),
+        Index("ix_projects_tag_trgm", "tag", postgresql_using="gin", postgresql_ops={"tag": "gin_trgm_ops"}),
         Index("ix_projects_slug", "slug"),
         Index("ix_projects_title_en", "title_en"),
         Index("ix_projects_title_az", "title_az"),
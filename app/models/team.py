@@ -27,6 +27,11 @@ class TeamMember(Base, TimestampMixin):
     __table_args__ = (
         Index("ix_team_members_full_name", "full_name"),
         Index("ix_team_members_order", "order"),
+        # Trigram indexes backing the substring role search
+        *(
+            Index(f"ix_team_members_{column}_trgm", column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+            for column in ("role", "role_en", "role_az", "role_ru")
+        ),
     )
 
 class TeamSection(Base, TimestampMixin):
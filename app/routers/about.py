@@ -1,8 +1,9 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form, Request
-from sqlalchemy.orm import Session
-from fastapi_cache.decorator import cache
-from ..core.db import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.db import get_async_db, get_read_db
+from ..core.cache import cache
+from ..core.pagination import COUNT_QUERY, CURSOR_QUERY, list_response, paginate
 from ..crud.about import about, about_logo
 from ..schemas.about import (
     AboutCreate,
@@ -13,41 +14,33 @@ from ..schemas.about import (
     AboutLogoUpdate
 )
 from ..utils.uploads import upload_file
-from ..utils.multilingual import prepare_multilingual_response, validate_language
+from ..utils.multilingual import validate_language
 
 router = APIRouter()
 
 # About endpoints
 @router.get("/about")
-@cache(expire=300)
+@cache(tags=["about:list"])
 async def list_about_sections(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = CURSOR_QUERY,
+    count: Optional[str] = COUNT_QUERY,
     language: str = Query("en", description="Language code (en, az, ru)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all about sections with multilingual support"""
     lang = validate_language(language)
-    about_sections = about.get_multi_ordered(db, skip=skip, limit=limit)
+    about_sections = await about.get_multi_ordered(db, skip=skip, limit=limit, cursor=cursor, count=count, language=lang, fields=['experience', 'project_count', 'members'])
     
-    # Prepare multilingual response
-    multilingual_about = []
-    for section in about_sections:
-        multilingual_section = prepare_multilingual_response(
-            section, 
-            ['experience', 'project_count', 'members'], 
-            lang
-        )
-        multilingual_about.append(multilingual_section)
-    
-    return multilingual_about
+    return paginate(about_sections, cursor)
 
 @router.post("/about", response_model=AboutRead)
 async def create_about_section(
     experience: str = Form(...),
     project_count: str = Form(...),
     members: str = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new about section with form data"""
     about_data = AboutCreate(
@@ -55,86 +48,83 @@ async def create_about_section(
         project_count=project_count,
         members=members
     )
-    return about.create(db=db, obj_in=about_data)
+    return await about.create(db=db, obj_in=about_data)
 
 @router.post("/about/json", response_model=AboutRead)
 async def create_about_section_json(
     about_in: AboutCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new about section with JSON data (for backwards compatibility)"""
-    return about.create(db=db, obj_in=about_in)
+    return await about.create(db=db, obj_in=about_in)
 
 @router.post("/about/{about_id}/photo")
 async def upload_about_photo(
     about_id: int,
     request: Request,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Upload photo for an about section"""
-    db_about = about.get(db, id=about_id)
+    db_about = await about.get(db, id=about_id, profile="summary")
     if not db_about:
         raise HTTPException(status_code=404, detail="About section not found")
     
     file_url = await upload_file(file, "about/photos", request)
-    about.update(db=db, db_obj=db_about, obj_in={"photo_url": file_url})
+    await about.update(db=db, id=db_about.id, obj_in={"photo_url": file_url}, profile="summary")
     return {"message": "Photo uploaded successfully", "url": file_url}
 
 @router.get("/about/{about_id}")
-@cache(expire=300)
+@cache(tags=["about:{about_id}"])
 async def get_about_section(
     about_id: int,
     language: str = Query("en", description="Language code (en, az, ru)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific about section by ID with multilingual support"""
-    db_about = about.get(db, id=about_id)
+    lang = validate_language(language)
+    db_about = await about.get_localized(db, language=lang, fields=['experience', 'project_count', 'members'], id=about_id)
     if not db_about:
         raise HTTPException(status_code=404, detail="About section not found")
-    
-    lang = validate_language(language)
-    return prepare_multilingual_response(
-        db_about, 
-        ['experience', 'project_count', 'members'], 
-        lang
-    )
+    return db_about
 
 @router.put("/about/{about_id}", response_model=AboutRead)
 async def update_about_section(
     about_id: int,
     about_in: AboutUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an about section"""
-    db_about = about.get(db, id=about_id)
+    db_about = await about.update(db=db, id=about_id, obj_in=about_in)
     if not db_about:
         raise HTTPException(status_code=404, detail="About section not found")
-    return about.update(db=db, db_obj=db_about, obj_in=about_in)
+    return db_about
 
 @router.delete("/about/{about_id}")
 async def delete_about_section(
     about_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete an about section"""
-    db_about = about.get(db, id=about_id)
+    db_about = await about.remove(db=db, id=about_id)
     if not db_about:
         raise HTTPException(status_code=404, detail="About section not found")
-    about.remove(db=db, id=about_id)
     return {"message": "About section deleted successfully"}
 
 # AboutLogo endpoints
-@router.get("/about/{about_id}/logos", response_model=List[AboutLogoRead])
-@cache(expire=300)
+@router.get("/about/{about_id}/logos", response_model=list_response(AboutLogoRead))
+@cache(tags=["about_logos:list", "about:{about_id}"])
 async def list_about_logos(
     about_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = CURSOR_QUERY,
+    count: Optional[str] = COUNT_QUERY,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all logos for an about section"""
-    return about_logo.get_by_about(db, about_id=about_id, skip=skip, limit=limit)
+    rows = await about_logo.get_by_about(db, about_id=about_id, skip=skip, limit=limit, cursor=cursor, count=count)
+    return paginate(rows, cursor)
 
 @router.post("/about/{about_id}/logos", response_model=AboutLogoRead)
 async def create_about_logo(
@@ -142,7 +132,7 @@ async def create_about_logo(
     name: str = Form(...),
     alt_text: Optional[str] = Form(None),
     order: int = Form(0),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new about logo with form data"""
     logo_data = AboutLogoCreate(
@@ -151,32 +141,32 @@ async def create_about_logo(
         alt_text=alt_text,
         order=order
     )
-    return about_logo.create(db=db, obj_in=logo_data)
+    return await about_logo.create(db=db, obj_in=logo_data)
 
 @router.post("/about-logos/{logo_id}/file")
 async def upload_about_logo_file(
     logo_id: int,
     request: Request,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Upload logo file for an about logo"""
-    db_logo = about_logo.get(db, id=logo_id)
+    db_logo = await about_logo.get(db, id=logo_id)
     if not db_logo:
         raise HTTPException(status_code=404, detail="About logo not found")
     
     file_url = await upload_file(file, "about/logos", request)
-    about_logo.update(db=db, db_obj=db_logo, obj_in={"logo_url": file_url})
+    await about_logo.update(db=db, id=db_logo.id, obj_in={"logo_url": file_url}, profile="summary")
     return {"message": "Logo uploaded successfully", "url": file_url}
 
 @router.get("/about-logos/{logo_id}", response_model=AboutLogoRead)
-@cache(expire=300)
+@cache(tags=["about_logos:{logo_id}", "about:{result[about_id]}"])
 async def get_about_logo(
     logo_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific about logo by ID"""
-    db_logo = about_logo.get(db, id=logo_id)
+    db_logo = await about_logo.get(db, id=logo_id)
     if not db_logo:
         raise HTTPException(status_code=404, detail="About logo not found")
     return db_logo
@@ -185,22 +175,21 @@ async def get_about_logo(
 async def update_about_logo(
     logo_id: int,
     logo_in: AboutLogoUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an about logo"""
-    db_logo = about_logo.get(db, id=logo_id)
+    db_logo = await about_logo.update(db=db, id=logo_id, obj_in=logo_in)
     if not db_logo:
         raise HTTPException(status_code=404, detail="About logo not found")
-    return about_logo.update(db=db, db_obj=db_logo, obj_in=logo_in)
+    return db_logo
 
 @router.delete("/about-logos/{logo_id}")
 async def delete_about_logo(
     logo_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete an about logo"""
-    db_logo = about_logo.get(db, id=logo_id)
+    db_logo = await about_logo.remove(db=db, id=logo_id)
     if not db_logo:
         raise HTTPException(status_code=404, detail="About logo not found")
-    about_logo.remove(db=db, id=logo_id)
     return {"message": "About logo deleted successfully"}
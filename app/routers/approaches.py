@@ -1,48 +1,41 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Form
-from sqlalchemy.orm import Session
-from fastapi_cache.decorator import cache
-from ..core.db import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.db import get_async_db, get_read_db
+from ..core.cache import cache
+from ..core.pagination import COUNT_QUERY, CURSOR_QUERY, paginate
 from ..crud.approaches import approach
 from ..schemas.approaches import (
     ApproachCreate,
     ApproachRead,
     ApproachUpdate
 )
-from ..utils.multilingual import prepare_multilingual_response, validate_language
+from ..utils.multilingual import validate_language
 
 router = APIRouter()
 
 @router.get("/approaches")
-@cache(expire=300)  # Cache for 5 minutes
+@cache(tags=["approaches:list"])
 async def list_approaches(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = CURSOR_QUERY,
+    count: Optional[str] = COUNT_QUERY,
     language: str = Query("en", description="Language code (en, az, ru)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all approaches ordered by order field with multilingual support"""
     lang = validate_language(language)
-    approaches = approach.get_multi_ordered(db, skip=skip, limit=limit)
+    approaches = await approach.get_multi_ordered(db, skip=skip, limit=limit, cursor=cursor, count=count, language=lang, fields=['title', 'description'])
     
-    # Prepare multilingual response
-    multilingual_approaches = []
-    for appr in approaches:
-        multilingual_appr = prepare_multilingual_response(
-            appr, 
-            ['title', 'description'], 
-            lang
-        )
-        multilingual_approaches.append(multilingual_appr)
-    
-    return multilingual_approaches
+    return paginate(approaches, cursor)
 
 @router.post("/approaches", response_model=ApproachRead)
 async def create_approach(
     title: str = Form(...),
     description: str = Form(None),
     order: int = Form(0),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new approach with form data"""
     approach_data = ApproachCreate(
@@ -50,24 +43,24 @@ async def create_approach(
         description=description,
         order=order
     )
-    return approach.create(db=db, obj_in=approach_data)
+    return await approach.create(db=db, obj_in=approach_data)
 
 @router.post("/approaches/json", response_model=ApproachRead)
 async def create_approach_json(
     approach_in: ApproachCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new approach with JSON data (for backwards compatibility)"""
-    return approach.create(db=db, obj_in=approach_in)
+    return await approach.create(db=db, obj_in=approach_in)
 
 @router.get("/approaches/{approach_id}", response_model=ApproachRead)
-@cache(expire=300)
+@cache(tags=["approaches:{approach_id}"])
 async def get_approach(
     approach_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific approach by ID"""
-    db_approach = approach.get(db, id=approach_id)
+    db_approach = await approach.get(db, id=approach_id)
     if not db_approach:
         raise HTTPException(status_code=404, detail="Approach not found")
     return db_approach
@@ -76,22 +69,21 @@ async def get_approach(
 async def update_approach(
     approach_id: int,
     approach_in: ApproachUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an approach"""
-    db_approach = approach.get(db, id=approach_id)
+    db_approach = await approach.update(db=db, id=approach_id, obj_in=approach_in)
     if not db_approach:
         raise HTTPException(status_code=404, detail="Approach not found")
-    return approach.update(db=db, db_obj=db_approach, obj_in=approach_in)
+    return db_approach
 
 @router.delete("/approaches/{approach_id}")
 async def delete_approach(
     approach_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete an approach"""
-    db_approach = approach.get(db, id=approach_id)
+    db_approach = await approach.remove(db=db, id=approach_id)
     if not db_approach:
         raise HTTPException(status_code=404, detail="Approach not found")
-    approach.remove(db=db, id=approach_id)
     return {"message": "Approach deleted successfully"}
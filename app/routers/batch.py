@@ -0,0 +1,82 @@
+from typing import List
+from fastapi import APIRouter, Body, Depends
+from pydantic import create_model
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.db import get_async_db
+from ..crud.about import about
+from ..crud.approaches import approach
+from ..crud.news import news
+from ..crud.partners import partner
+from ..crud.projects import project
+from ..crud.property_sectors import property_sector
+from ..crud.services import service, service_benefit
+from ..crud.team import team_member, team_section
+from ..crud.work_process import work_process
+from ..schemas.about import AboutCreate, AboutUpdate, AboutRead
+from ..schemas.approaches import ApproachCreate, ApproachUpdate, ApproachRead
+from ..schemas.news import NewsCreate, NewsUpdate, NewsRead
+from ..schemas.partners import PartnerCreate, PartnerUpdate, PartnerRead
+from ..schemas.projects import ProjectCreate, ProjectUpdate, ProjectRead
+from ..schemas.property_sectors import PropertySectorCreate, PropertySectorUpdate, PropertySectorRead
+from ..schemas.services import (
+    ServiceCreate,
+    ServiceUpdate,
+    ServiceRead,
+    ServiceBenefitCreate,
+    ServiceBenefitUpdate,
+    ServiceBenefitRead
+)
+from ..schemas.team import (
+    TeamMemberCreate,
+    TeamMemberUpdate,
+    TeamMemberRead,
+    TeamSectionCreate,
+    TeamSectionUpdate,
+    TeamSectionRead
+)
+from ..schemas.work_process import WorkProcessCreate, WorkProcessUpdate, WorkProcessRead
+
+# Included ahead of the resource routers so /<resource>/batch is not taken
+# for /<resource>/{id}
+router = APIRouter()
+
+def add_batch_routes(path: str, crud, create_schema, update_schema, read_schema, tag: str):
+    """Register POST/PATCH/DELETE {path}/batch; each request runs in a single transaction"""
+    update_item = create_model(f"{update_schema.__name__}Item", __base__=update_schema, id=(int, ...))
+
+    @router.post(f"{path}/batch", response_model=List[read_schema], tags=[tag])
+    async def batch_create(
+        objs_in: List[create_schema],
+        db: AsyncSession = Depends(get_async_db)
+    ):
+        """Create many items (with inline children) in one transaction"""
+        return await crud.bulk_create(db, objs_in=objs_in)
+
+    @router.patch(f"{path}/batch", response_model=List[read_schema], tags=[tag])
+    async def batch_update(
+        objs_in: List[update_item],
+        db: AsyncSession = Depends(get_async_db)
+    ):
+        """Partially update many items by id in one transaction"""
+        return await crud.bulk_update(db, objs_in=objs_in)
+
+    @router.delete(f"{path}/batch", tags=[tag])
+    async def batch_delete(
+        ids: List[int] = Body(..., embed=True),
+        db: AsyncSession = Depends(get_async_db)
+    ):
+        """Delete many items by id in one transaction"""
+        deleted = await crud.bulk_delete(db, ids=ids)
+        return {"deleted": deleted}
+
+add_batch_routes("/services", service, ServiceCreate, ServiceUpdate, ServiceRead, "services")
+add_batch_routes("/service-benefits", service_benefit, ServiceBenefitCreate, ServiceBenefitUpdate, ServiceBenefitRead, "services")
+add_batch_routes("/approaches", approach, ApproachCreate, ApproachUpdate, ApproachRead, "approaches")
+add_batch_routes("/property-sectors", property_sector, PropertySectorCreate, PropertySectorUpdate, PropertySectorRead, "property sectors")
+add_batch_routes("/projects", project, ProjectCreate, ProjectUpdate, ProjectRead, "projects")
+add_batch_routes("/news", news, NewsCreate, NewsUpdate, NewsRead, "news")
+add_batch_routes("/partners", partner, PartnerCreate, PartnerUpdate, PartnerRead, "partners")
+add_batch_routes("/team-members", team_member, TeamMemberCreate, TeamMemberUpdate, TeamMemberRead, "team")
+add_batch_routes("/team-sections", team_section, TeamSectionCreate, TeamSectionUpdate, TeamSectionRead, "team")
+add_batch_routes("/about", about, AboutCreate, AboutUpdate, AboutRead, "about")
+add_batch_routes("/work-processes", work_process, WorkProcessCreate, WorkProcessUpdate, WorkProcessRead, "work processes")
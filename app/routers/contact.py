@@ -1,8 +1,9 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Form, UploadFile, File
-from sqlalchemy.orm import Session
-from fastapi_cache.decorator import cache
-from ..core.db import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.db import get_async_db, get_read_db
+from ..core.cache import cache
+from ..core.pagination import COUNT_QUERY, CURSOR_QUERY, list_response, paginate
 from ..crud.contact import contact_message
 from ..schemas.contact import (
     ContactMessageCreate,
@@ -12,18 +13,22 @@ from ..schemas.contact import (
 
 router = APIRouter()
 
-@router.get("/contact-messages", response_model=List[ContactMessageRead])
-@cache(expire=300)
+@router.get("/contact-messages", response_model=list_response(ContactMessageRead))
+@cache(tags=["contact_messages:list"])
 async def list_contact_messages(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = CURSOR_QUERY,
+    count: Optional[str] = COUNT_QUERY,
     status: Optional[str] = Query(None, description="Filter by status"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all contact messages with optional status filter"""
     if status:
-        return contact_message.get_by_status(db, status=status, skip=skip, limit=limit)
-    return contact_message.get_multi_ordered(db, skip=skip, limit=limit)
+        rows = await contact_message.get_by_status(db, status=status, skip=skip, limit=limit, cursor=cursor, count=count)
+        return paginate(rows, cursor)
+    rows = await contact_message.get_multi_ordered(db, skip=skip, limit=limit, cursor=cursor, count=count)
+    return paginate(rows, cursor)
 
 @router.post("/contact-messages", response_model=ContactMessageRead)
 async def create_contact_message(
@@ -33,7 +38,7 @@ async def create_contact_message(
     email: str = Form(...),
     message: str = Form(None),
     cv: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Submit a new contact message with form data and optional CV upload"""
     cv_url = None
@@ -49,34 +54,37 @@ async def create_contact_message(
         message=message,
         cv_url=cv_url
     )
-    return contact_message.create(db=db, obj_in=message_data)
+    return await contact_message.create(db=db, obj_in=message_data)
 
 @router.post("/contact-messages/json", response_model=ContactMessageRead)
 async def create_contact_message_json(
     message_in: ContactMessageCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Submit a new contact message with JSON data (for backwards compatibility)"""
-    return contact_message.create(db=db, obj_in=message_in)
+    return await contact_message.create(db=db, obj_in=message_in)
 
-@router.get("/contact-messages/unread", response_model=List[ContactMessageRead])
-@cache(expire=60)  # Shorter cache for unread messages
+@router.get("/contact-messages/unread", response_model=list_response(ContactMessageRead))
+@cache(tags=["contact_messages:list"])
 async def list_unread_messages(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = CURSOR_QUERY,
+    count: Optional[str] = COUNT_QUERY,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all unread contact messages"""
-    return contact_message.get_unread(db, skip=skip, limit=limit)
+    rows = await contact_message.get_unread(db, skip=skip, limit=limit, cursor=cursor, count=count)
+    return paginate(rows, cursor)
 
 @router.get("/contact-messages/{message_id}", response_model=ContactMessageRead)
-@cache(expire=300)
+@cache(tags=["contact_messages:{message_id}"])
 async def get_contact_message(
     message_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific contact message by ID"""
-    db_message = contact_message.get(db, id=message_id)
+    db_message = await contact_message.get(db, id=message_id)
     if not db_message:
         raise HTTPException(status_code=404, detail="Contact message not found")
     return db_message
@@ -85,35 +93,32 @@ async def get_contact_message(
 async def update_contact_message(
     message_id: int,
     message_in: ContactMessageUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a contact message (e.g., mark as read, change status)"""
-    db_message = contact_message.get(db, id=message_id)
+    db_message = await contact_message.update(db=db, id=message_id, obj_in=message_in)
     if not db_message:
         raise HTTPException(status_code=404, detail="Contact message not found")
-    return contact_message.update(db=db, db_obj=db_message, obj_in=message_in)
+    return db_message
 
 @router.post("/contact-messages/{message_id}/mark-read")
 async def mark_message_as_read(
     message_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Mark a contact message as read"""
-    db_message = contact_message.get(db, id=message_id)
+    db_message = await contact_message.update(db=db, id=message_id, obj_in={"is_read": True, "status": "read"}, profile="summary")
     if not db_message:
         raise HTTPException(status_code=404, detail="Contact message not found")
-    
-    contact_message.update(db=db, db_obj=db_message, obj_in={"is_read": True, "status": "read"})
     return {"message": "Message marked as read"}
 
 @router.delete("/contact-messages/{message_id}")
 async def delete_contact_message(
     message_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a contact message"""
-    db_message = contact_message.get(db, id=message_id)
+    db_message = await contact_message.remove(db=db, id=message_id)
     if not db_message:
         raise HTTPException(status_code=404, detail="Contact message not found")
-    contact_message.remove(db=db, id=message_id)
     return {"message": "Contact message deleted successfully"}
@@ -0,0 +1,85 @@
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from ..core.cache import cache_stats, get_cache_stats
+from ..core.cache_admin import list_keys, list_namespaces, purge_entity, purge_keys, purge_namespace
+from ..core.cache_stats import prometheus_text
+from ..core.cache_warmer import warm_cache
+from ..core.config import settings
+from ..core.db import get_pool_stats
+
+async def require_internal_token(x_internal_token: Optional[str] = Header(None)) -> None:
+    """Dependency of every internal endpoint (they expose cached URLs and
+    pool state, make the API do work or drop cached data): they answer
+    403 unless X-Internal-Token matches settings.INTERNAL_API_TOKEN, and
+    always while it is unset"""
+    if not settings.INTERNAL_API_TOKEN or not secrets.compare_digest(
+        (x_internal_token or "").encode(), settings.INTERNAL_API_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=403, detail="A valid X-Internal-Token header is required")
+
+router = APIRouter(dependencies=[Depends(require_internal_token)])
+
+@router.get("/internal/db-pool")
+async def db_pool_stats():
+    """Connection pool usage and checkout wait times for the worker serving this request"""
+    return get_pool_stats()
+
+@router.post("/internal/cache/warm")
+async def warm(request: Request, refresh: bool = False):
+    """Fill the response cache for the list and detail routes in every
+    language (e.g. after a deploy); `refresh` recomputes cached entries too"""
+    return await warm_cache(request.app, refresh=refresh)
+
+@router.get("/internal/cache/stats")
+async def cache_stats_report():
+    """Per-route hit/miss/stale counts, bytes and latency, the sampled hot
+    keys and the cache tiers' state for the worker serving this request"""
+    return get_cache_stats()
+
+@router.delete("/internal/cache/stats")
+async def reset_cache_stats():
+    """Zero this worker's cache counters, e.g. before comparing a TTL change"""
+    cache_stats.reset()
+    return {"message": "Cache stats reset"}
+
+@router.get("/internal/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Cache metrics of the worker serving this request in the Prometheus
+    text format"""
+    return PlainTextResponse(prometheus_text(cache_stats, get_cache_stats()), media_type="text/plain; version=0.0.4")
+
+@router.get("/internal/cache/keys")
+async def cache_keys(
+    request: Request,
+    route: Optional[str] = Query(None, description="Route path, e.g. /news/{news_id}"),
+    language: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Cached responses of a route and/or language with their TTL and size"""
+    return await list_keys(request.app, route=route, language=language, limit=limit)
+
+@router.delete("/internal/cache/keys")
+async def purge_cache_keys(
+    request: Request,
+    route: Optional[str] = Query(None, description="Route path, e.g. /news/{news_id}"),
+    language: Optional[str] = None,
+):
+    """Purge the cached responses of a route and/or language"""
+    return await purge_keys(request.app, route=route, language=language)
+
+@router.delete("/internal/cache/entities/{table}")
+async def purge_cache_entity(table: str, id: Optional[int] = None):
+    """Purge what is cached for one row of a table, or for all of them"""
+    return await purge_entity(table, id)
+
+@router.get("/internal/cache/namespaces")
+async def cache_namespaces():
+    """Cache namespaces present in Redis and which one this deploy uses"""
+    return await list_namespaces()
+
+@router.delete("/internal/cache/namespaces/{namespace}")
+async def purge_cache_namespace(namespace: str):
+    """Purge every key of a namespace, e.g. one left by an earlier deploy"""
+    return await purge_namespace(namespace)
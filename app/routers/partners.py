@@ -1,8 +1,9 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form, Request
-from sqlalchemy.orm import Session
-from fastapi_cache.decorator import cache
-from ..core.db import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.db import get_async_db, get_read_db
+from ..core.cache import cache
+from ..core.pagination import COUNT_QUERY, CURSOR_QUERY, list_response, paginate
 from ..crud.partners import partner, partner_logo
 from ..schemas.partners import (
     PartnerCreate,
@@ -13,64 +14,56 @@ from ..schemas.partners import (
     PartnerLogoUpdate
 )
 from ..utils.uploads import upload_file
-from ..utils.multilingual import prepare_multilingual_response, validate_language
+from ..utils.multilingual import validate_language
 
 router = APIRouter()
 
 # Partner endpoints
 @router.get("/partners")
-@cache(expire=300)
+@cache(tags=["partners:list"])
 async def list_partners(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = CURSOR_QUERY,
+    count: Optional[str] = COUNT_QUERY,
     language: str = Query("en", description="Language code (en, az, ru)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all partners with multilingual support"""
     lang = validate_language(language)
-    partners = partner.get_multi(db, skip=skip, limit=limit)
+    partners = await partner.get_multi(db, skip=skip, limit=limit, cursor=cursor, count=count, language=lang, fields=['title', 'button_text'])
     
-    # Prepare multilingual response
-    multilingual_partners = []
-    for ptnr in partners:
-        multilingual_ptnr = prepare_multilingual_response(
-            ptnr, 
-            ['title', 'button_text'], 
-            lang
-        )
-        multilingual_partners.append(multilingual_ptnr)
-    
-    return multilingual_partners
+    return paginate(partners, cursor)
 
 @router.post("/partners", response_model=PartnerRead)
 async def create_partner(
     title: str = Form(...),
     button_text: Optional[str] = Form(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new partner with form data"""
     partner_data = PartnerCreate(
         title=title,
         button_text=button_text
     )
-    return partner.create(db=db, obj_in=partner_data)
+    return await partner.create(db=db, obj_in=partner_data)
 
 @router.post("/partners/json", response_model=PartnerRead)
 async def create_partner_json(
     partner_in: PartnerCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new partner with JSON data (for backwards compatibility)"""
-    return partner.create(db=db, obj_in=partner_in)
+    return await partner.create(db=db, obj_in=partner_in)
 
 @router.get("/partners/{partner_id}", response_model=PartnerRead)
-@cache(expire=300)
+@cache(tags=["partners:{partner_id}"])
 async def get_partner(
     partner_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific partner by ID"""
-    db_partner = partner.get(db, id=partner_id)
+    db_partner = await partner.get(db, id=partner_id)
     if not db_partner:
         raise HTTPException(status_code=404, detail="Partner not found")
     return db_partner
@@ -79,37 +72,39 @@ async def get_partner(
 async def update_partner(
     partner_id: int,
     partner_in: PartnerUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a partner"""
-    db_partner = partner.get(db, id=partner_id)
+    db_partner = await partner.update(db=db, id=partner_id, obj_in=partner_in)
     if not db_partner:
         raise HTTPException(status_code=404, detail="Partner not found")
-    return partner.update(db=db, db_obj=db_partner, obj_in=partner_in)
+    return db_partner
 
 @router.delete("/partners/{partner_id}")
 async def delete_partner(
     partner_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a partner"""
-    db_partner = partner.get(db, id=partner_id)
+    db_partner = await partner.remove(db=db, id=partner_id)
     if not db_partner:
         raise HTTPException(status_code=404, detail="Partner not found")
-    partner.remove(db=db, id=partner_id)
     return {"message": "Partner deleted successfully"}
 
 # Partner Logo endpoints
-@router.get("/partners/{partner_id}/logos", response_model=List[PartnerLogoRead])
-@cache(expire=300)
+@router.get("/partners/{partner_id}/logos", response_model=list_response(PartnerLogoRead))
+@cache(tags=["partner_logos:list", "partners:{partner_id}"])
 async def list_partner_logos(
     partner_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = CURSOR_QUERY,
+    count: Optional[str] = COUNT_QUERY,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all logos for a partner"""
-    return partner_logo.get_by_partner(db, partner_id=partner_id, skip=skip, limit=limit)
+    rows = await partner_logo.get_by_partner(db, partner_id=partner_id, skip=skip, limit=limit, cursor=cursor, count=count)
+    return paginate(rows, cursor)
 
 @router.post("/partners/{partner_id}/logos")
 async def upload_partner_logo(
@@ -117,15 +112,15 @@ async def upload_partner_logo(
     request: Request,
     file: UploadFile = File(...),
     order: int = Query(0),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Upload a logo for a partner"""
-    db_partner = partner.get(db, id=partner_id)
+    db_partner = await partner.get(db, id=partner_id, profile="summary")
     if not db_partner:
         raise HTTPException(status_code=404, detail="Partner not found")
     
     file_url = await upload_file(file, "partners/logos", request)
     logo_data = PartnerLogoCreate(partner_id=partner_id, order=order)
-    db_logo = partner_logo.create(db=db, obj_in=logo_data)
-    partner_logo.update(db=db, db_obj=db_logo, obj_in={"image_url": file_url})
+    db_logo = await partner_logo.create(db=db, obj_in=logo_data)
+    await partner_logo.update(db=db, id=db_logo.id, obj_in={"image_url": file_url}, profile="summary")
     return {"message": "Logo uploaded successfully", "url": file_url, "id": db_logo.id}
@@ -1,8 +1,10 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form, Request
-from sqlalchemy.orm import Session
-from fastapi_cache.decorator import cache
-from ..core.db import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.db import get_async_db, get_read_db
+from ..core.bloom import require_known
+from ..core.cache import cache
+from ..core.pagination import COUNT_QUERY, CURSOR_QUERY, list_response, paginate
 from ..crud.projects import project, project_photo
 from ..schemas.projects import (
     ProjectCreate,
@@ -13,44 +15,40 @@ from ..schemas.projects import (
     ProjectPhotoUpdate
 )
 from ..utils.uploads import upload_file
-from ..utils.multilingual import prepare_multilingual_response, validate_language
+from ..utils.multilingual import validate_language
 
 router = APIRouter()
 
 # Project endpoints
 @router.get("/projects")
-@cache(expire=300)
+@cache(tags=["projects:list"])
 async def list_projects(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = CURSOR_QUERY,
+    count: Optional[str] = COUNT_QUERY,
     property_sector_id: Optional[int] = Query(None),
     year: Optional[int] = Query(None),
     tag: Optional[str] = Query(None),
     language: str = Query("en", description="Language code (en, az, ru)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all projects with optional filters and multilingual support"""
     lang = validate_language(language)
-    projects = project.get_multi_filtered(
+    projects = await project.get_multi_filtered(
         db, 
         skip=skip, 
         limit=limit,
+        cursor=cursor,
+        count=count,
+        language=lang,
+        fields=['title', 'description'],
         property_sector_id=property_sector_id,
         year=year,
         tag=tag
     )
     
-    # Prepare multilingual response
-    multilingual_projects = []
-    for proj in projects:
-        multilingual_proj = prepare_multilingual_response(
-            proj, 
-            ['title', 'description'], 
-            lang
-        )
-        multilingual_projects.append(multilingual_proj)
-    
-    return multilingual_projects
+    return paginate(projects, cursor)
 
 @router.post("/projects", response_model=ProjectRead)
 async def create_project(
@@ -61,7 +59,7 @@ async def create_project(
     year: int = Form(...),
     property_sector_id: int = Form(...),
     cover_photo: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new project with form data and optional cover photo"""
     cover_photo_url = None
@@ -77,86 +75,83 @@ async def create_project(
         cover_photo_url=cover_photo_url,
         photos=[]
     )
-    return project.create(db=db, obj_in=project_data)
+    return await project.create(db=db, obj_in=project_data)
 
 @router.post("/projects/json", response_model=ProjectRead)
 async def create_project_json(
     project_in: ProjectCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new project with JSON data (for backwards compatibility)"""
-    return project.create(db=db, obj_in=project_in)
+    return await project.create(db=db, obj_in=project_in)
 
 @router.post("/projects/{project_id}/cover-photo")
 async def upload_project_cover_photo(
     project_id: int,
     request: Request,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Upload cover photo for a project"""
-    db_project = project.get(db, id=project_id)
+    db_project = await project.get(db, id=project_id, profile="summary")
     if not db_project:
         raise HTTPException(status_code=404, detail="Project not found")
     
     file_url = await upload_file(file, "projects/covers", request)
-    project.update(db=db, db_obj=db_project, obj_in={"cover_photo_url": file_url})
+    await project.update(db=db, id=db_project.id, obj_in={"cover_photo_url": file_url}, profile="summary")
     return {"message": "Cover photo uploaded successfully", "url": file_url}
 
-@router.get("/projects/{project_id}")
-@cache(expire=300)
+@router.get("/projects/{project_id}", dependencies=[Depends(require_known("projects", "id", "project_id", "Project not found"))])
+@cache(tags=["projects:{project_id}"])
 async def get_project(
     project_id: int,
     language: str = Query("en", description="Language code (en, az, ru)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific project by ID with multilingual support"""
-    db_project = project.get(db, id=project_id)
+    lang = validate_language(language)
+    db_project = await project.get_localized(db, language=lang, fields=['title', 'description'], id=project_id)
     if not db_project:
         raise HTTPException(status_code=404, detail="Project not found")
-    
-    lang = validate_language(language)
-    return prepare_multilingual_response(
-        db_project, 
-        ['title', 'description'], 
-        lang
-    )
+    return db_project
 
 @router.put("/projects/{project_id}", response_model=ProjectRead)
 async def update_project(
     project_id: int,
     project_in: ProjectUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a project"""
-    db_project = project.get(db, id=project_id)
+    db_project = await project.update(db=db, id=project_id, obj_in=project_in)
     if not db_project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project.update(db=db, db_obj=db_project, obj_in=project_in)
+    return db_project
 
 @router.delete("/projects/{project_id}")
 async def delete_project(
     project_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a project"""
-    db_project = project.get(db, id=project_id)
+    db_project = await project.remove(db=db, id=project_id)
     if not db_project:
         raise HTTPException(status_code=404, detail="Project not found")
-    project.remove(db=db, id=project_id)
     return {"message": "Project deleted successfully"}
 
 # Project Photo endpoints
-@router.get("/projects/{project_id}/photos", response_model=List[ProjectPhotoRead])
-@cache(expire=300)
+@router.get("/projects/{project_id}/photos", response_model=list_response(ProjectPhotoRead))
+@cache(tags=["project_photos:list", "projects:{project_id}"])
 async def list_project_photos(
     project_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = CURSOR_QUERY,
+    count: Optional[str] = COUNT_QUERY,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all photos for a project"""
-    return project_photo.get_by_project(db, project_id=project_id, skip=skip, limit=limit)
+    rows = await project_photo.get_by_project(db, project_id=project_id, skip=skip, limit=limit, cursor=cursor, count=count)
+    return paginate(rows, cursor)
 
 @router.post("/projects/{project_id}/photos")
 async def upload_project_photo(
@@ -164,27 +159,27 @@ async def upload_project_photo(
     request: Request,
     file: UploadFile = File(...),
     order: int = Query(0),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Upload a photo for a project"""
-    db_project = project.get(db, id=project_id)
+    db_project = await project.get(db, id=project_id, profile="summary")
     if not db_project:
         raise HTTPException(status_code=404, detail="Project not found")
     
     file_url = await upload_file(file, "projects/photos", request)
     photo_data = ProjectPhotoCreate(project_id=project_id, order=order)
-    db_photo = project_photo.create(db=db, obj_in=photo_data)
-    project_photo.update(db=db, db_obj=db_photo, obj_in={"image_url": file_url})
+    db_photo = await project_photo.create(db=db, obj_in=photo_data)
+    await project_photo.update(db=db, id=db_photo.id, obj_in={"image_url": file_url}, profile="summary")
     return {"message": "Photo uploaded successfully", "url": file_url, "id": db_photo.id}
 
 @router.get("/project-photos/{photo_id}", response_model=ProjectPhotoRead)
-@cache(expire=300)
+@cache(tags=["project_photos:{photo_id}", "projects:{result[project_id]}"])
 async def get_project_photo(
     photo_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific project photo by ID"""
-    db_photo = project_photo.get(db, id=photo_id)
+    db_photo = await project_photo.get(db, id=photo_id)
     if not db_photo:
         raise HTTPException(status_code=404, detail="Project photo not found")
     return db_photo
@@ -193,22 +188,21 @@ async def get_project_photo(
 async def update_project_photo(
     photo_id: int,
     photo_in: ProjectPhotoUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a project photo"""
-    db_photo = project_photo.get(db, id=photo_id)
+    db_photo = await project_photo.update(db=db, id=photo_id, obj_in=photo_in)
     if not db_photo:
         raise HTTPException(status_code=404, detail="Project photo not found")
-    return project_photo.update(db=db, db_obj=db_photo, obj_in=photo_in)
+    return db_photo
 
 @router.delete("/project-photos/{photo_id}")
 async def delete_project_photo(
     photo_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a project photo"""
-    db_photo = project_photo.get(db, id=photo_id)
+    db_photo = await project_photo.remove(db=db, id=photo_id)
     if not db_photo:
         raise HTTPException(status_code=404, detail="Project photo not found")
-    project_photo.remove(db=db, id=photo_id)
     return {"message": "Project photo deleted successfully"}
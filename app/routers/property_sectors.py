@@ -1,9 +1,10 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Form
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from fastapi_cache.decorator import cache
-from ..core.db import get_db
+from ..core.db import get_async_db, get_read_db
+from ..core.cache import cache
+from ..core.pagination import COUNT_QUERY, CURSOR_QUERY, list_response, paginate
 from ..crud.property_sectors import property_sector, sector_inn
 from ..schemas.property_sectors import (
     PropertySectorCreate,
@@ -13,41 +14,33 @@ from ..schemas.property_sectors import (
     SectorInnRead,
     SectorInnUpdate
 )
-from ..utils.multilingual import prepare_multilingual_response, validate_language
+from ..utils.multilingual import validate_language
 
 router = APIRouter()
 
 # PropertySector endpoints
 @router.get("/property-sectors")
-@cache(expire=300)
+@cache(tags=["property_sectors:list"])
 async def list_property_sectors(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = CURSOR_QUERY,
+    count: Optional[str] = COUNT_QUERY,
     language: str = Query("en", description="Language code (en, az, ru)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all property sectors ordered by order field with multilingual support"""
     lang = validate_language(language)
-    sectors = property_sector.get_multi_ordered(db, skip=skip, limit=limit)
+    sectors = await property_sector.get_multi_ordered(db, skip=skip, limit=limit, cursor=cursor, count=count, language=lang, fields=['title', 'description'])
     
-    # Prepare multilingual response
-    multilingual_sectors = []
-    for sector in sectors:
-        multilingual_sector = prepare_multilingual_response(
-            sector, 
-            ['title', 'description'], 
-            lang
-        )
-        multilingual_sectors.append(multilingual_sector)
-    
-    return multilingual_sectors
+    return paginate(sectors, cursor)
 
 @router.post("/property-sectors", response_model=PropertySectorRead)
 async def create_property_sector(
     title: str = Form(...),
     description: str = Form(...),
     order: int = Form(0),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new property sector with form data"""
     property_sector_data = PropertySectorCreate(
@@ -56,7 +49,7 @@ async def create_property_sector(
         order=order
     )
     try:
-        return property_sector.create(db=db, obj_in=property_sector_data)
+        return await property_sector.create(db=db, obj_in=property_sector_data)
     except IntegrityError as e:
         if "unique constraint" in str(e).lower():
             raise HTTPException(
@@ -68,11 +61,11 @@ async def create_property_sector(
 @router.post("/property-sectors/json", response_model=PropertySectorRead)
 async def create_property_sector_json(
     property_sector_in: PropertySectorCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new property sector with JSON data (for backwards compatibility)"""
     try:
-        return property_sector.create(db=db, obj_in=property_sector_in)
+        return await property_sector.create(db=db, obj_in=property_sector_in)
     except IntegrityError as e:
         if "unique constraint" in str(e).lower():
             raise HTTPException(
@@ -82,59 +75,56 @@ async def create_property_sector_json(
         raise HTTPException(status_code=400, detail="Database constraint violation")
 
 @router.get("/property-sectors/{property_sector_id}")
-@cache(expire=300)
+@cache(tags=["property_sectors:{property_sector_id}"])
 async def get_property_sector(
     property_sector_id: int,
     language: str = Query("en", description="Language code (en, az, ru)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific property sector by ID with multilingual support"""
-    db_property_sector = property_sector.get(db, id=property_sector_id)
+    lang = validate_language(language)
+    db_property_sector = await property_sector.get_localized(db, language=lang, fields=['title', 'description'], id=property_sector_id)
     if not db_property_sector:
         raise HTTPException(status_code=404, detail="Property sector not found")
-    
-    lang = validate_language(language)
-    return prepare_multilingual_response(
-        db_property_sector, 
-        ['title', 'description'], 
-        lang
-    )
+    return db_property_sector
 
 @router.put("/property-sectors/{property_sector_id}", response_model=PropertySectorRead)
 async def update_property_sector(
     property_sector_id: int,
     property_sector_in: PropertySectorUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a property sector"""
-    db_property_sector = property_sector.get(db, id=property_sector_id)
+    db_property_sector = await property_sector.update(db=db, id=property_sector_id, obj_in=property_sector_in)
     if not db_property_sector:
         raise HTTPException(status_code=404, detail="Property sector not found")
-    return property_sector.update(db=db, db_obj=db_property_sector, obj_in=property_sector_in)
+    return db_property_sector
 
 @router.delete("/property-sectors/{property_sector_id}")
 async def delete_property_sector(
     property_sector_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a property sector"""
-    db_property_sector = property_sector.get(db, id=property_sector_id)
+    db_property_sector = await property_sector.remove(db=db, id=property_sector_id)
     if not db_property_sector:
         raise HTTPException(status_code=404, detail="Property sector not found")
-    property_sector.remove(db=db, id=property_sector_id)
     return {"message": "Property sector deleted successfully"}
 
 # SectorInn endpoints
-@router.get("/property-sectors/{property_sector_id}/inns", response_model=List[SectorInnRead])
-@cache(expire=300)
+@router.get("/property-sectors/{property_sector_id}/inns", response_model=list_response(SectorInnRead))
+@cache(tags=["sector_inns:list", "property_sectors:{property_sector_id}"])
 async def list_sector_inns(
     property_sector_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = CURSOR_QUERY,
+    count: Optional[str] = COUNT_QUERY,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all sector inns for a property sector"""
-    return sector_inn.get_by_property_sector(db, property_sector_id=property_sector_id, skip=skip, limit=limit)
+    rows = await sector_inn.get_by_property_sector(db, property_sector_id=property_sector_id, skip=skip, limit=limit, cursor=cursor, count=count)
+    return paginate(rows, cursor)
 
 @router.post("/sector-inns", response_model=SectorInnRead)
 async def create_sector_inn(
@@ -142,7 +132,7 @@ async def create_sector_inn(
     description: str = Form(...),
     property_sector_id: int = Form(...),
     order: int = Form(0),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new sector inn with form data"""
     sector_inn_data = SectorInnCreate(
@@ -151,24 +141,24 @@ async def create_sector_inn(
         property_sector_id=property_sector_id,
         order=order
     )
-    return sector_inn.create(db=db, obj_in=sector_inn_data)
+    return await sector_inn.create(db=db, obj_in=sector_inn_data)
 
 @router.post("/sector-inns/json", response_model=SectorInnRead)
 async def create_sector_inn_json(
     sector_inn_in: SectorInnCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new sector inn with JSON data (for backwards compatibility)"""
-    return sector_inn.create(db=db, obj_in=sector_inn_in)
+    return await sector_inn.create(db=db, obj_in=sector_inn_in)
 
 @router.get("/sector-inns/{sector_inn_id}", response_model=SectorInnRead)
-@cache(expire=300)
+@cache(tags=["sector_inns:{sector_inn_id}", "property_sectors:{result[property_sector_id]}"])
 async def get_sector_inn(
     sector_inn_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific sector inn by ID"""
-    db_sector_inn = sector_inn.get(db, id=sector_inn_id)
+    db_sector_inn = await sector_inn.get(db, id=sector_inn_id)
     if not db_sector_inn:
         raise HTTPException(status_code=404, detail="Sector inn not found")
     return db_sector_inn
@@ -177,22 +167,21 @@ async def get_sector_inn(
 async def update_sector_inn(
     sector_inn_id: int,
     sector_inn_in: SectorInnUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a sector inn"""
-    db_sector_inn = sector_inn.get(db, id=sector_inn_id)
+    db_sector_inn = await sector_inn.update(db=db, id=sector_inn_id, obj_in=sector_inn_in)
     if not db_sector_inn:
         raise HTTPException(status_code=404, detail="Sector inn not found")
-    return sector_inn.update(db=db, db_obj=db_sector_inn, obj_in=sector_inn_in)
+    return db_sector_inn
 
 @router.delete("/sector-inns/{sector_inn_id}")
 async def delete_sector_inn(
     sector_inn_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a sector inn"""
-    db_sector_inn = sector_inn.get(db, id=sector_inn_id)
+    db_sector_inn = await sector_inn.remove(db=db, id=sector_inn_id)
     if not db_sector_inn:
         raise HTTPException(status_code=404, detail="Sector inn not found")
-    sector_inn.remove(db=db, id=sector_inn_id)
     return {"message": "Sector inn deleted successfully"}
@@ -1,8 +1,10 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form, Request
-from sqlalchemy.orm import Session
-from fastapi_cache.decorator import cache
-from ..core.db import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.db import get_async_db, get_read_db
+from ..core.bloom import require_known
+from ..core.cache import cache
+from ..core.pagination import COUNT_QUERY, CURSOR_QUERY, paginate
 from ..crud.services import service, service_benefit
 from ..schemas.services import (
     ServiceCreate,
@@ -13,41 +15,37 @@ from ..schemas.services import (
     ServiceBenefitUpdate
 )
 from ..utils.uploads import upload_file
-from ..utils.multilingual import prepare_multilingual_response, validate_language
+from ..utils.multilingual import validate_language
 
 router = APIRouter()
 
 @router.get("/services")
-@cache(expire=300)  # Cache for 5 minutes
+@cache(tags=["services:list"])
 async def list_services(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = CURSOR_QUERY,
+    count: Optional[str] = COUNT_QUERY,
     order_by: Optional[str] = None,
     direction: str = Query("asc", regex="^(asc|desc)$"),
     language: str = Query("en", description="Language code (en, az, ru)")
 ):
     """Get list of services with multilingual support"""
     lang = validate_language(language)
-    services = service.get_multi(
+    services = await service.get_multi(
         db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
+        count=count,
+        language=lang,
+        fields=['name', 'description'],
         order_by=order_by,
         direction=direction
     )
     
-    # Prepare multilingual response
-    multilingual_services = []
-    for svc in services:
-        multilingual_svc = prepare_multilingual_response(
-            svc, 
-            ['name', 'description'], 
-            lang
-        )
-        multilingual_services.append(multilingual_svc)
-    
-    return multilingual_services
+    return paginate(services, cursor)
 
 @router.post("/services", response_model=ServiceRead)
 async def create_service(
@@ -56,7 +54,7 @@ async def create_service(
     description: str = Form(...),
     order: int = Form(0),
     icon: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new service with form data and optional icon upload"""
     icon_url = None
@@ -69,149 +67,139 @@ async def create_service(
         order=order,
         icon_url=icon_url
     )
-    return service.create(db=db, obj_in=service_data)
+    return await service.create(db=db, obj_in=service_data)
 
 @router.post("/services/json", response_model=ServiceRead)
-def create_service_json(
+async def create_service_json(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     service_in: ServiceCreate
 ):
     """Create a service with JSON data (for backwards compatibility)"""
-    return service.create(db=db, obj_in=service_in)
+    return await service.create(db=db, obj_in=service_in)
 
-@router.get("/services/{service_id}")
-def get_service(
+@router.get("/services/{service_id}", dependencies=[Depends(require_known("services", "id", "service_id", "Service not found"))])
+@cache(tags=["services:{service_id}"])
+async def get_service(
     service_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     language: str = Query("en", description="Language code (en, az, ru)")
 ):
     """Get service by ID with multilingual support"""
-    db_service = service.get(db=db, id=service_id)
+    lang = validate_language(language)
+    db_service = await service.get_localized(db, language=lang, fields=['name', 'description'], id=service_id)
     if not db_service:
         raise HTTPException(status_code=404, detail="Service not found")
-    
-    lang = validate_language(language)
-    return prepare_multilingual_response(
-        db_service, 
-        ['name', 'description'], 
-        lang
-    )
+    return db_service
 
-@router.get("/services/slug/{service_slug}")
-def get_service_by_slug(
+@router.get("/services/slug/{service_slug}", dependencies=[Depends(require_known("services", "slug", "service_slug", "Service not found"))])
+@cache(tags=["services:{result[id]}"])
+async def get_service_by_slug(
     service_slug: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     language: str = Query("en", description="Language code (en, az, ru)")
 ):
     """Get service by slug with multilingual support"""
-    db_service = service.get_by_slug(db=db, slug=service_slug)
+    lang = validate_language(language)
+    db_service = await service.get_localized(db, language=lang, fields=['name', 'description'], slug=service_slug)
     if not db_service:
         raise HTTPException(status_code=404, detail="Service not found")
-    
-    lang = validate_language(language)
-    return prepare_multilingual_response(
-        db_service, 
-        ['name', 'description'], 
-        lang
-    )
+    return db_service
 
 @router.patch("/services/{service_id}", response_model=ServiceRead)
-def update_service(
+async def update_service(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     service_id: int,
     service_in: ServiceUpdate
 ):
-    db_service = service.get(db=db, id=service_id)
+    db_service = await service.update(db=db, id=service_id, obj_in=service_in)
     if not db_service:
         raise HTTPException(status_code=404, detail="Service not found")
-    return service.update(db=db, db_obj=db_service, obj_in=service_in)
+    return db_service
 
 @router.delete("/services/{service_id}", response_model=ServiceRead)
-def delete_service(
+async def delete_service(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     service_id: int
 ):
-    return service.remove(db=db, id=service_id)
+    db_service = await service.remove(db=db, id=service_id)
+    if not db_service:
+        raise HTTPException(status_code=404, detail="Service not found")
+    return db_service
 
 # Service Benefits endpoints
 
 @router.get("/service-benefits")
-@cache(expire=300)  # Cache for 5 minutes
+@cache(tags=["service_benefits:list"])
 async def list_service_benefits(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = CURSOR_QUERY,
+    count: Optional[str] = COUNT_QUERY,
     order_by: Optional[str] = None,
     direction: str = Query("asc", regex="^(asc|desc)$"),
     language: str = Query("en", description="Language code (en, az, ru)")
 ):
     """Get list of service benefits with multilingual support"""
     lang = validate_language(language)
-    benefits = service_benefit.get_multi(
+    benefits = await service_benefit.get_multi(
         db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
+        count=count,
+        language=lang,
+        fields=['title', 'description'],
         order_by=order_by,
         direction=direction
     )
     
-    # Prepare multilingual response
-    multilingual_benefits = []
-    for benefit in benefits:
-        multilingual_benefit = prepare_multilingual_response(
-            benefit, 
-            ['title', 'description'], 
-            lang
-        )
-        multilingual_benefits.append(multilingual_benefit)
-    
-    return multilingual_benefits
+    return paginate(benefits, cursor)
 
 @router.post("/service-benefits", response_model=ServiceBenefitRead)
-def create_service_benefit(
+async def create_service_benefit(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     benefit_in: ServiceBenefitCreate
 ):
-    return service_benefit.create(db=db, obj_in=benefit_in)
+    return await service_benefit.create(db=db, obj_in=benefit_in)
 
 @router.get("/service-benefits/{benefit_id}")
-def get_service_benefit(
+@cache(tags=["service_benefits:{benefit_id}"])
+async def get_service_benefit(
     benefit_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     language: str = Query("en", description="Language code (en, az, ru)")
 ):
     """Get service benefit by ID with multilingual support"""
-    db_benefit = service_benefit.get(db=db, id=benefit_id)
+    lang = validate_language(language)
+    db_benefit = await service_benefit.get_localized(db, language=lang, fields=['title', 'description'], id=benefit_id)
     if not db_benefit:
         raise HTTPException(status_code=404, detail="Service benefit not found")
-    
-    lang = validate_language(language)
-    return prepare_multilingual_response(
-        db_benefit, 
-        ['title', 'description'], 
-        lang
-    )
+    return db_benefit
 
 @router.patch("/service-benefits/{benefit_id}", response_model=ServiceBenefitRead)
-def update_service_benefit(
+async def update_service_benefit(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     benefit_id: int,
     benefit_in: ServiceBenefitUpdate
 ):
-    db_benefit = service_benefit.get(db=db, id=benefit_id)
+    db_benefit = await service_benefit.update(db=db, id=benefit_id, obj_in=benefit_in)
     if not db_benefit:
         raise HTTPException(status_code=404, detail="Service benefit not found")
-    return service_benefit.update(db=db, db_obj=db_benefit, obj_in=benefit_in)
+    return db_benefit
 
 @router.delete("/service-benefits/{benefit_id}", response_model=ServiceBenefitRead)
-def delete_service_benefit(
+async def delete_service_benefit(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     benefit_id: int
 ):
-    return service_benefit.remove(db=db, id=benefit_id)
+    db_benefit = await service_benefit.remove(db=db, id=benefit_id)
+    if not db_benefit:
+        raise HTTPException(status_code=404, detail="Service benefit not found")
+    return db_benefit
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, UploadFile, HTTPException, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from pathlib import Path
+from starlette.status import HTTP_304_NOT_MODIFIED
+from ..core.cache import is_not_modified
 from ..utils.uploads import upload_file, RESOURCES_PATH
 
 router = APIRouter()
@@ -19,9 +21,17 @@ async def upload_file_endpoint(file: UploadFile):
         )
 
 @router.get("/resources/{filename}")
-async def get_resource(filename: str):
-    """Serve a file from the resources directory"""
+async def get_resource(filename: str, request: Request):
+    """Serve a file from the resources directory, answering conditional
+    requests against its mtime/size validators with 304"""
     file_path = RESOURCES_PATH / filename
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="File not found")
-    return FileResponse(file_path)
+    stat_result = file_path.stat()
+    response = FileResponse(file_path, stat_result=stat_result)
+    if is_not_modified(request, response.headers["etag"], int(stat_result.st_mtime)):
+        return Response(
+            status_code=HTTP_304_NOT_MODIFIED,
+            headers={name: response.headers[name] for name in ("etag", "last-modified")},
+        )
+    return response
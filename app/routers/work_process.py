@@ -1,8 +1,9 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form, Request
-from sqlalchemy.orm import Session
-from fastapi_cache.decorator import cache
-from ..core.db import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.db import get_async_db, get_read_db
+from ..core.cache import cache
+from ..core.pagination import COUNT_QUERY, CURSOR_QUERY, paginate
 from ..crud.work_process import work_process
 from ..schemas.work_process import (
     WorkProcessCreate,
@@ -10,33 +11,25 @@ from ..schemas.work_process import (
     WorkProcessUpdate
 )
 from ..utils.uploads import upload_file
-from ..utils.multilingual import prepare_multilingual_response, validate_language
+from ..utils.multilingual import validate_language
 
 router = APIRouter()
 
 @router.get("/work-processes")
-@cache(expire=300)
+@cache(tags=["work_processes:list"])
 async def list_work_processes(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = CURSOR_QUERY,
+    count: Optional[str] = COUNT_QUERY,
     language: str = Query("en", description="Language code (en, az, ru)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all work processes with multilingual support"""
     lang = validate_language(language)
-    work_processes = work_process.get_multi_ordered(db, skip=skip, limit=limit)
+    work_processes = await work_process.get_multi_ordered(db, skip=skip, limit=limit, cursor=cursor, count=count, language=lang, fields=['title', 'description'])
     
-    # Prepare multilingual response
-    multilingual_work_processes = []
-    for wp in work_processes:
-        multilingual_wp = prepare_multilingual_response(
-            wp, 
-            ['title', 'description'], 
-            lang
-        )
-        multilingual_work_processes.append(multilingual_wp)
-    
-    return multilingual_work_processes
+    return paginate(work_processes, cursor)
 
 @router.post("/work-processes", response_model=WorkProcessRead)
 async def create_work_process(
@@ -45,7 +38,7 @@ async def create_work_process(
     description: str = Form(...),
     order: int = Form(0),
     image: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new work process with form data and optional image"""
     image_url = None
@@ -58,40 +51,40 @@ async def create_work_process(
         order=order,
         image_url=image_url
     )
-    return work_process.create(db=db, obj_in=process_data)
+    return await work_process.create(db=db, obj_in=process_data)
 
 @router.post("/work-processes/json", response_model=WorkProcessRead)
 async def create_work_process_json(
     process_in: WorkProcessCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new work process with JSON data (for backwards compatibility)"""
-    return work_process.create(db=db, obj_in=process_in)
+    return await work_process.create(db=db, obj_in=process_in)
 
 @router.post("/work-processes/{process_id}/photo")
 async def upload_work_process_photo(
     process_id: int,
     request: Request,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Upload photo for a work process"""
-    db_process = work_process.get(db, id=process_id)
+    db_process = await work_process.get(db, id=process_id)
     if not db_process:
         raise HTTPException(status_code=404, detail="Work process not found")
     
     file_url = await upload_file(file, "work-processes", request)
-    work_process.update(db=db, db_obj=db_process, obj_in={"photo_url": file_url})
+    await work_process.update(db=db, id=db_process.id, obj_in={"photo_url": file_url}, profile="summary")
     return {"message": "Photo uploaded successfully", "url": file_url}
 
 @router.get("/work-processes/{process_id}", response_model=WorkProcessRead)
-@cache(expire=300)
+@cache(tags=["work_processes:{process_id}"])
 async def get_work_process(
     process_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific work process by ID"""
-    db_process = work_process.get(db, id=process_id)
+    db_process = await work_process.get(db, id=process_id)
     if not db_process:
         raise HTTPException(status_code=404, detail="Work process not found")
     return db_process
@@ -100,22 +93,21 @@ async def get_work_process(
 async def update_work_process(
     process_id: int,
     process_in: WorkProcessUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a work process"""
-    db_process = work_process.get(db, id=process_id)
+    db_process = await work_process.update(db=db, id=process_id, obj_in=process_in)
     if not db_process:
         raise HTTPException(status_code=404, detail="Work process not found")
-    return work_process.update(db=db, db_obj=db_process, obj_in=process_in)
+    return db_process
 
 @router.delete("/work-processes/{process_id}")
 async def delete_work_process(
     process_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a work process"""
-    db_process = work_process.get(db, id=process_id)
+    db_process = await work_process.remove(db=db, id=process_id)
     if not db_process:
         raise HTTPException(status_code=404, detail="Work process not found")
-    work_process.remove(db=db, id=process_id)
     return {"message": "Work process deleted successfully"}
@@ -1,12 +1,87 @@
 """
 Utility functions for multilingual content handling
 """
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Mapping, Optional
+from sqlalchemy import String, func, inspect, null
 
 # Supported languages
 SUPPORTED_LANGUAGES = ['en', 'az', 'ru']
 DEFAULT_LANGUAGE = 'en'
 
+# Fields copied verbatim by prepare_multilingual_response
+NON_LOCALIZED_FIELDS = ['id', 'slug', 'created_at', 'updated_at', 'order', 
+                        'year', 'client', 'tag', 'photo_url', 'image_url', 
+                        'cover_photo_url', 'icon_url', 'category', 'author', 
+                        'read_time', 'tags', 'property_sector_id']
+
+def fallback_languages(language: str = DEFAULT_LANGUAGE) -> List[str]:
+    """Languages get_localized_field() tries for `language`, in order"""
+    if language not in SUPPORTED_LANGUAGES:
+        language = DEFAULT_LANGUAGE
+    return list(dict.fromkeys([language, DEFAULT_LANGUAGE] + SUPPORTED_LANGUAGES))
+
+def localized_column(model: Any, field_base: str, language: str = DEFAULT_LANGUAGE):
+    """
+    SQL counterpart of get_localized_field().
+    
+    Args:
+        model: The model class
+        field_base: Base field name (e.g., 'title', 'description')
+        language: Language code ('en', 'az', 'ru')
+    
+    Returns:
+        COALESCE(NULLIF(<field>_<lang>, ''), ..., <field>) over the model's
+        language columns in fallback order and its legacy column, labelled
+        field_base (NULL when the model has none of them)
+    """
+    columns = inspect(model).columns
+    chain = []
+    for lang in fallback_languages(language):
+        name = f"{field_base}_{lang}"
+        if name in columns:
+            column = getattr(model, name)
+            # Empty strings fall through like they do in get_localized_field()
+            chain.append(func.nullif(column, "") if isinstance(columns[name].type, String) else column)
+    if field_base in columns:
+        chain.append(getattr(model, field_base))
+    
+    if not chain:
+        return null().label(field_base)
+    if len(chain) == 1:
+        return chain[0].label(field_base)
+    return func.coalesce(*chain).label(field_base)
+
+def localized_columns(model: Any, field_bases: list, language: str = DEFAULT_LANGUAGE) -> list:
+    """
+    Select list whose rows carry what prepare_multilingual_response() builds.
+    
+    Args:
+        model: The model class
+        field_bases: List of base field names to localize
+        language: Language code
+    
+    Returns:
+        One localized_column() per field base followed by the model's
+        NON_LOCALIZED_FIELDS columns
+    """
+    columns = inspect(model).columns
+    return (
+        [localized_column(model, field_base, language) for field_base in field_bases]
+        + [getattr(model, field) for field in NON_LOCALIZED_FIELDS if field in columns]
+    )
+
+def localized_row(row: Mapping[str, Any], columns: list, field_bases: list) -> Dict[str, Any]:
+    """
+    Response dict for a row selected with localized_columns(); like
+    prepare_multilingual_response() it omits non-localized fields that are None.
+    """
+    response = {}
+    for column in columns:
+        value = row[column.key]
+        if value is not None or column.key in field_bases:
+            response[column.key] = value
+    return response
+
 def get_localized_field(obj: Any, field_base: str, language: str = DEFAULT_LANGUAGE, fallback: bool = True) -> Optional[str]:
     """
     Get localized field value from a model object.
@@ -137,12 +212,7 @@ def prepare_multilingual_response(obj: Any, field_bases: list, language: str = D
         response[field_base] = get_localized_field(obj, field_base, language)
     
     # Add non-localized fields
-    non_localized_fields = ['id', 'slug', 'created_at', 'updated_at', 'order', 
-                           'year', 'client', 'tag', 'photo_url', 'image_url', 
-                           'cover_photo_url', 'icon_url', 'category', 'author', 
-                           'read_time', 'tags', 'property_sector_id']
-    
-    for field in non_localized_fields:
+    for field in NON_LOCALIZED_FIELDS:
         if hasattr(obj, field):
             value = getattr(obj, field)
             if value is not None:
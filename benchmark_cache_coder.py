@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark the response cache's stored format against fastapi-cache's JsonCoder.
+
+It loads a /news page the way the router does and compares, per cache hit:
+
+  json      JsonCoder value; a hit decodes it and FastAPI re-encodes the
+            objects (jsonable_encoder + JSONResponse), as before
+  rendered  the final response body gzipped (the current format); a hit
+            sends the stored bytes, or gunzips them for a client that does
+            not accept gzip
+
+It reports the stored bytes (Redis MEMORY USAGE too with --redis) and the
+mean time per hit.
+
+Usage:
+    python benchmark_cache_coder.py [--rows 100] [--language en] [--iterations 200] [--seed] [--redis redis://localhost:6379/15]
+
+--seed inserts --rows news articles with long text in every language
+first; only use it against a scratch database.
+"""
+import argparse
+import asyncio
+import gzip
+import time
+from fastapi.encoders import jsonable_encoder
+from fastapi_cache.coder import JsonCoder
+from starlette.responses import JSONResponse
+from app.core.cache import _pack, _unpack
+from app.core.db import AsyncSessionLocal, async_engine
+from app.core.pagination import paginate
+from app.crud.news import news
+from benchmark_projection import seed
+
+def timed(iterations: int, hit) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        hit()
+    return (time.perf_counter() - start) / iterations * 1000
+
+async def redis_memory(url: str, values: dict) -> dict:
+    from redis import asyncio as aioredis
+    redis = aioredis.from_url(url)
+    usage = {}
+    for name, value in values.items():
+        key = f"benchmark_cache_coder:{name}"
+        await redis.set(key, value)
+        usage[name] = await redis.memory_usage(key)
+        await redis.delete(key)
+    await redis.close()
+    return usage
+
+async def run(rows: int, language: str, iterations: int, redis_url: str):
+    async with AsyncSessionLocal() as db:
+        items = await news.get_multi_filtered(db, limit=rows, language=language, fields=['title', 'description', 'content'])
+    result = paginate(items, None)
+
+    json_value = JsonCoder.encode(result)
+    body = JSONResponse(jsonable_encoder(result)).body
+    rendered_value = _pack(body, None)
+    _, _, encoding, payload = _unpack(rendered_value)
+
+    def json_hit():
+        JSONResponse(jsonable_encoder(JsonCoder.decode(json_value))).body
+
+    def rendered_hit():
+        _unpack(rendered_value)
+
+    def rendered_identity_hit():
+        stored = _unpack(rendered_value)[3]
+        gzip.decompress(stored) if encoding == "gzip" else stored
+
+    cases = [
+        ("json", json_value, json_hit),
+        ("rendered", rendered_value, rendered_hit),
+        ("rendered (client without gzip)", rendered_value, rendered_identity_hit),
+    ]
+    memory = await redis_memory(redis_url, {name: value for name, value, _ in cases}) if redis_url else {}
+    print(f"{len(result)} news rows, {len(body):,} byte body, stored as {encoding}")
+    print(f"{'format':<32} {'stored bytes':>13} {'redis bytes':>12} {'ms/hit':>9}")
+    for name, value, hit in cases:
+        print(f"{name:<32} {len(value):>13,} {memory.get(name, '-'):>12} {timed(iterations, hit):>9.3f}")
+
+    await async_engine.dispose()
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", action="store_true")
+    parser.add_argument("--redis", default="", help="Redis URL to measure MEMORY USAGE on (a scratch database)")
+    args = parser.parse_args()
+
+    if args.seed:
+        await seed(args.rows)
+    await run(args.rows, args.language, args.iterations, args.redis)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark the SQL-side localization of the list endpoints.
+
+For each list it runs the same CRUD call twice, once loading whole entities
+(fields=None) and once with the language and field set the router passes,
+which selects COALESCE-localized columns instead. It reports the values per
+row, the bytes of column data materialized and the time.
+
+Usage:
+    python benchmark_projection.py [--rows 1000] [--language az] [--seed]
+
+--seed inserts --rows news articles with long text in every language
+first; only use it against a scratch database.
+"""
+import argparse
+import asyncio
+import time
+from sqlalchemy import inspect
+from app.core.db import AsyncSessionLocal, async_engine
+from app.crud.news import news
+from app.crud.projects import project
+from app.models.news import News
+
+CASES = [
+    ("news", news.get_multi_filtered, ['title', 'description', 'content']),
+    ("projects", project.get_multi_filtered, ['title', 'description']),
+]
+
+def row_values(row) -> dict:
+    return row if isinstance(row, dict) else inspect(row).dict
+
+def loaded_bytes(rows) -> int:
+    total = 0
+    for row in rows:
+        for value in row_values(row).values():
+            if isinstance(value, (bytes, str)):
+                total += len(value.encode() if isinstance(value, str) else value)
+            elif isinstance(value, list):
+                total += sum(len(str(item).encode()) for item in value)
+            elif value is not None and not hasattr(value, "_sa_instance_state"):
+                total += 8
+    return total
+
+async def seed(rows: int):
+    text = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 80
+    async with AsyncSessionLocal() as db:
+        for i in range(rows):
+            db.add(News(
+                slug=f"benchmark-{i}-{time.time_ns()}",
+                title=f"Benchmark {i}", title_en=f"Benchmark {i}", title_az=f"Benchmark {i} az", title_ru=f"Benchmark {i} ru",
+                excerpt_en=text[:500], excerpt_az=text[:500], excerpt_ru=text[:500],
+                content=text, content_en=text, content_az=text, content_ru=text,
+                summary=text[:1000], summary_en=text[:1000], summary_az=text[:1000], summary_ru=text[:1000],
+                tags=["benchmark"],
+            ))
+        await db.commit()
+    print(f"Seeded {rows} news rows")
+
+async def run(rows: int, language: str):
+    print(f"{'list':<10} {'mode':<10} {'rows':>6} {'values':>7} {'bytes':>12} {'ms':>9}")
+    for name, method, fields in CASES:
+        for mode, kwargs in (("entity", {}), ("localized", {"language": language, "fields": fields})):
+            async with AsyncSessionLocal() as db:
+                start = time.perf_counter()
+                result = await method(db, limit=rows, profile="summary", **kwargs)
+                elapsed = (time.perf_counter() - start) * 1000
+            values = len(row_values(result[0])) if result else 0
+            print(f"{name:<10} {mode:<10} {len(result):>6} {values:>7} {loaded_bytes(result):>12,} {elapsed:>9.1f}")
+
+    await async_engine.dispose()
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--seed", action="store_true")
+    args = parser.parse_args()
+
+    if args.seed:
+        await seed(args.rows)
+    await run(args.rows, args.language)
+
+if __name__ == "__main__":
+    asyncio.run(main())
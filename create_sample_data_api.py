@@ -10,30 +10,34 @@ def create_services():
     services = [
         {
             "name": "Real Estate Development",
+            "slug": "real-estate-development",
             "description": "Comprehensive real estate development services",
             "order": 1
         },
         {
             "name": "Construction Management", 
+            "slug": "construction-management",
             "description": "Professional construction project management",
             "order": 2
         },
         {
             "name": "Investment Advisory",
+            "slug": "investment-advisory",
             "description": "Expert investment advice and portfolio management",
             "order": 3
         }
     ]
     
-    for service in services:
-        try:
-            response = requests.post(f"{BASE_URL}/services/json", json=service)
-            if response.status_code == 200:
-                print(f"✓ Created service: {service['name']}")
-            else:
-                print(f"✗ Failed to create service: {service['name']} - {response.text}")
-        except Exception as e:
-            print(f"✗ Error creating service: {service['name']} - {e}")
+    try:
+        # One request and one transaction for the whole list
+        response = requests.post(f"{BASE_URL}/services/batch", json=services)
+        if response.status_code == 200:
+            for item in response.json():
+                print(f"✓ Created service: {item['name']}")
+        else:
+            print(f"✗ Failed to create services - {response.text}")
+    except Exception as e:
+        print(f"✗ Error creating services - {e}")
 
 def create_property_sectors():
     """Create sample property sectors via API"""
@@ -57,16 +61,16 @@ def create_property_sectors():
         }
     ]
     
-    for sector in sectors:
-        try:
-            # Use form data as per the API
-            response = requests.post(f"{BASE_URL}/property-sectors", data=sector)
-            if response.status_code == 200:
-                print(f"✓ Created property sector: {sector['title']}")
-            else:
-                print(f"✗ Failed to create property sector: {sector['title']} - {response.text}")
-        except Exception as e:
-            print(f"✗ Error creating property sector: {sector['title']} - {e}")
+    try:
+        # One request and one transaction for the whole list
+        response = requests.post(f"{BASE_URL}/property-sectors/batch", json=sectors)
+        if response.status_code == 200:
+            for item in response.json():
+                print(f"✓ Created property sector: {item['title']}")
+        else:
+            print(f"✗ Failed to create property sectors - {response.text}")
+    except Exception as e:
+        print(f"✗ Error creating property sectors - {e}")
 
 def create_team_members():
     """Create sample team members via API"""
@@ -87,16 +91,16 @@ def create_team_members():
         }
     ]
     
-    for member in members:
-        try:
-            # Use form data as per the API
-            response = requests.post(f"{BASE_URL}/team-members", data=member)
-            if response.status_code == 200:
-                print(f"✓ Created team member: {member['full_name']}")
-            else:
-                print(f"✗ Failed to create team member: {member['full_name']} - {response.text}")
-        except Exception as e:
-            print(f"✗ Error creating team member: {member['full_name']} - {e}")
+    try:
+        # One request and one transaction for the whole list
+        response = requests.post(f"{BASE_URL}/team-members/batch", json=members)
+        if response.status_code == 200:
+            for item in response.json():
+                print(f"✓ Created team member: {item['full_name']}")
+        else:
+            print(f"✗ Failed to create team members - {response.text}")
+    except Exception as e:
+        print(f"✗ Error creating team members - {e}")
 
 def create_approaches():
     """Create sample approaches via API"""
@@ -120,15 +124,16 @@ def create_approaches():
         }
     ]
     
-    for approach in approaches:
-        try:
-            response = requests.post(f"{BASE_URL}/approaches", data=approach)
-            if response.status_code == 200:
-                print(f"✓ Created approach: {approach['title']}")
-            else:
-                print(f"✗ Failed to create approach: {approach['title']} - {response.text}")
-        except Exception as e:
-            print(f"✗ Error creating approach: {approach['title']} - {e}")
+    try:
+        # One request and one transaction for the whole list
+        response = requests.post(f"{BASE_URL}/approaches/batch", json=approaches)
+        if response.status_code == 200:
+            for item in response.json():
+                print(f"✓ Created approach: {item['title']}")
+        else:
+            print(f"✗ Failed to create approaches - {response.text}")
+    except Exception as e:
+        print(f"✗ Error creating approaches - {e}")
 
 def main():
     """Create all sample data"""
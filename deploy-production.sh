@@ -38,6 +38,8 @@ chmod -R 755 resources/
 
 # Run database migrations
 alembic upgrade head
+# Migrated rows bypass the API, so its key filters may not know them
+python -m app.core.bloom
 
 echo "SDA Backend deployment completed!"
 echo "Make sure to:"
@@ -3,6 +3,7 @@ Script to populate database with sample multilingual data
 """
 import asyncio
 from sqlalchemy.orm import Session
+from app.core.bloom import request_rebuild
 from app.core.db import get_db
 from app.models.services import Service
 from app.models.projects import Project
@@ -310,6 +311,7 @@ def main():
         populate_approaches(db)
         populate_partners(db)
         populate_work_processes(db)
+        request_rebuild()
         
         print("\n✅ All multilingual data populated successfully!")
         print("\nYou can now test the multilingual endpoints:")
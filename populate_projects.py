@@ -5,6 +5,7 @@ Script to populate the database with sample projects
 import asyncio
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
+from app.core.bloom import request_rebuild
 from app.core.config import settings
 from app.models.projects import Project
 from app.models.property_sectors import PropertySector
@@ -67,6 +68,7 @@ async def populate_projects():
             session.add(project)
         
         session.commit()
+        request_rebuild()
         print(f"Successfully created {len(projects_data)} projects!")
         
         # Verify creation
@@ -2,6 +2,7 @@
 Simple script to populate database with sample multilingual data
 """
 from sqlalchemy.orm import Session
+from app.core.bloom import request_rebuild
 from app.core.db import SessionLocal
 from app.models.services import Service
 from app.models.projects import Project
@@ -216,6 +217,7 @@ def main():
         populate_property_sectors(db)
         populate_team_members(db)
         populate_projects(db)
+        request_rebuild()
         print("Database population completed successfully!")
     except Exception as e:
         print(f"Error occurred: {e}")
@@ -0,0 +1,97 @@
+import os
+
+# The app creates its engines at import time, so point it at the test
+# database first; tests that need Postgres skip without TEST_DATABASE_URL
+if os.environ.get("TEST_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["TEST_DATABASE_URL"]
+os.environ.setdefault("ENVIRONMENT", "development")
+
+import fakeredis
+import httpx
+import pytest
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from sqlalchemy import create_engine, exc, text
+from app.core import cache as cache_module
+from app.core.cache import CACHE_PREFIX, request_key_builder
+from app.core.config import settings
+from app.core.db import async_engine
+from app.main import app
+from app.models import Base
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture(scope="session")
+def sync_engine():
+    if not os.environ.get("TEST_DATABASE_URL"):
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_engine(settings.sync_database_url)
+    try:
+        with engine.connect():
+            pass
+    except exc.OperationalError as e:
+        pytest.skip(f"Test database is unreachable: {e}")
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except exc.DBAPIError:
+        # Without pg_trgm the trigram indexes cannot be created
+        for table in Base.metadata.tables.values():
+            table.indexes = {index for index in table.indexes if not index.name.endswith("_trgm")}
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def database(sync_engine):
+    """Empty tables for one test"""
+    Base.metadata.drop_all(sync_engine)
+    Base.metadata.create_all(sync_engine)
+    yield sync_engine
+    # Pooled asyncpg connections belong to this test's event loop
+    async_engine.sync_engine.dispose(close=False)
+
+def _clear_cache_state():
+    cache_module._local_tags.clear()
+    cache_module._missed_invalidations.clear()
+    cache_module._orphaned_locks.clear()
+    cache_module._written_at.clear()
+    cache_module._inflight.clear()
+    cache_module.cache_stats.reset()
+
+@pytest.fixture
+def use_cache():
+    """Call with a backend to serve the response cache from it in this test"""
+    _clear_cache_state()
+
+    def init(backend):
+        FastAPICache.init(backend, prefix=f"{CACHE_PREFIX}test:", key_builder=request_key_builder)
+        return backend
+
+    yield init
+    _clear_cache_state()
+    FastAPICache.reset()
+
+@pytest.fixture
+def memory_cache(use_cache):
+    """Response cache on an InMemoryBackend (its store is class level)"""
+    backend = InMemoryBackend()
+    backend._store.clear()
+    yield use_cache(backend)
+    backend._store.clear()
+
+@pytest.fixture
+def redis_cache(use_cache):
+    """Response cache on a RedisBackend over fakeredis; yields the client"""
+    redis = fakeredis.FakeAsyncRedis()
+    use_cache(RedisBackend(redis))
+    return redis
+
+@pytest.fixture
+async def client():
+    # ASGITransport does not run the startup handlers, so no Redis, warmer
+    # or key filters unless a test sets them up
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
@@ -0,0 +1,136 @@
+import asyncio
+import fakeredis
+import pytest
+from fakeredis.aioredis import FakeAsyncRedisConnection
+from fastapi_cache.backends.redis import RedisBackend
+from app.core import cache as cache_module
+from app.core.cache import CACHE_PREFIX, invalidate
+from app.core.cache_backend import CircuitBreaker, FallbackBackend
+from app.core.config import settings
+
+pytestmark = pytest.mark.anyio
+
+TIMEOUT = 0.05
+RESET_SECONDS = 0.1
+
+class Hang:
+    """Makes every fakeredis reply take longer than the backend timeout
+    while `on`; commands still reach the fake server, as they may reach a
+    real one that stops answering"""
+
+    def __init__(self):
+        self.on = False
+
+@pytest.fixture
+def hang(monkeypatch):
+    hang = Hang()
+    read_response = FakeAsyncRedisConnection.read_response
+
+    async def hanging_read_response(self, *args, **kwargs):
+        if hang.on:
+            await asyncio.sleep(10)
+        return await read_response(self, *args, **kwargs)
+
+    monkeypatch.setattr(FakeAsyncRedisConnection, "read_response", hanging_read_response)
+    return hang
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeAsyncRedis()
+
+@pytest.fixture
+def backend(use_cache, redis):
+    return use_cache(FallbackBackend(
+        RedisBackend(redis),
+        timeout=TIMEOUT,
+        failures=settings.CACHE_BREAKER_FAILURES,
+        reset_seconds=RESET_SECONDS,
+        max_bytes=1024 * 1024,
+        on_recover=cache_module._on_redis_recovered,
+    ))
+
+async def _open_breaker(backend, hang) -> None:
+    hang.on = True
+    for _ in range(settings.CACHE_BREAKER_FAILURES):
+        await backend.get("missing")
+    assert backend.breaker.state == CircuitBreaker.OPEN
+
+async def _recover(backend, hang) -> None:
+    hang.on = False
+    await asyncio.sleep(RESET_SECONDS)
+    # The first call after the reset time probes Redis in the background
+    assert not backend.available()
+    await backend._probe
+    assert backend.breaker.state == CircuitBreaker.CLOSED
+
+async def test_breaker_opens_after_consecutive_failures(backend, hang):
+    hang.on = True
+    for _ in range(settings.CACHE_BREAKER_FAILURES - 1):
+        assert await backend.get("missing") is None
+        assert backend.breaker.state == CircuitBreaker.CLOSED
+    assert await backend.get("missing") is None
+    assert backend.breaker.state == CircuitBreaker.OPEN
+    assert backend.errors == settings.CACHE_BREAKER_FAILURES
+
+    # Open: Redis is not waited on any more
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await backend.set("key", b"value", 60)
+    assert await backend.get("key") == b"value"
+    assert loop.time() - started < TIMEOUT
+    assert backend.errors == settings.CACHE_BREAKER_FAILURES
+
+@pytest.mark.usefixtures("database")
+async def test_requests_are_served_from_the_fallback_while_open(client, backend, hang):
+    hang.on = True
+    response = await client.get("/api/v1/partners")
+    assert response.status_code == 200, response.text
+    assert response.headers["X-FastAPI-Cache"] == "MISS"
+    assert backend.breaker.state == CircuitBreaker.OPEN
+    assert len(backend.local) == 1
+
+    response = await client.get("/api/v1/partners")
+    assert response.status_code == 200, response.text
+    assert response.headers["X-FastAPI-Cache"] == "HIT"
+
+async def test_missed_invalidations_are_replayed_on_recovery(backend, redis, hang):
+    key = f"{CACHE_PREFIX}test:app.routers.partners.list_partners:-:digest"
+    await redis.set(key, b"cached")
+    await redis.sadd(cache_module._tag_key("partners:list"), key)
+
+    await _open_breaker(backend, hang)
+    await invalidate("partners:list")
+    assert cache_module._missed_invalidations == {"partners:list"}
+
+    hang.on = False
+    assert await redis.exists(key)
+
+    await _recover(backend, hang)
+    assert not await redis.exists(key)
+    assert not await redis.exists(cache_module._tag_key("partners:list"))
+    assert not cache_module._missed_invalidations
+
+async def test_orphaned_fill_locks_are_released_on_recovery(backend, redis, hang):
+    key = f"{CACHE_PREFIX}test:app.routers.partners.list_partners:-:digest"
+
+    async def fill():
+        return "result", b"encoded"
+
+    # A lock another worker holds is left alone
+    other = f"{key}:other:lock"
+    await redis.set(other, "someone-else")
+    cache_module._orphaned_locks[other] = "mine"
+
+    hang.on = True
+    # The lock's SET reaches Redis but its reply never comes back
+    assert await cache_module._locked_fill(backend, key, fill, wait=True) == ("result", b"encoded")
+    lock = f"{key}:lock"
+    assert lock in cache_module._orphaned_locks
+    await _open_breaker(backend, hang)
+
+    hang.on = False
+    assert await redis.get(lock) is not None
+    await _recover(backend, hang)
+    assert await redis.get(lock) is None
+    assert await redis.get(other) == b"someone-else"
+    assert not cache_module._orphaned_locks
@@ -0,0 +1,69 @@
+import asyncio
+import time
+import pytest
+from app.core import cache as cache_module
+from app.core.cache_warmer import _get
+from app.core.config import settings
+from app.crud.work_process import work_process
+from app.main import app
+from app.models.work_process import WorkProcess
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("database")]
+
+PROJECTS = "/api/v1/projects"
+# Cached for an hour, then served stale for a day while refreshed
+WORK_PROCESSES = "/api/v1/work-processes"
+
+@pytest.fixture
+def work_process_fills(monkeypatch):
+    """Records each run of the work processes list query, which takes a
+    little while so that requests overlap it"""
+    fills = []
+    get_multi_ordered = work_process.get_multi_ordered
+
+    async def slow_get_multi_ordered(*args, **kwargs):
+        fills.append(kwargs)
+        await asyncio.sleep(0.05)
+        return await get_multi_ordered(*args, **kwargs)
+
+    monkeypatch.setattr(work_process, "get_multi_ordered", slow_get_multi_ordered)
+    return fills
+
+async def test_client_no_cache_is_served_from_the_cache(client, memory_cache):
+    assert (await client.get(PROJECTS)).headers["X-FastAPI-Cache"] == "MISS"
+    response = await client.get(PROJECTS, headers={"Cache-Control": "no-cache"})
+    assert response.status_code == 200
+    assert response.headers["X-FastAPI-Cache"] == "HIT"
+
+async def test_warmer_refreshes_collapse_into_one_fill(client, memory_cache):
+    assert (await client.get(PROJECTS)).headers["X-FastAPI-Cache"] == "MISS"
+    assert await _get(app, PROJECTS, {}, refresh=False) == (200, "HIT")
+    results = await asyncio.gather(*(_get(app, PROJECTS, {}, refresh=True) for _ in range(5)))
+    assert sorted(results) == [(200, "HIT")] * 4 + [(200, "MISS")]
+
+async def test_stale_entries_are_served_while_refreshed_once(client, memory_cache, database, work_process_fills):
+    response = await client.post(f"{WORK_PROCESSES}/json", json={"title": "Plan"})
+    assert response.status_code == 200, response.text
+    response = await client.get(WORK_PROCESSES)
+    assert response.headers["X-FastAPI-Cache"] == "MISS"
+    assert len(work_process_fills) == 1
+
+    # Past its hour, well within the day it may be served stale
+    policy = settings.cache_policy(WORK_PROCESSES)
+    for key, value in memory_cache._store.items():
+        if ".list_work_processes:" in key:
+            value.ttl_ts = int(time.time()) + policy.stale // 2
+    # A change the cached entry does not know about (no invalidation)
+    with database.begin() as conn:
+        conn.execute(WorkProcess.__table__.insert().values(title="Build", order=1))
+
+    responses = await asyncio.gather(*(client.get(WORK_PROCESSES) for _ in range(5)))
+    assert [response.headers["X-FastAPI-Cache"] for response in responses] == ["STALE"] * 5
+    assert all([item["title"] for item in response.json()] == ["Plan"] for response in responses)
+    assert "stale-while-revalidate=" in responses[0].headers["Cache-Control"]
+
+    await asyncio.gather(*cache_module._background)
+    assert len(work_process_fills) == 2
+    response = await client.get(WORK_PROCESSES)
+    assert response.headers["X-FastAPI-Cache"] == "HIT"
+    assert [item["title"] for item in response.json()] == ["Plan", "Build"]
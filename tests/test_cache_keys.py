@@ -0,0 +1,67 @@
+import gzip
+import hashlib
+import pytest
+from app.core.cache import _pack, _unpack
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("database")]
+
+def _keys(backend, function: str) -> set:
+    return {key for key in backend._store if f":app.routers.news.{function}:" in key}
+
+async def test_equivalent_requests_share_one_key(client, memory_cache):
+    urls = [
+        "/api/v1/news?tags=b&tags=a",
+        "/api/v1/news?tags=a&tags=b",
+        "/api/v1/news?tags=a&tags=b&language=EN",
+        "/api/v1/news?tags=b&tags=a&language=en",
+        "/api/v1/news?tags=a&tags=b&skip=0&limit=100",
+    ]
+    statuses = []
+    for url in urls:
+        response = await client.get(url)
+        assert response.status_code == 200, response.text
+        statuses.append(response.headers["X-FastAPI-Cache"])
+    assert statuses == ["MISS"] + ["HIT"] * (len(urls) - 1)
+    keys = _keys(memory_cache, "list_news")
+    assert len(keys) == 1
+    assert next(iter(keys)).startswith("sda_cache:test:app.routers.news.list_news:en:")
+
+async def test_other_parameters_get_their_own_key(client, memory_cache):
+    for url in ["/api/v1/news", "/api/v1/news?language=az", "/api/v1/news?tags=a", "/api/v1/news?skip=1"]:
+        response = await client.get(url)
+        assert response.status_code == 200, response.text
+        assert response.headers["X-FastAPI-Cache"] == "MISS"
+    assert len(_keys(memory_cache, "list_news")) == 4
+
+@pytest.mark.parametrize("body, last_modified, status, encoding", [
+    (b'{"id":1}', 1700000000, 200, "identity"),
+    (b'{"detail":"Not found"}', None, 404, "identity"),
+    (b'[' + b'{"id":1},' * 500 + b'{"id":2}]', 1700000000, 200, "gzip"),
+])
+def test_envelope_round_trip(body, last_modified, status, encoding):
+    etag, modified, stored_encoding, stored_status, stored = _unpack(_pack(body, last_modified, status))
+    assert etag == f'"{hashlib.md5(body).hexdigest()}"'
+    assert modified == last_modified
+    assert stored_encoding == encoding
+    assert stored_status == status
+    assert (gzip.decompress(stored) if encoding == "gzip" else stored) == body
+
+@pytest.mark.parametrize("stored", [
+    b'{"id":1}',
+    b'v2 0123456789abcdef0123456789abcdef 1700000000 identity\n{"id":1}',
+])
+def test_older_formats_are_not_unpacked(stored):
+    assert _unpack(stored) is None
+
+async def test_an_entry_in_an_older_format_is_a_miss(client, memory_cache):
+    response = await client.get("/api/v1/news")
+    assert response.headers["X-FastAPI-Cache"] == "MISS"
+    (key,) = _keys(memory_cache, "list_news")
+    # As stored by fastapi_cache's own coder
+    memory_cache._store[key].data = b'[{"id": 1, "title": "Old"}]'
+
+    response = await client.get("/api/v1/news")
+    assert response.status_code == 200, response.text
+    assert response.headers["X-FastAPI-Cache"] == "MISS"
+    assert response.json() == []
+    assert _unpack(memory_cache._store[key].data) is not None
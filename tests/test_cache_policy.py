@@ -0,0 +1,32 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+UPLOAD = "/uploads/projects/covers/3a35ad2e-4188-4c8c-8391-022628b08115.png"
+
+async def test_static_files_get_their_mount_policy(client):
+    response = await client.get(UPLOAD)
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "public, max-age=3600"
+    assert response.headers["Surrogate-Control"] == "max-age=86400"
+
+async def test_no_store_requests_are_left_unlabelled(client):
+    response = await client.get(UPLOAD, headers={"Cache-Control": "no-store"})
+    assert response.status_code == 200
+    assert "Cache-Control" not in response.headers
+    assert "Surrogate-Control" not in response.headers
+
+@pytest.mark.usefixtures("database")
+async def test_no_store_bypasses_and_is_not_labelled(client, memory_cache):
+    response = await client.get("/api/v1/projects", headers={"Cache-Control": "no-store"})
+    assert response.status_code == 200
+    assert "X-FastAPI-Cache" not in response.headers
+    assert "Cache-Control" not in response.headers
+    assert "Surrogate-Control" not in response.headers
+
+@pytest.mark.usefixtures("database")
+async def test_api_routes_keep_their_policy(client, memory_cache):
+    response = await client.get("/api/v1/about")
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"].startswith("public, max-age=")
+    assert response.headers["Surrogate-Control"] == "max-age=300, stale-while-revalidate=86400"
@@ -0,0 +1,56 @@
+import pytest
+from app.core.config import settings
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("database")]
+
+WORK_PROCESSES = "/api/v1/work-processes"
+
+@pytest.fixture(params=["gzip", "identity"])
+async def variant(request, monkeypatch, client):
+    """A cached list response, stored gzipped or not, and the
+    Accept-Encoding to request it with"""
+    monkeypatch.setattr(settings, "CACHE_COMPRESS_MIN_BYTES", 1 if request.param == "gzip" else 0)
+    response = await client.post(f"{WORK_PROCESSES}/json", json={"title": "Plan"})
+    assert response.status_code == 200, response.text
+    return {"Accept-Encoding": request.param}
+
+async def test_etag_and_last_modified(client, memory_cache, variant):
+    response = await client.get(WORK_PROCESSES, headers=variant)
+    assert response.status_code == 200
+    assert response.json()[0]["title"] == "Plan"
+    etag = response.headers["ETag"]
+    assert etag.endswith('-gzip"') == (variant["Accept-Encoding"] == "gzip")
+    assert response.headers.get("Content-Encoding") == ("gzip" if variant["Accept-Encoding"] == "gzip" else None)
+    assert "Last-Modified" in response.headers
+
+@pytest.mark.parametrize("cached", [False, True])
+async def test_if_none_match_answers_304(client, memory_cache, variant, cached):
+    etag = (await client.get(WORK_PROCESSES, headers=variant)).headers["ETag"]
+    if not cached:
+        memory_cache._store.clear()
+    response = await client.get(WORK_PROCESSES, headers={**variant, "If-None-Match": f'"other", W/{etag}'})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["X-FastAPI-Cache"] == ("HIT" if cached else "MISS")
+
+async def test_a_changed_etag_gets_the_body(client, memory_cache, variant):
+    response = await client.get(WORK_PROCESSES, headers={**variant, "If-None-Match": '"other"'})
+    assert response.status_code == 200
+    assert response.json()[0]["title"] == "Plan"
+
+async def test_if_modified_since_answers_304(client, memory_cache, variant):
+    last_modified = (await client.get(WORK_PROCESSES, headers=variant)).headers["Last-Modified"]
+    response = await client.get(WORK_PROCESSES, headers={**variant, "If-Modified-Since": last_modified})
+    assert response.status_code == 304
+    assert response.headers["Last-Modified"] == last_modified
+
+    response = await client.get(WORK_PROCESSES, headers={**variant, "If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+    assert response.status_code == 200
+    assert response.json()[0]["title"] == "Plan"
+
+async def test_if_none_match_wins_over_if_modified_since(client, memory_cache, variant):
+    last_modified = (await client.get(WORK_PROCESSES, headers=variant)).headers["Last-Modified"]
+    response = await client.get(WORK_PROCESSES, headers={**variant, "If-None-Match": '"other"', "If-Modified-Since": last_modified})
+    assert response.status_code == 200
@@ -0,0 +1,44 @@
+import pytest
+from app.core.config import settings
+
+pytestmark = pytest.mark.anyio
+
+TOKEN = "s3cret"
+
+@pytest.fixture
+def internal_token(monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", TOKEN)
+    return TOKEN
+
+async def test_warm_is_disabled_without_a_configured_token(client):
+    response = await client.post("/api/v1/internal/cache/warm", headers={"X-Internal-Token": ""})
+    assert response.status_code == 403
+
+@pytest.mark.parametrize("headers", [{}, {"X-Internal-Token": "wrong"}])
+async def test_warm_rejects_a_missing_or_wrong_token(client, internal_token, headers):
+    response = await client.post("/api/v1/internal/cache/warm", headers=headers)
+    assert response.status_code == 403
+
+@pytest.mark.usefixtures("database")
+async def test_warm_with_the_token(client, memory_cache, internal_token):
+    response = await client.post("/api/v1/internal/cache/warm", headers={"X-Internal-Token": internal_token})
+    assert response.status_code == 200, response.text
+
+ENDPOINTS = [
+    ("GET", "/api/v1/internal/db-pool"),
+    ("GET", "/api/v1/internal/cache/stats"),
+    ("DELETE", "/api/v1/internal/cache/stats"),
+    ("GET", "/api/v1/internal/metrics"),
+    ("GET", "/api/v1/internal/cache/keys"),
+    ("DELETE", "/api/v1/internal/cache/keys?language=en"),
+    ("DELETE", "/api/v1/internal/cache/entities/projects"),
+    ("GET", "/api/v1/internal/cache/namespaces"),
+    ("DELETE", "/api/v1/internal/cache/namespaces/old"),
+]
+
+@pytest.mark.parametrize("method, url", ENDPOINTS)
+async def test_every_endpoint_requires_the_token(client, memory_cache, internal_token, method, url):
+    response = await client.request(method, url)
+    assert response.status_code == 403
+    response = await client.request(method, url, headers={"X-Internal-Token": internal_token})
+    assert response.status_code == 200, response.text
@@ -0,0 +1,125 @@
+import asyncio
+import fakeredis
+import pytest
+from fastapi_cache.backends.redis import RedisBackend
+from app.core import bloom
+from app.core.bloom import KeyFilters, request_rebuild
+from app.core.cache_backend import FallbackBackend
+from app.core.config import settings
+from app.models.projects import Project
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("database")]
+
+@pytest.fixture
+async def key_filters(monkeypatch, redis_cache):
+    filters = KeyFilters({"projects": ("id",)}, error_rate=0.01, prefix="sda_key_filters:test:")
+    monkeypatch.setattr(bloom, "key_filters", filters)
+    monkeypatch.setattr(settings, "BLOOM_FILTER_ENABLED", True)
+    await filters.rebuild()
+    filters.ready = True
+    yield filters
+    await filters.stop()
+
+async def _next_message(pubsub) -> bytes:
+    # get_message() answers None for the skipped subscribe confirmation
+    for _ in range(2):
+        message = await pubsub.get_message(timeout=1)
+        if message is not None:
+            return message["data"]
+    raise AssertionError("Nothing was published")
+
+async def _settle(filters) -> None:
+    while filters._tasks:
+        await asyncio.gather(*filters._tasks, return_exceptions=True)
+
+async def test_unknown_ids_are_rejected_while_up_to_date(client, key_filters):
+    response = await client.get("/api/v1/projects/1")
+    assert response.status_code == 404
+    assert key_filters.rejected == 1
+
+async def test_a_bumped_generation_is_not_trusted(client, key_filters, database):
+    # A row written outside CRUDBase, followed by request_rebuild()
+    with database.begin() as conn:
+        conn.execute(Project.__table__.insert().values(id=1, title="Loaded"))
+    await key_filters._redis().incr(key_filters.generation_key)
+
+    response = await client.get("/api/v1/projects/1")
+    assert response.status_code == 200, response.text
+    assert key_filters.rejected == 0
+    assert key_filters.stale == 1
+
+    await _settle(key_filters)
+    assert key_filters.generation == 1
+    assert await key_filters.might_exist("projects", "id", "1")
+    assert not await key_filters.might_exist("projects", "id", "2")
+
+async def test_request_rebuild_never_raises(monkeypatch):
+    monkeypatch.setattr(settings, "BLOOM_FILTER_ENABLED", True)
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://127.0.0.1:1/0")
+    request_rebuild()
+
+async def test_updates_carry_the_generation(key_filters):
+    other = KeyFilters(key_filters.columns, error_rate=0.01, prefix="sda_key_filters:test:")
+    await other.rebuild()
+    other.ready = True
+
+    pubsub = key_filters._redis().pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(key_filters.channel)
+    messages = []
+    for id in (5, 6, 7):
+        await key_filters.added("projects", [Project(id=id)])
+        messages.append(await _next_message(pubsub))
+    await pubsub.close()
+
+    other._on_message(messages[0])
+    assert other.generation == 1
+    assert await other.might_exist("projects", "id", "5")
+
+    # The second update is lost: the third is a generation ahead
+    other._on_message(messages[2])
+    assert other.generation == 1
+    assert other._tasks
+    await _settle(other)
+    assert other.generation == 3
+
+async def test_failed_publishes_bump_the_generation_once(monkeypatch, key_filters):
+    redis = key_filters._redis()
+    calls = []
+
+    async def failing_eval(*args):
+        calls.append(args)
+        raise ConnectionError("Redis went away")
+
+    monkeypatch.setattr(redis, "eval", failing_eval)
+    for id in (5, 6, 7):
+        await key_filters.added("projects", [Project(id=id)])
+    # Later updates wait for the pending bump instead of trying Redis
+    assert len(calls) == 1
+    assert len(key_filters._tasks) == 1
+    assert key_filters._unpublished == 3
+
+    await _settle(key_filters)
+    assert int(await redis.get(key_filters.generation_key)) == 1
+    assert key_filters._unpublished == 0
+
+async def test_nothing_is_published_while_disabled(monkeypatch, key_filters):
+    monkeypatch.setattr(settings, "BLOOM_FILTER_ENABLED", False)
+    await key_filters.added("projects", [Project(id=5)])
+    await key_filters.removed("projects", 1)
+    assert await key_filters._redis().get(key_filters.generation_key) is None
+    assert not key_filters._tasks
+
+async def test_an_open_breaker_is_not_waited_on(monkeypatch, use_cache):
+    redis = fakeredis.FakeAsyncRedis()
+    backend = use_cache(FallbackBackend(RedisBackend(redis), timeout=0.05, failures=1, reset_seconds=60, max_bytes=1024))
+    backend.breaker.failure()
+    monkeypatch.setattr(settings, "BLOOM_FILTER_ENABLED", True)
+    filters = KeyFilters({"projects": ("id",)}, error_rate=0.01, prefix="sda_key_filters:test:")
+
+    async def eval_script(*args):
+        raise AssertionError("Redis was called with the breaker open")
+
+    monkeypatch.setattr(redis, "eval", eval_script)
+    await filters.added("projects", [Project(id=5)])
+    assert filters._unpublished == 1
+    await filters.stop()
@@ -0,0 +1,48 @@
+import pytest
+from app.core.pagination import encode_cursor
+from app.crud.base import _order_key
+from app.models.services import Service
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("database")]
+
+SERVICES = "/api/v1/services"
+
+@pytest.fixture
+async def services(client):
+    for i, name in enumerate(["Cc", "Aa", "Bb"]):
+        response = await client.post(f"{SERVICES}/json", json={"name": name, "slug": name.lower(), "order": i % 2})
+        assert response.status_code == 200, response.text
+
+async def _walk(client, **params):
+    names, cursor = [], ""
+    while cursor is not None:
+        response = await client.get(SERVICES, params={**params, "limit": 1, "cursor": cursor})
+        assert response.status_code == 200, response.text
+        page = response.json()
+        names.extend(item["name"] for item in page["items"])
+        cursor = page["next_cursor"]
+    return names
+
+async def test_cursors_walk_every_row_once(client, services):
+    assert await _walk(client) == ["Cc", "Bb", "Aa"]
+    assert await _walk(client, order_by="name", direction="desc") == ["Cc", "Bb", "Aa"]
+    assert await _walk(client, order_by="name") == ["Aa", "Bb", "Cc"]
+
+async def test_a_cursor_only_resumes_its_own_ordering(client, services):
+    response = await client.get(SERVICES, params={"order_by": "name", "limit": 1, "cursor": ""})
+    cursor = response.json()["next_cursor"]
+    response = await client.get(SERVICES, params={"order_by": "created_at", "limit": 1, "cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 json",
+    encode_cursor("elsewhere", [0, 1]),
+    encode_cursor(_order_key([(Service.order, "asc"), (Service.id, "asc")]), [0]),
+    encode_cursor(_order_key([(Service.order, "asc"), (Service.id, "asc")]), ["first", "1"]),
+    encode_cursor(_order_key([(Service.order, "asc"), (Service.id, "asc")]), [True, 1.5]),
+])
+async def test_invalid_cursors_are_a_bad_request(client, services, cursor):
+    response = await client.get(SERVICES, params={"limit": 1, "cursor": cursor})
+    assert response.status_code == 400, response.text
+    assert response.json()["detail"] == "Invalid cursor"
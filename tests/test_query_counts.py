@@ -0,0 +1,126 @@
+import contextlib
+import pytest
+from sqlalchemy import event, text
+from app.core.config import settings
+from app.core.db import async_engine
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("database")]
+
+@contextlib.contextmanager
+def count_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+async def _statements(client, method, url, **kwargs) -> int:
+    with count_statements() as statements:
+        response = await client.request(method, url, **kwargs)
+    assert response.status_code == 200, response.text
+    return len(statements)
+
+async def _add_parents(client, start: int, stop: int) -> None:
+    for i in range(start, stop):
+        response = await client.post("/api/v1/team-sections/json", json={
+            "title": f"Section {i}",
+            "items": [{"name": f"Member {i}a"}, {"name": f"Member {i}b"}],
+        })
+        assert response.status_code == 200, response.text
+        response = await client.post("/api/v1/projects/json", json={
+            "title": f"Project {i}",
+            "photos": [{"image_url": f"/uploads/{i}a.png"}, {"image_url": f"/uploads/{i}b.png", "order": 1}],
+        })
+        assert response.status_code == 200, response.text
+
+@pytest.mark.parametrize("url", ["/api/v1/team-sections", "/api/v1/projects"])
+async def test_list_queries_do_not_grow_with_rows(client, url):
+    await _add_parents(client, 0, 1)
+    one = await _statements(client, "GET", url)
+    await _add_parents(client, 1, 10)
+    assert await _statements(client, "GET", url) == one
+
+async def test_create_with_children_queries_do_not_grow_with_children(client):
+    counts = []
+    for photos in (1, 10):
+        counts.append(await _statements(client, "POST", "/api/v1/projects/json", json={
+            "title": f"{photos} photos",
+            "photos": [{"image_url": f"/uploads/{i}.png", "order": i} for i in range(photos)],
+        }))
+    assert counts[0] == counts[1]
+
+async def _add_work_processes(client, count: int) -> None:
+    for i in range(count):
+        response = await client.post("/api/v1/work-processes/json", json={"title": f"Step {i}", "order": i})
+        assert response.status_code == 200, response.text
+
+async def _page(client, **params) -> dict:
+    response = await client.get("/api/v1/work-processes", params={"limit": 2, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+@pytest.mark.parametrize("count", ["exact", "window", "estimate"])
+async def test_count_strategies_give_the_total_on_every_page(client, memory_cache, count):
+    await _add_work_processes(client, 5)
+    titles, cursor, pages = [], "", []
+    while cursor is not None:
+        page = await _page(client, count=count, cursor=cursor)
+        pages.append(page)
+        titles.extend(item["title"] for item in page["items"])
+        cursor = page["next_cursor"]
+    assert titles == [f"Step {i}" for i in range(5)]
+    assert [page["total"] for page in pages] == [5, 5, 5]
+    assert {(page["size"], page["pages"]) for page in pages} == {(2, 3)}
+    assert [page["next_cursor"] is None for page in pages] == [False, False, True]
+
+    # Offset pages count the same, and the cached total follows writes
+    page = await _page(client, count=count, skip=4)
+    assert (page["total"], page["page"], page["next_cursor"]) == (5, 3, None)
+    await _add_work_processes(client, 1)
+    assert (await _page(client, count=count))["total"] == 6
+
+async def test_window_count_rides_on_the_page_query(client):
+    await _add_work_processes(client, 3)
+    with count_statements() as statements:
+        assert (await _page(client, count="window"))["total"] == 3
+    assert len(statements) == 1
+    assert "count(*) OVER ()" in statements[0]
+
+async def test_estimate_reads_planner_statistics_on_large_tables(monkeypatch, client, database):
+    await _add_work_processes(client, 3)
+    with database.begin() as conn:
+        conn.execute(text("ANALYZE work_processes"))
+    # Counts as large; the estimate then is the table's reltuples
+    monkeypatch.setattr(settings, "COUNT_ESTIMATE_MIN_ROWS", 1)
+    with count_statements() as statements:
+        assert (await _page(client, count="estimate"))["total"] == 3
+    assert any("reltuples" in statement for statement in statements)
+    assert not any(statement.lstrip().startswith("SELECT count(*)") for statement in statements)
+
+async def test_update_and_remove_write_one_statement(client):
+    await _add_parents(client, 0, 1)
+    project_id = (await client.get("/api/v1/projects")).json()[0]["id"]
+
+    with count_statements() as statements:
+        response = await client.put(f"/api/v1/projects/{project_id}", json={"title": "Renamed"})
+    assert response.status_code == 200, response.text
+    assert response.json()["title"] == "Renamed"
+    # The photos ride on a selectin load, never a re-read of the row
+    assert [statement.split()[0] for statement in statements] == ["UPDATE", "SELECT"]
+
+    with count_statements() as statements:
+        response = await client.delete(f"/api/v1/projects/{project_id}")
+    assert response.status_code == 200, response.text
+    assert [statement.split()[0] for statement in statements] == ["DELETE"]
+    assert (await client.get("/api/v1/projects")).json() == []
+
+@pytest.mark.parametrize("method, kwargs", [("PUT", {"json": {"title": "Renamed"}}), ("DELETE", {})])
+async def test_update_and_remove_of_a_missing_id_are_404(client, method, kwargs):
+    response = await client.request(method, "/api/v1/projects/12345", **kwargs)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Project not found"
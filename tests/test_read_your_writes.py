@@ -0,0 +1,65 @@
+import pytest
+from fastapi_cache import FastAPICache
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.core import cache as cache_module
+from app.core.cache import CACHE_PREFIX, invalidate
+from app.core.config import settings
+from app.core.db import replicas
+from app.models import Base
+
+pytestmark = pytest.mark.anyio
+
+LAGGING_SCHEMA = "lagging_replica"
+
+@pytest.fixture
+def lagging_replica(monkeypatch, database):
+    """A "replica" that never receives writes: the same tables, empty, in
+    another schema"""
+    with database.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {LAGGING_SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {LAGGING_SCHEMA}"))
+        Base.metadata.create_all(conn.execution_options(schema_translate_map={None: LAGGING_SCHEMA}))
+    engine = create_async_engine(
+        settings.async_database_url,
+        connect_args={"server_settings": {"search_path": LAGGING_SCHEMA}},
+    )
+    monkeypatch.setattr(replicas, "engines", [engine])
+    monkeypatch.setattr(replicas, "_ejected_until", [0.0])
+    yield engine
+    engine.sync_engine.dispose(close=False)
+    with database.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {LAGGING_SCHEMA} CASCADE"))
+
+async def _titles(client):
+    response = await client.get("/api/v1/projects")
+    assert response.status_code == 200, response.text
+    return [item["title"] for item in response.json()]
+
+async def test_fill_after_a_write_reads_the_primary(client, memory_cache, lagging_replica):
+    response = await client.post("/api/v1/projects/json", json={"title": "New"})
+    assert response.status_code == 200, response.text
+    # Another client, not pinned to the primary by the write's cookie
+    client.cookies.clear()
+    assert await _titles(client) == ["New"]
+    assert await _titles(client) == ["New"]
+
+    # Once the window has passed fills go back to the replica
+    cache_module._written_at.clear()
+    memory_cache._store.clear()
+    assert await _titles(client) == []
+
+async def test_writes_are_marked_in_redis_for_other_workers(monkeypatch, redis_cache):
+    monkeypatch.setattr(replicas, "engines", [object()])
+    backend = FastAPICache.get_backend()
+    await invalidate("projects:list", "projects:1")
+    # As seen from a worker that did not make the write
+    cache_module._written_at.clear()
+    assert await cache_module._written_recently(backend, ["projects:1"])
+    assert not await cache_module._written_recently(backend, ["projects:2"])
+    assert 0 < await redis_cache.ttl(f"{CACHE_PREFIX}test:written:projects:1") <= settings.READ_YOUR_WRITES_SECONDS
+
+async def test_no_replicas_no_marks(redis_cache):
+    await invalidate("projects:list")
+    assert not cache_module._written_at
+    assert await redis_cache.keys(f"{CACHE_PREFIX}test:written:*") == []
@@ -0,0 +1,147 @@
+import os
+import time
+import pytest
+from sqlalchemy import create_engine
+from starlette.requests import Request
+from app import main
+from app.core import db
+from app.core.config import settings
+from app.core.db import PRIMARY_READS_COOKIE, ReplicaSet, async_engine, read_session
+from app.models import Base
+from app.models.projects import Project
+
+# Nothing listens on port 1, so connecting fails straight away
+UNREACHABLE = "postgresql+asyncpg://postgres@127.0.0.1:1/sda"
+
+@pytest.fixture
+def replica_set():
+    replica_set = ReplicaSet([UNREACHABLE] * 3, eject_seconds=30)
+    yield replica_set
+    for engine in replica_set.engines:
+        engine.sync_engine.dispose(close=False)
+
+@pytest.fixture
+def unreachable_replica(monkeypatch, replica_set):
+    """One replica that cannot be reached, counting the times it is offered"""
+    replica_set.engines = replica_set.engines[:1]
+    replica_set._ejected_until = [0.0]
+    replica_set.calls = 0
+    candidates = replica_set.candidates
+
+    def counted():
+        replica_set.calls += 1
+        return candidates()
+
+    monkeypatch.setattr(replica_set, "candidates", counted)
+    monkeypatch.setattr(db, "replicas", replica_set)
+    monkeypatch.setattr(main, "replicas", replica_set)
+    return replica_set
+
+@pytest.fixture
+def second_instance(monkeypatch, database):
+    """A second Postgres instance (TEST_REPLICA_URL) as the only replica.
+    Nothing replicates to it: tests write to it directly, so what a read
+    returns tells which instance served it."""
+    url = os.environ.get("TEST_REPLICA_URL")
+    if not url:
+        pytest.skip("TEST_REPLICA_URL is not set")
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", url)
+    replica_set = ReplicaSet(settings.replica_database_urls, eject_seconds=30)
+    monkeypatch.setattr(db, "replicas", replica_set)
+    monkeypatch.setattr(main, "replicas", replica_set)
+    yield engine
+    replica_set.engines[0].sync_engine.dispose(close=False)
+    engine.dispose()
+
+def _request(cookie: str = "") -> Request:
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+def test_candidates_rotate(replica_set):
+    first, second, third = replica_set.engines
+    assert replica_set.candidates() == [first, second, third]
+    assert replica_set.candidates() == [second, third, first]
+    assert replica_set.candidates() == [third, first, second]
+    assert replica_set.candidates() == [first, second, third]
+
+def test_ejected_replica_is_skipped_until_its_time_is_up(monkeypatch, replica_set):
+    now = time.monotonic()
+    monkeypatch.setattr(db.time, "monotonic", lambda: now)
+    first, second, third = replica_set.engines
+    replica_set.eject(second)
+    assert not replica_set.healthy(1)
+    assert replica_set.candidates() == [first, third]
+    assert replica_set.candidates() == [third, first]
+    now += 30
+    assert replica_set.healthy(1)
+    assert replica_set.candidates() == [third, first, second]
+
+def test_no_replicas_means_no_candidates():
+    assert ReplicaSet([], eject_seconds=30).candidates() == []
+
+@pytest.mark.parametrize("cookie, pinned", [
+    ("{expires_in_5s}", True),
+    ("{expired_1s_ago}", False),
+    ("not-a-time", False),
+    (None, False),
+])
+def test_primary_reads_cookie(cookie, pinned):
+    if cookie is not None:
+        cookie = cookie.format(expires_in_5s=time.time() + 5, expired_1s_ago=time.time() - 1)
+        cookie = f"{PRIMARY_READS_COOKIE}={cookie}"
+    assert db._reads_pinned_to_primary(_request(cookie or "")) is pinned
+
+@pytest.mark.anyio
+async def test_unreachable_replica_is_ejected_and_the_primary_used(unreachable_replica):
+    async with read_session() as session:
+        assert session.bind is async_engine
+    assert not unreachable_replica.healthy(0)
+    assert unreachable_replica.calls == 1
+
+@pytest.mark.anyio
+async def test_pinned_reads_skip_the_replicas(unreachable_replica):
+    async with db._read_session(pinned=True) as session:
+        assert session.bind is async_engine
+    assert unreachable_replica.calls == 0
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("database")
+async def test_write_pins_the_client_to_the_primary(client, unreachable_replica):
+    response = await client.post("/api/v1/contact-messages/json", json={
+        "first_name": "Ada",
+        "last_name": "Lovelace",
+        "phone_number": "+994 12 345 67 89",
+        "email": "ada@example.com",
+    })
+    assert response.status_code == 200, response.text
+    assert float(response.cookies[PRIMARY_READS_COOKIE]) > time.time()
+
+    response = await client.get("/api/v1/contact-messages")
+    assert response.status_code == 200, response.text
+    assert unreachable_replica.calls == 0
+
+    client.cookies.clear()
+    response = await client.get("/api/v1/contact-messages")
+    assert response.status_code == 200, response.text
+    assert unreachable_replica.calls == 1
+
+async def _titles(client):
+    response = await client.get("/api/v1/projects")
+    assert response.status_code == 200, response.text
+    return [item["title"] for item in response.json()]
+
+@pytest.mark.anyio
+async def test_reads_use_the_second_instance_until_a_write(client, second_instance):
+    with second_instance.begin() as conn:
+        conn.execute(Project.__table__.insert().values(title="On the replica"))
+    assert await _titles(client) == ["On the replica"]
+
+    response = await client.post("/api/v1/projects/json", json={"title": "On the primary"})
+    assert response.status_code == 200, response.text
+    assert await _titles(client) == ["On the primary"]
+
+    client.cookies.clear()
+    assert await _titles(client) == ["On the replica"]
@@ -0,0 +1,64 @@
+"""Substring searches use their pg_trgm GIN indexes.
+
+Each CRUD search runs once; the SELECT it sent is EXPLAINed with the same
+parameters in the same transaction. Sequential scans are disabled for the
+transaction, since on an empty table the planner would otherwise prefer
+one.
+"""
+import json
+import pytest
+from sqlalchemy import event, text
+from app.core.db import AsyncSessionLocal, async_engine
+from app.crud.projects import project
+from app.crud.team import team_member
+
+pytestmark = pytest.mark.anyio
+
+CASES = {
+    "projects.tag": (lambda db, term: project.get_multi_filtered(db, tag=term), {"ix_projects_tag_trgm"}),
+    "team_members.role*": (lambda db, term: team_member.get_by_role(db, role=term), {
+        "ix_team_members_role_trgm",
+        "ix_team_members_role_en_trgm",
+        "ix_team_members_role_az_trgm",
+        "ix_team_members_role_ru_trgm",
+    }),
+}
+
+@pytest.fixture
+def trgm_database(database):
+    with database.connect() as conn:
+        if conn.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).scalar() is None:
+            pytest.skip("pg_trgm is not available in the test database")
+    return database
+
+def _plan_indexes(node: dict) -> set:
+    found = {node["Index Name"]} if "Index Name" in node else set()
+    for child in node.get("Plans", []):
+        found |= _plan_indexes(child)
+    return found
+
+@pytest.mark.usefixtures("trgm_database")
+@pytest.mark.parametrize("case", sorted(CASES))
+async def test_search_uses_trigram_indexes(case):
+    search, expected = CASES[case]
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and not captured:
+            captured.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("SET LOCAL enable_seqscan = off"))
+            await search(db, "arch")
+            statement, parameters = captured[0]
+            connection = await db.connection()
+            plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)).scalar()
+            await db.rollback()
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    assert expected <= _plan_indexes(plan[0]["Plan"])